@@ -0,0 +1,270 @@
+"""Monthly bundles of old archive pages, readable one day at a time.
+
+`arxiv_archive/` otherwise gains one HTML file (plus .gz/.br copies) per day forever.
+rollup() packs every month that ended more than archive_bundle_days ago into
+arxiv_archive/bundles/arxiv_digests_YYYYMM.zip (deflate, one member per day). Next to
+each bundle, arxiv_digests_YYYYMM.index.json records where every day's compressed
+bytes start, so read_digest() seeks straight to one day and inflates only that page;
+the bundles are still ordinary zip files.
+
+So that the archive still reads from disk (file://), each packed month also gets one
+reading page, arxiv_archive/arxiv_digests_YYYYMM.html, with all of its days one below
+the other. The manifest, the month pages and index.html link the days there
+(…#YYYYMMDD) before the loose pages are removed.
+
+A loose page always wins over its bundled copy (render and --as-of backfills write
+loose pages again); the next rollup packs it back into its month's bundle.
+
+Usage:
+    python archive_bundles.py rollup [--older-than DAYS]
+    python archive_bundles.py extract YYYYMMDD [--output FILE]
+    python archive_bundles.py info
+"""
+import os
+import re
+import glob
+import json
+import zlib
+import zipfile
+import argparse
+from datetime import datetime, timedelta
+
+from atomic_io import open_atomic, atomic_write_json
+from static_assets import write_artifact
+
+ARCHIVE_DIR = "arxiv_archive"
+BUNDLE_DIR = os.path.join(ARCHIVE_DIR, "bundles")
+ARCHIVE_BUNDLE_DAYS = 60
+
+DIGEST_NAME = re.compile(r'arxiv_digest_(\d{8})\.html$')
+HEAD = re.compile(r'<head>(.*?)</head>', re.S)
+BODY = re.compile(r'<body[^>]*>(.*)</body>', re.S)
+TITLE = re.compile(r'<title>.*?</title>', re.S)
+LOCAL_HEADER_SIZE = 30  # fixed part of a zip local file header
+
+
+def digest_name(date_str):
+    return f"arxiv_digest_{date_str}.html"
+
+
+def bundle_path(month_key, bundle_dir=BUNDLE_DIR):
+    return os.path.join(bundle_dir, f"arxiv_digests_{month_key}.zip")
+
+
+def index_path(month_key, bundle_dir=BUNDLE_DIR):
+    return os.path.join(bundle_dir, f"arxiv_digests_{month_key}.index.json")
+
+
+def reading_page_path(month_key, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f"arxiv_digests_{month_key}.html")
+
+
+def load_index(month_key, bundle_dir=BUNDLE_DIR):
+    """{date_str: {offset, compressed_size, size, crc32, method}} of one bundle ({} if none)."""
+    try:
+        with open(index_path(month_key, bundle_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)['days']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def bundled_dates(bundle_dir=BUNDLE_DIR):
+    """{date_str: bundle path} of every bundled day."""
+    dates = {}
+    for path in sorted(glob.glob(os.path.join(bundle_dir, "arxiv_digests_*.zip"))):
+        month_key = os.path.basename(path)[len("arxiv_digests_"):-len(".zip")]
+        for date_str in load_index(month_key, bundle_dir):
+            dates[date_str] = path
+    return dates
+
+
+# ======================
+# READING
+# ======================
+
+def read_bundled(date_str, bundle_dir=BUNDLE_DIR):
+    """One day's page (bytes) from its month bundle, inflating only that day; None if not bundled."""
+    month_key = date_str[:6]
+    path = bundle_path(month_key, bundle_dir)
+    entry = load_index(month_key, bundle_dir).get(date_str)
+    if entry is None or not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        f.seek(entry['offset'])
+        data = f.read(entry['compressed_size'])
+    if entry['method'] == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -15)  # raw deflate stream, no zlib header
+    if len(data) == entry['size'] and zlib.crc32(data) == entry['crc32']:
+        return data
+
+    # Index and bundle disagree (e.g. read during a repack): use the zip directory instead
+    with zipfile.ZipFile(path) as bundle:
+        try:
+            return bundle.read(digest_name(date_str))
+        except KeyError:
+            return None
+
+
+def read_digest(date_str, archive_dir=ARCHIVE_DIR, bundle_dir=BUNDLE_DIR):
+    """One day's archived page (bytes), loose or bundled; None if there is none."""
+    loose = os.path.join(archive_dir, digest_name(date_str))
+    if os.path.exists(loose):
+        with open(loose, 'rb') as f:
+            return f.read()
+    return read_bundled(date_str, bundle_dir)
+
+
+# ======================
+# PACKING
+# ======================
+
+def build_index(path):
+    """Offsets of every member's compressed data, read from the zip's local headers."""
+    days = {}
+    with zipfile.ZipFile(path) as bundle, open(path, 'rb') as f:
+        for info in bundle.infolist():
+            match = DIGEST_NAME.match(info.filename)
+            if not match:
+                continue
+            f.seek(info.header_offset)
+            header = f.read(LOCAL_HEADER_SIZE)
+            name_length = int.from_bytes(header[26:28], 'little')
+            extra_length = int.from_bytes(header[28:30], 'little')
+            days[match.group(1)] = {
+                'offset': info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length,
+                'compressed_size': info.compress_size,
+                'size': info.file_size,
+                'crc32': info.CRC,
+                'method': info.compress_type
+            }
+    return days
+
+
+def pack_month(month_key, loose_files, bundle_dir=BUNDLE_DIR):
+    """Write a month's bundle: its existing days plus loose_files {date_str: path} (these win)."""
+    path = bundle_path(month_key, bundle_dir)
+    pages = {}
+    if os.path.exists(path):
+        with zipfile.ZipFile(path) as bundle:
+            for name in bundle.namelist():
+                match = DIGEST_NAME.match(name)
+                if match:
+                    pages[match.group(1)] = bundle.read(name)
+    for date_str, file_path in loose_files.items():
+        with open(file_path, 'rb') as f:
+            pages[date_str] = f.read()
+
+    with open_atomic(path, 'wb') as f:
+        with zipfile.ZipFile(f, 'w') as bundle:
+            for date_str in sorted(pages):
+                info = zipfile.ZipInfo(digest_name(date_str), datetime.strptime(date_str, '%Y%m%d').timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                bundle.writestr(info, pages[date_str], compresslevel=9)
+    atomic_write_json(index_path(month_key, bundle_dir), {
+        'bundle': os.path.basename(path),
+        'days': build_index(path)
+    })
+    write_reading_page(month_key, pages)
+    return path
+
+
+def write_reading_page(month_key, pages):
+    """arxiv_digests_YYYYMM.html: every day of the month on one page, newest first, anchored by date."""
+    month_name = datetime.strptime(month_key, '%Y%m').strftime('%B %Y')
+    title = f"<title>arXiv Digests • {month_name}</title>"
+    head = HEAD.search(pages[max(pages)].decode('utf-8'))  # the digest pages share one stylesheet
+    head = TITLE.sub(title, head.group(1)) if head else f'\n  <meta charset="UTF-8" />\n  {title}\n'
+    days = ""
+    for date_str in sorted(pages, reverse=True):
+        body = BODY.search(pages[date_str].decode('utf-8'))
+        days += f'<div id="{date_str}">\n{body.group(1) if body else ""}\n</div>\n'
+    write_artifact(reading_page_path(month_key), f"""<!DOCTYPE html>
+<html lang="en">
+<head>{head}</head>
+<body>
+{days}</body>
+</html>
+""")
+
+
+def reading_page_link(date_str):
+    """Where the archive index links a bundled day (relative to the working directory)."""
+    return f"{ARCHIVE_DIR}/{os.path.basename(reading_page_path(date_str[:6]))}#{date_str}"
+
+
+def rollup(older_than_days=ARCHIVE_BUNDLE_DAYS, today=None):
+    """Pack the loose pages of every month that ended more than older_than_days ago."""
+    from generate_index import MANIFEST_FILE, load_manifest, save_manifest, scan_archive, generate_index
+
+    cutoff = ((today or datetime.now()) - timedelta(days=older_than_days)).strftime('%Y%m%d')
+    months = {}
+    for file_path in glob.glob(os.path.join(ARCHIVE_DIR, "arxiv_digest_*.html")):
+        match = DIGEST_NAME.search(file_path)
+        if match:
+            months.setdefault(match.group(1)[:6], {})[match.group(1)] = file_path
+
+    # Only whole months, so a bundle is not rewritten every day while its month is still current
+    months = {month_key: files for month_key, files in months.items()
+              if (datetime.strptime(month_key, '%Y%m') + timedelta(days=31)).replace(day=1).strftime('%Y%m%d') <= cutoff}
+    if not months:
+        print(f"📦 Nothing to pack: no loose digests from months that ended before {cutoff}")
+        return []
+
+    digests = load_manifest() if os.path.exists(MANIFEST_FILE) else scan_archive()
+    packed, saved_bytes = [], 0
+    for month_key, files in sorted(months.items()):
+        path = pack_month(month_key, files)
+        for date_str in files:
+            if date_str in digests:
+                digests[date_str].update(path=reading_page_link(date_str), bundle=path.replace(os.sep, '/'))
+        packed.append(path)
+    save_manifest(digests)
+    # Relink the packed days on their month pages and index.html before their pages go
+    generate_index(months=list(months))
+
+    # Bundles, reading pages, manifest and index pages are in place: the loose copies can go
+    for files in months.values():
+        for file_path in files.values():
+            for copy in (file_path, file_path + ".gz", file_path + ".br"):
+                if os.path.exists(copy):
+                    saved_bytes += os.path.getsize(copy)
+                    os.remove(copy)
+    bundle_bytes = sum(os.path.getsize(p) for p in packed)
+    print(f"📦 Packed {sum(len(f) for f in months.values())} digests into {len(packed)} monthly bundles "
+          f"({saved_bytes / 1024:.0f} KB of loose files → {bundle_bytes / 1024:.0f} KB of bundles)")
+    return packed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monthly bundles of old archive pages")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("rollup", help="pack old months into bundles")
+    p.add_argument("--older-than", type=int, metavar="DAYS",
+                   help=f"pack months that ended more than DAYS ago (default: archive_bundle_days setting, {ARCHIVE_BUNDLE_DAYS})")
+    p = sub.add_parser("extract", help="write one bundled day back out as a page")
+    p.add_argument("date", help="YYYYMMDD")
+    p.add_argument("--output", help=f"file to write (default: {ARCHIVE_DIR}/arxiv_digest_<date>.html)")
+    sub.add_parser("info", help="list the bundles")
+    args = parser.parse_args()
+
+    if args.command == "rollup":
+        from main import load_config
+        settings = load_config(args.config).get('settings', {})
+        rollup(args.older_than if args.older_than is not None else settings.get('archive_bundle_days', ARCHIVE_BUNDLE_DAYS))
+    elif args.command == "extract":
+        page = read_bundled(args.date)
+        if page is None:
+            raise SystemExit(f"⚠️ No bundled digest for {args.date}")
+        output = args.output or os.path.join(ARCHIVE_DIR, digest_name(args.date))
+        with open_atomic(output, 'wb') as f:
+            f.write(page)
+        print(f"📄 {args.date} extracted to {output}")
+    else:
+        for path in sorted(glob.glob(os.path.join(BUNDLE_DIR, "arxiv_digests_*.zip"))):
+            month_key = os.path.basename(path)[len("arxiv_digests_"):-len(".zip")]
+            days = load_index(month_key)
+            size = sum(d['size'] for d in days.values())
+            print(f"📦 {month_key}: {len(days)} digests, {size / 1024:.0f} KB → {os.path.getsize(path) / 1024:.0f} KB ({path})")
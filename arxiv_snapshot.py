@@ -0,0 +1,323 @@
+"""Local arXiv metadata store, filled from the public JSON-lines snapshot, with a query engine.
+
+The snapshot (arxiv-metadata-oai-snapshot.json, one paper per line, optionally .gz)
+is streamed into SQLite with category and submission-date indexes. Queries use the
+arXiv API syntax the interests already use:
+
+    cat:cs.LG OR cat:cs.AI
+    (cat:cs.LG OR cat:stat.ML) AND submittedDate:[202501010000 TO 202501072359]
+    cat:cs.* ANDNOT ti:survey          (also abs:, all:, au:, parentheses)
+
+and results come back as arXiv API style Atom XML, so the digest can read from the
+store instead of the API (set "arxiv_source": "snapshot", or `python main.py --source snapshot`).
+
+Usage:
+    python arxiv_snapshot.py ingest arxiv-metadata-oai-snapshot.json
+    python arxiv_snapshot.py query "cat:cs.LG OR cat:cs.CL" --days 7 --as-of 2025-01-31
+    python arxiv_snapshot.py stats
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from email.utils import parsedate_to_datetime
+from xml.sax.saxutils import escape
+
+SNAPSHOT_DB = "arxiv_snapshot.db"
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    arxiv_id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    authors TEXT NOT NULL DEFAULT '',
+    primary_category TEXT NOT NULL,
+    submitted TEXT NOT NULL,      -- YYYYMMDDHHMM of v1, as in submittedDate queries
+    updated TEXT NOT NULL         -- YYYY-MM-DD of the latest version
+);
+
+CREATE TABLE IF NOT EXISTS paper_categories (
+    category TEXT NOT NULL,
+    arxiv_id TEXT NOT NULL,
+    PRIMARY KEY (arxiv_id, category)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_papers_submitted ON papers(submitted);
+CREATE INDEX IF NOT EXISTS idx_categories_category ON paper_categories(category, arxiv_id);
+"""
+
+
+# ======================
+# INGESTION
+# ======================
+
+def _open_snapshot(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def snapshot_record(line):
+    """One snapshot line -> (paper row, categories), or None if it is unusable."""
+    data = json.loads(line)
+    categories = (data.get('categories') or '').split()
+    if not data.get('id') or not categories:
+        return None
+
+    versions = data.get('versions') or []
+    try:
+        submitted = parsedate_to_datetime(versions[0]['created']).strftime('%Y%m%d%H%M')
+    except (IndexError, KeyError, TypeError, ValueError):
+        submitted = (data.get('update_date') or '1970-01-01').replace('-', '') + '0000'
+
+    row = (
+        data['id'],
+        versions[-1].get('version', 'v1') if versions else 'v1',
+        ' '.join((data.get('title') or '').split()),
+        ' '.join((data.get('abstract') or '').split()),
+        ' '.join((data.get('authors') or '').split()),
+        categories[0],  # the snapshot lists the primary category first
+        submitted,
+        data.get('update_date') or ''
+    )
+    return row, categories
+
+
+class SnapshotStore:
+    """SQLite store of snapshot papers; `fetch` answers arXiv API queries from it."""
+
+    def __init__(self, path=SNAPSHOT_DB):
+        self.path = path
+        # One connection shared by the pipeline's fetch threads, serialized by a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def ingest(self, snapshot_path, batch_size=BATCH_SIZE):
+        """Stream a snapshot file into the store; re-ingesting a newer snapshot updates papers."""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        start = time.perf_counter()
+        total = skipped = 0
+        rows, category_rows = [], []
+
+        def flush():
+            with self.conn:
+                self.conn.executemany(
+                    "DELETE FROM paper_categories WHERE arxiv_id = ?", [(row[0],) for row in rows]
+                )
+                self.conn.executemany("INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self.conn.executemany("INSERT OR IGNORE INTO paper_categories VALUES (?, ?)", category_rows)
+            rows.clear()
+            category_rows.clear()
+
+        with _open_snapshot(snapshot_path) as f:
+            for line in f:
+                try:
+                    record = snapshot_record(line)
+                except ValueError:
+                    record = None
+                if record is None:
+                    skipped += 1
+                    continue
+                row, categories = record
+                rows.append(row)
+                category_rows.extend((category, row[0]) for category in dict.fromkeys(categories))
+                total += 1
+                if len(rows) >= batch_size:
+                    flush()
+                    if total % (batch_size * 20) == 0:
+                        print(f"   … {total:,} papers ({total / (time.perf_counter() - start):,.0f}/s)")
+        if rows:
+            flush()
+        self.conn.execute("ANALYZE")
+
+        print(f"📦 Ingested {total:,} papers from {snapshot_path} into {self.path} "
+              f"in {time.perf_counter() - start:.1f}s ({skipped} lines skipped)")
+        return total
+
+    # ----------------------
+    # Querying
+    # ----------------------
+
+    def search(self, query, max_results=50):
+        """Papers matching an arXiv API query, newest submission first."""
+        where, params = compile_query(query)
+        sql = (f"SELECT * FROM papers p WHERE {where} "
+               f"ORDER BY p.submitted DESC LIMIT ?")
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, (*params, max_results))]
+
+    def feed(self, query, max_results=5):
+        """Atom feed for a full query (date window included), as the arXiv API would return it."""
+        return to_atom(self.search(query, max_results), query)
+
+    def stats(self):
+        with self._lock:
+            total, first, last = self.conn.execute(
+                "SELECT COUNT(*), MIN(submitted), MAX(submitted) FROM papers"
+            ).fetchone()
+            top = self.conn.execute(
+                "SELECT category, COUNT(*) AS n FROM paper_categories GROUP BY category ORDER BY n DESC LIMIT 15"
+            ).fetchall()
+        return {'papers': total, 'first_submitted': first, 'last_submitted': last,
+                'top_categories': {row['category']: row['n'] for row in top}}
+
+
+# ======================
+# QUERY ENGINE
+# ======================
+
+TOKEN_RE = re.compile(r'\(|\)|(?:\w+:)?(?:"[^"]*"|\[[^\]]*\])|[^\s()]+')
+FIELDS = {'ti': "p.title", 'abs': "p.abstract", 'au': "p.authors"}
+
+
+class QueryError(ValueError):
+    pass
+
+
+def compile_query(query):
+    """Translate an arXiv API search_query into (SQL WHERE clause on papers p, params)."""
+    tokens = TOKEN_RE.findall(query)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def parse_or():
+        sql, params = parse_and()
+        while peek() == 'OR':
+            take()
+            right, right_params = parse_and()
+            sql, params = f"({sql} OR {right})", params + right_params
+        return sql, params
+
+    def parse_and():
+        sql, params = parse_term()
+        while peek() in ('AND', 'ANDNOT'):
+            op = 'AND NOT' if take() == 'ANDNOT' else 'AND'
+            right, right_params = parse_term()
+            sql, params = f"({sql} {op} {right})", params + right_params
+        return sql, params
+
+    def parse_term():
+        token = peek()
+        if token is None:
+            raise QueryError(f"unexpected end of query: {query!r}")
+        take()
+        if token == '(':
+            sql, params = parse_or()
+            if peek() != ')':
+                raise QueryError(f"missing ')' in query: {query!r}")
+            take()
+            return sql, params
+
+        field, sep, value = token.partition(':')
+        if not sep:
+            field, value = 'all', token
+        if field == 'submittedDate' and not value and peek() and peek().startswith('['):
+            value = take()  # "submittedDate: [..]" with a space
+        value = value.strip('"')
+
+        if field == 'cat':
+            if value.endswith('*'):
+                return ("EXISTS (SELECT 1 FROM paper_categories c WHERE c.arxiv_id = p.arxiv_id "
+                        "AND c.category LIKE ?)", [value[:-1] + '%'])
+            return ("EXISTS (SELECT 1 FROM paper_categories c WHERE c.arxiv_id = p.arxiv_id "
+                    "AND c.category = ?)", [value])
+        if field == 'submittedDate':
+            match = re.fullmatch(r'\[\s*(\d{8,14})\s+TO\s+(\d{8,14})\s*\]', value)
+            if not match:
+                raise QueryError(f"bad submittedDate range: {value!r}")
+            low, high = match.group(1)[:12].ljust(12, '0'), match.group(2)[:12].ljust(12, '9')
+            return "p.submitted BETWEEN ? AND ?", [low, high]
+        if field in FIELDS:
+            return f"{FIELDS[field]} LIKE ?", [f"%{value}%"]
+        if field == 'all':
+            return "(p.title LIKE ? OR p.abstract LIKE ?)", [f"%{value}%"] * 2
+        if field == 'id':
+            return "p.arxiv_id = ?", [value]
+        raise QueryError(f"unsupported field {field!r} in query: {query!r}")
+
+    sql, params = parse_or()
+    if peek() is not None:
+        raise QueryError(f"unexpected {peek()!r} in query: {query!r}")
+    return sql, params
+
+
+def to_atom(papers, query=""):
+    """Render papers as an arXiv API Atom feed (what parse_papers expects)."""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+             f'<title>arXiv Query: {escape(query)}</title>']
+    for p in papers:
+        s = p['submitted']
+        published = f"{s[:4]}-{s[4:6]}-{s[6:8]}T{s[8:10]}:{s[10:12]}:00Z"
+        parts.append(
+            f"<entry><id>http://arxiv.org/abs/{escape(p['arxiv_id'])}{escape(p['version'])}</id>"
+            f"<published>{published}</published><updated>{escape(p['updated'])}T00:00:00Z</updated>"
+            f"<title>{escape(p['title'])}</title><summary>{escape(p['abstract'])}</summary>"
+            f"<author><name>{escape(p['authors'])}</name></author>"
+            f'<arxiv:primary_category term="{escape(p["primary_category"])}"/></entry>'
+        )
+    parts.append("</feed>")
+    return "".join(parts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local arXiv metadata snapshot store")
+    parser.add_argument("--db", default=SNAPSHOT_DB, help=f"snapshot database (default: {SNAPSHOT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="load a JSON-lines snapshot (.json or .json.gz)")
+    p.add_argument("snapshot")
+
+    p = sub.add_parser("query", help="run an arXiv API style query against the store")
+    p.add_argument("query")
+    p.add_argument("--days", type=int, default=0, help="only the last N days (like recent_days)")
+    p.add_argument("--as-of", help="end of the date window, YYYY-MM-DD (default: today)")
+    p.add_argument("--max-results", type=int, default=20)
+
+    sub.add_parser("stats", help="paper count, date range and top categories")
+    args = parser.parse_args()
+
+    if args.command == "ingest" and not os.path.exists(args.snapshot):
+        sys.exit(f"❌ Snapshot not found: {args.snapshot}")
+
+    with SnapshotStore(args.db) as store:
+        if args.command == "ingest":
+            store.ingest(args.snapshot)
+        elif args.command == "query":
+            import main
+            from datetime import datetime
+            main.AS_OF = datetime.strptime(args.as_of, '%Y-%m-%d') if args.as_of else None
+            full_query = main.build_query(args.query, args.days)
+            start = time.perf_counter()
+            papers = store.search(full_query, args.max_results)
+            print(f"🔎 {full_query}: {len(papers)} papers in {(time.perf_counter() - start) * 1000:.1f} ms")
+            for paper in papers:
+                print(f"   {paper['submitted'][:8]}  {paper['arxiv_id']:<18} [{paper['primary_category']}] {paper['title'][:80]}")
+        else:
+            print(json.dumps(store.stats(), indent=2))
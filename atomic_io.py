@@ -0,0 +1,65 @@
+"""Crash-safe file writes: write to a temp file in the same directory, then rename over the target."""
+import os
+import json
+import shutil
+import filecmp
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_atomic(path, mode='w', encoding='utf-8', skip_unchanged=False):
+    """Open a temp file next to `path`; it replaces `path` only if the block finishes cleanly.
+
+    With skip_unchanged, an identical existing file is left untouched (same inode and mtime).
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; outputs should be readable like a normal open()
+        if 'b' in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, encoding=encoding)
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if skip_unchanged and os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_text(path, text, encoding='utf-8', skip_unchanged=False):
+    with open_atomic(path, 'w', encoding=encoding, skip_unchanged=skip_unchanged) as f:
+        f.write(text)
+
+
+def atomic_write_json(path, data, indent=2):
+    with open_atomic(path, 'w') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def link_or_copy(src, dst):
+    """Atomically point `dst` at the contents of `src`: hardlink when possible, else copy."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    directory = os.path.dirname(dst) or '.'
+    tmp_path = os.path.join(directory, f".{os.path.basename(dst)}.{os.getpid()}.tmp")
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        # Filesystems without hardlinks (or src on another device) get a plain copy
+        shutil.copyfile(src, tmp_path)
+    try:
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
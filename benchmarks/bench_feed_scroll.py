@@ -0,0 +1,138 @@
+"""Headless-browser benchmark: scroll through a large TikTok feed and measure per-card cost.
+
+Generates a synthetic feed (2,000 cards by default), opens it in headless Chromium,
+steps through it one card at a time and records how long each card transition takes,
+how many cards are in the DOM and whether the like button tracks the right paper.
+
+Requires playwright:  pip install playwright && playwright install chromium
+Usage:                python benchmarks/bench_feed_scroll.py [--cards 2000] [--steps 400]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_tiktok_feed import save_tiktok_feed
+
+SCROLL_SCRIPT = """
+async (steps) => {
+  const container = document.getElementById('feed-container');
+  const track = document.getElementById('feed-track');
+  const frame = () => new Promise(resolve => requestAnimationFrame(() => resolve()));
+
+  let longTasks = 0;
+  if ('PerformanceObserver' in window) {
+    try {
+      new PerformanceObserver(list => { longTasks += list.getEntries().length; })
+        .observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+  }
+
+  const cardHeight = container.clientHeight;
+  const stepTimes = [];
+  let maxCards = 0;
+  let trackingErrors = 0;
+
+  for (let i = 1; i <= steps; i++) {
+    const start = performance.now();
+    container.scrollTop = track.offsetTop + i * cardHeight;
+    await frame();
+    await frame();
+    await frame();
+    stepTimes.push(performance.now() - start);
+
+    maxCards = Math.max(maxCards, document.querySelectorAll('.paper-card').length);
+    if (currentPaperIndex !== Math.min(i, feed.total - 1)) trackingErrors++;
+  }
+
+  stepTimes.sort((a, b) => a - b);
+  const mean = stepTimes.reduce((a, b) => a + b, 0) / stepTimes.length;
+  return {
+    mean_step_ms: mean,
+    p95_step_ms: stepTimes[Math.floor(stepTimes.length * 0.95)],
+    max_step_ms: stepTimes[stepTimes.length - 1],
+    max_dom_cards: maxCards,
+    long_tasks: longTasks,
+    tracking_errors: trackingErrors,
+    js_heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null
+  };
+}
+"""
+
+
+def synthetic_feed(n_cards, n_interests=5, seed=0):
+    """Build {interest: [paper, ...]} with n_cards papers in total."""
+    rnd = random.Random(seed)
+    words = ("efficient edge privacy federated quantization inference device emotion "
+             "music audio system embedded sensor dataset benchmark framework model").split()
+    papers_by_interest = {f"Interest {i}": [] for i in range(n_interests)}
+    for i in range(n_cards):
+        arxiv_id = f"2501.{i:05d}"
+        papers_by_interest[f"Interest {i % n_interests}"].append({
+            'arxiv_id': arxiv_id,
+            'title': " ".join(rnd.choice(words) for _ in range(9)).capitalize(),
+            'summary': " ".join(rnd.choice(words) for _ in range(45)),
+            'layman': "This research makes more efficient edge computing.",
+            'difficulty': "🟢 Applied",
+            'category': "cs.LG",
+            'published': "2025-01-01",
+            'link': f"http://arxiv.org/abs/{arxiv_id}v1",
+            'pdf_link': f"https://arxiv.org/pdf/{arxiv_id}.pdf"
+        })
+    return papers_by_interest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=2000, help="number of cards in the feed")
+    parser.add_argument("--steps", type=int, default=400, help="card transitions to scroll through")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print("⚠️ playwright is not installed: pip install playwright && playwright install chromium")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        feed_file = os.path.join(tmp_dir, "tiktok_feed.html")
+        save_tiktok_feed(synthetic_feed(args.cards), filename=feed_file)
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page(viewport={'width': 390, 'height': 844})
+            page.goto(Path(feed_file).as_uri())
+            page.wait_for_selector(".paper-card")
+
+            first_paint_ms = page.evaluate("performance.now()")
+            initial_nodes = page.evaluate("document.getElementsByTagName('*').length")
+            results = page.evaluate(SCROLL_SCRIPT, min(args.steps, args.cards - 1))
+            browser.close()
+
+    results.update({
+        'cards': args.cards,
+        'steps': min(args.steps, args.cards - 1),
+        'first_paint_ms': first_paint_ms,
+        'initial_dom_nodes': initial_nodes
+    })
+
+    print(f"\n📊 Feed scroll benchmark ({args.cards} cards, {results['steps']} transitions)")
+    for key, value in results.items():
+        print(f"   • {key}: {round(value, 2) if isinstance(value, float) else value}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+    return 0 if results['tracking_errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
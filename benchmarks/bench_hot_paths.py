@@ -0,0 +1,225 @@
+"""Offline benchmarks for the digest's hot paths at 100, 10k and 100k entries.
+
+Covers parsing an Atom feed (parse_papers), scoring (calculate_relevance_score,
+estimate_difficulty, generate_layman_context), summarizing (summarize_abstract with a
+tiny stand-in model, so no download or GPU is needed) and rendering (save_html_digest,
+save_tiktok_feed). Everything runs on synthetic data in a temporary directory.
+
+Results can be saved as a baseline and later runs are compared against it, so a
+change to one of these paths shows up as a per-benchmark speed ratio.
+
+Usage:
+    python benchmarks/bench_hot_paths.py                      # all benchmarks, all sizes
+    python benchmarks/bench_hot_paths.py --sizes 100,10000 --only parse,score
+    python benchmarks/bench_hot_paths.py --save-baseline      # store results as the baseline
+    python benchmarks/bench_hot_paths.py --check              # exit 1 on a regression
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+from datetime import datetime
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main
+from generate_tiktok_feed import save_tiktok_feed
+from telemetry import peak_rss_mb
+from bench_feed_scroll import synthetic_feed
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "results", "baseline.json")
+DEFAULT_SIZES = (100, 10000, 100000)
+
+KEYWORDS = ["efficient", "edge", "compression", "quantization", "pruning",
+            "distillation", "inference", "lightweight", "mobile", "accelerat"]
+WORDS = ("efficient edge privacy federated quantization inference device emotion music audio "
+         "system embedded sensor dataset benchmark framework model theorem proof convergence "
+         "novel propose improve reduce optimize neural network learning training data").split()
+
+
+def synthetic_atom(n_entries, seed=0):
+    """An arXiv API style Atom feed with n_entries entries."""
+    rnd = random.Random(seed)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom" '
+             'xmlns:arxiv="http://arxiv.org/schemas/atom">']
+    for i in range(n_entries):
+        arxiv_id = f"25{i // 100000:02d}.{i % 100000:05d}"
+        title = " ".join(rnd.choice(WORDS) for _ in range(10))
+        abstract = ". ".join(" ".join(rnd.choice(WORDS) for _ in range(18)) for _ in range(8))
+        parts.append(
+            f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id>"
+            f"<published>2025-01-{1 + i % 28:02d}T00:00:00Z</published>"
+            f"<title>{title.capitalize()}</title><summary>{abstract}.</summary>"
+            f'<arxiv:primary_category term="cs.LG"/></entry>'
+        )
+    parts.append("</feed>")
+    return "".join(parts)
+
+
+class TinySummarizer:
+    """Stand-in for the transformers pipeline: extractive, deterministic and CPU-cheap.
+
+    Scores sentences by word frequency and returns the best ones, so the benchmark
+    measures the code around the model, not the model itself.
+    """
+
+    def __call__(self, text, max_length=142, min_length=30, truncation=True):
+        sentences = [s.strip() for s in text.split(". ") if s.strip()]
+        freq = Counter(text.lower().split())
+        ranked = sorted(sentences, key=lambda s: -sum(freq[w] for w in s.lower().split()) / (len(s.split()) or 1))
+        return [{'summary_text': " ".join(ranked[:2])[:max_length * 4]}]
+
+
+# ----------------------
+# Benchmarks: setup(n) returns the function to time
+# ----------------------
+
+def bench_parse(n, work_dir):
+    xml_data = synthetic_atom(n)
+    return lambda: main.parse_papers(xml_data)
+
+
+def bench_score(n, work_dir):
+    papers = main.parse_papers(synthetic_atom(n))
+
+    def run():
+        for p in papers:
+            main.calculate_relevance_score(p, KEYWORDS)
+            main.estimate_difficulty(p['summary'], p['category'])
+            main.generate_layman_context(p['title'], p['summary'])
+    return run
+
+
+def bench_summarize(n, work_dir):
+    abstracts = [p['summary'] for p in main.parse_papers(synthetic_atom(n))]
+    summarizer = TinySummarizer()
+
+    def run():
+        for abstract in abstracts:
+            main.summarize_abstract(abstract, summarizer)
+    return run
+
+
+def bench_render_digest(n, work_dir):
+    papers = synthetic_feed(n)
+
+    def run():
+        out_dir = tempfile.mkdtemp(dir=work_dir)  # fresh output every time, nothing to skip
+        main.save_html_digest(papers, filename=os.path.join(out_dir, "digest.html"),
+                              digest_date=datetime(2025, 1, 1), latest_file=None)
+    return run
+
+
+def bench_render_feed(n, work_dir):
+    papers = synthetic_feed(n)
+
+    def run():
+        out_dir = tempfile.mkdtemp(dir=work_dir)  # fresh output every time, nothing to skip
+        save_tiktok_feed(papers, filename=os.path.join(out_dir, "tiktok_feed.html"))
+    return run
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'score': bench_score,
+    'summarize': bench_summarize,
+    'render_digest': bench_render_digest,
+    'render_feed': bench_render_feed,
+}
+
+
+def time_benchmark(setup, n, repeat, work_dir):
+    """Best-of-`repeat` wall time of one benchmark at size n."""
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):  # keep the digest's own logging out of the results
+        run = setup(n, work_dir)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(results, baseline, threshold):
+    """Print speed ratios against the baseline; return the keys that regressed."""
+    regressions = []
+    print(f"\n📈 Compared with baseline from {baseline.get('date', '?')}:")
+    for key, entry in results.items():
+        before = baseline.get('results', {}).get(key)
+        if not before:
+            continue
+        ratio = entry['seconds'] / before['seconds'] if before['seconds'] else float('inf')
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠️ slower"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = "  🚀 faster"
+        print(f"   • {key}: {before['seconds']:.4f}s → {entry['seconds']:.4f}s (×{ratio:.2f}){flag}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated entry counts (default: 100,10000,100000)")
+    parser.add_argument("--only", help="comma-separated benchmarks: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, best one counts")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown that counts as a regression (default: 0.2)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any benchmark regressed")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in names:
+            for n in sizes:
+                # the 100k cases are slow enough that one run is representative
+                repeat = args.repeat if n < 100000 else 1
+                seconds = time_benchmark(BENCHMARKS[name], n, repeat, work_dir)
+                key = f"{name}@{n}"
+                results[key] = {'seconds': round(seconds, 6), 'per_item_us': round(seconds / n * 1e6, 3)}
+                print(f"⏱️ {key}: {seconds:.4f}s ({results[key]['per_item_us']:.1f} µs/entry)")
+
+    report = {
+        'date': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results
+    }
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.check:
+            exit_code = 1
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {path}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
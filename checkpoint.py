@@ -0,0 +1,144 @@
+"""Per-stage run checkpoints so an interrupted digest run can resume without redoing work.
+
+Layout of the checkpoint directory:
+    state.json        run id, completed interests and the seen-ID set as of the last completed interest
+    raw/*.xml         raw arXiv API responses, keyed by query parameters
+    candidates/*.json parsed candidate papers per interest and stage (primary/fallback)
+    summaries.jsonl   one line per finished summary; append-only, so a crash loses at most one line
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+
+from atomic_io import atomic_write_text, atomic_write_json
+
+CHECKPOINT_DIR = "checkpoints"
+
+
+def _key(*parts):
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+class RunCheckpoint:
+    """Checkpoint of one digest run, written atomically stage by stage."""
+
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+        self.state_file = os.path.join(directory, "state.json")
+        self.summaries_file = os.path.join(directory, "summaries.jsonl")
+        self.state = {}
+        self.summaries = {}
+        self._summaries_out = None
+        self._summaries_lock = threading.Lock()  # summarize workers append concurrently
+
+    def exists(self):
+        return os.path.exists(self.state_file)
+
+    # ----------------------
+    # Lifecycle
+    # ----------------------
+
+    def begin(self, store_run_id, seen_ids):
+        """Start a fresh checkpoint, discarding any previous one."""
+        self.clear()
+        os.makedirs(os.path.join(self.directory, "raw"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "candidates"), exist_ok=True)
+        self.state = {
+            'store_run_id': store_run_id,
+            'started_at': datetime.now().isoformat(),
+            'completed_interests': [],
+            'seen_ids': sorted(seen_ids),
+            'counts': {'new_papers': 0, 'duplicates': 0}
+        }
+        self._save_state()
+
+    def resume(self):
+        """Load an existing checkpoint; returns False if there is nothing to resume."""
+        if not self.exists():
+            return False
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading checkpoint: {e}")
+            return False
+
+        self.summaries = {}
+        if os.path.exists(self.summaries_file):
+            with open(self.summaries_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash mid-write
+                    self.summaries[record['arxiv_id']] = record['summary']
+        return True
+
+    def clear(self):
+        """Remove the checkpoint (called after a run finishes successfully)."""
+        self.close()
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory)
+        self.state = {}
+        self.summaries = {}
+
+    def close(self):
+        if self._summaries_out is not None:
+            self._summaries_out.close()
+            self._summaries_out = None
+
+    def _save_state(self):
+        atomic_write_json(self.state_file, self.state)
+
+    # ----------------------
+    # Stages
+    # ----------------------
+
+    def raw_response(self, query, max_results, days_back):
+        path = os.path.join(self.directory, "raw", _key(query, max_results, days_back) + ".xml")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+
+    def save_raw_response(self, query, max_results, days_back, xml_data):
+        path = os.path.join(self.directory, "raw", _key(query, max_results, days_back) + ".xml")
+        atomic_write_text(path, xml_data)
+
+    def candidates(self, interest_name, stage):
+        path = os.path.join(self.directory, "candidates", _key(interest_name, stage) + ".json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def save_candidates(self, interest_name, stage, papers):
+        path = os.path.join(self.directory, "candidates", _key(interest_name, stage) + ".json")
+        atomic_write_json(path, papers, indent=None)
+
+    def summary(self, arxiv_id):
+        return self.summaries.get(arxiv_id)
+
+    def save_summary(self, arxiv_id, summary):
+        """Append one completed summary and fsync it before moving on."""
+        with self._summaries_lock:
+            if self._summaries_out is None:
+                self._summaries_out = open(self.summaries_file, 'a', encoding='utf-8')
+            self._summaries_out.write(json.dumps({'arxiv_id': arxiv_id, 'summary': summary}, ensure_ascii=False) + "\n")
+            self._summaries_out.flush()
+            os.fsync(self._summaries_out.fileno())
+            self.summaries[arxiv_id] = summary
+
+    def is_interest_done(self, interest_name):
+        return interest_name in self.state.get('completed_interests', [])
+
+    def complete_interest(self, interest_name, seen_ids, new_papers, duplicates):
+        """Record that an interest's papers are selected and stored."""
+        self.state['completed_interests'].append(interest_name)
+        self.state['seen_ids'] = sorted(seen_ids)
+        self.state['counts']['new_papers'] += new_papers
+        self.state['counts']['duplicates'] += duplicates
+        self._save_state()
@@ -0,0 +1,372 @@
+"""Local read API over the paper store, plus the generated pages, for phones and laptops.
+
+    GET /api/runs?page=1&per_page=20            finished runs, newest first
+    GET /api/digests/latest                     one digest: {"run": {...}, "interests": {name: [paper, ...]}}
+    GET /api/digests/<YYYYMMDD or run id>
+    GET /api/interests                          interest names with their paper counts
+    GET /api/interests/<name>/papers?page=1     papers selected for an interest, newest first
+    GET /api/feed?page=1&per_page=20            latest digest interleaved across interests (feed fields)
+    GET /api/search?q=edge+inference&page=1     selected papers matching every word, best first
+    GET /<path>                                 generated pages only (*.html, feed.xml, static/,
+                                                arxiv_archive/, ...); old digests are read from
+                                                their monthly bundle
+
+Lists are paginated as {"items", "page", "per_page", "total", "next"}. Every response
+carries an ETag; API ETags only change when the paper store does, so a client that
+sends If-None-Match gets a bodiless 304 without the server touching the database.
+Responses are gzipped for clients that accept it (static files use their .gz copies).
+
+Usage:
+    python digest_server.py --port 8765             # serve the current directory
+    python main.py render --api http://host:8765    # render pages from another machine's API
+"""
+import os
+import json
+import re
+import gzip
+import zlib
+import hashlib
+import argparse
+import mimetypes
+import posixpath
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
+from urllib.request import Request, urlopen
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from paper_store import PaperStore, PAPER_COLUMNS
+from generate_tiktok_feed import FEED_FIELDS
+from search_index import tokenize, term_weights
+from archive_bundles import ARCHIVE_DIR, BUNDLE_DIR, read_bundled
+
+DEFAULT_PORT = 8765
+PER_PAGE = 20
+MAX_PER_PAGE = 200
+GZIP_MIN_BYTES = 1024
+CACHE_ENTRIES = 256
+BUNDLED_PAGE = re.compile(rf'{ARCHIVE_DIR}/arxiv_digest_(\d{{8}})\.html$')
+
+# Only generated artifacts are served; config, databases, state files and code are not
+PUBLIC_FILES = ('feed.xml',)
+PUBLIC_DIRS = ('static', ARCHIVE_DIR, 'tiktok_feed_data', 'search_index')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def is_public(relative):
+    """Whether a request path (relative, '/'-separated) names a generated artifact."""
+    for suffix in COMPRESSED_SUFFIXES:
+        if relative.endswith(suffix):
+            relative = relative[:-len(suffix)]
+            break
+    parts = relative.split('/')
+    if len(parts) == 1:
+        return relative.endswith('.html') or relative in PUBLIC_FILES
+    return parts[0] in PUBLIC_DIRS
+
+
+class NotFound(Exception):
+    pass
+
+
+def paginate(items, page, per_page, path):
+    start = (page - 1) * per_page
+    has_next = start + per_page < len(items)
+    return {
+        'items': items[start:start + per_page],
+        'page': page,
+        'per_page': per_page,
+        'total': len(items),
+        'next': f"{path}?page={page + 1}&per_page={per_page}" if has_next else None
+    }
+
+
+class DigestAPI:
+    """The API's data as plain Python objects (used by the server and by render --api)."""
+
+    def __init__(self, store_path="paper_store.db"):
+        self.store_path = store_path
+        self.store = PaperStore(store_path, check_same_thread=False)
+        self.lock = threading.Lock()  # server threads share the one connection
+
+    def version(self):
+        """Changes whenever the paper store is written to (cheap: one stat call)."""
+        try:
+            stat = os.stat(self.store_path)
+        except FileNotFoundError:
+            return "empty"
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def runs(self):
+        rows = self.store.conn.execute(
+            "SELECT r.run_id, r.run_date, r.started_at, r.finished_at, r.interests, "
+            "COUNT(p.arxiv_id) AS papers FROM runs r LEFT JOIN papers p ON p.run_id = r.run_id AND p.selected = 1 "
+            "WHERE r.finished_at IS NOT NULL GROUP BY r.run_id ORDER BY r.run_id DESC"
+        ).fetchall()
+        return [dict(row, interests=json.loads(row['interests'])) for row in rows]
+
+    def digest(self, which="latest"):
+        runs = self.runs()
+        if which == "latest":
+            run = runs[0] if runs else None
+        else:
+            # A date means that day's last run, like the archive page
+            run = next((r for r in runs if str(r['run_id']) == which or r['run_date'] == which), None)
+        if run is None:
+            raise NotFound(f"no digest {which}")
+        return {'run': run, 'interests': self.store.load_digest(run['run_id'])}
+
+    def interests(self):
+        rows = self.store.conn.execute(
+            "SELECT interest, COUNT(*) AS papers, MAX(run_id) AS last_run FROM papers "
+            "WHERE selected = 1 GROUP BY interest ORDER BY interest"
+        )
+        return [dict(row) for row in rows]
+
+    def interest_papers(self, name):
+        rows = self.store.conn.execute(
+            "SELECT p.*, r.run_date FROM papers p JOIN runs r ON r.run_id = p.run_id "
+            "WHERE p.interest = ? AND p.selected = 1 AND r.finished_at IS NOT NULL "
+            "ORDER BY p.run_id DESC, p.position", (name,)
+        ).fetchall()
+        if not rows:
+            raise NotFound(f"no papers for interest {name}")
+        return [self._paper(row, run_date=row['run_date']) for row in rows]
+
+    def feed(self):
+        """Latest digest, round-robin across interests (stable, unlike the shuffled HTML feed)."""
+        interests = self.digest()['interests']
+        items = []
+        for i in range(max((len(papers) for papers in interests.values()), default=0)):
+            for name, papers in interests.items():
+                if i < len(papers):
+                    item = {k: papers[i].get(k) for k in FEED_FIELDS}
+                    item['interest_category'] = name
+                    items.append(item)
+        return items
+
+    def search(self, query):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Prefilter in SQL (every word appears somewhere), then rank like search.html does
+        where = " AND ".join(["(p.title || ' ' || p.summary || ' ' || IFNULL(p.category, '')) LIKE ?"] * len(terms))
+        rows = self.store.conn.execute(
+            f"SELECT p.*, r.run_date FROM papers p JOIN runs r ON r.run_id = p.run_id "
+            f"WHERE p.selected = 1 AND r.finished_at IS NOT NULL AND {where} ORDER BY p.run_id DESC",
+            [f"%{term}%" for term in terms]
+        ).fetchall()
+        results = {}
+        for row in rows:
+            if row['arxiv_id'] in results:
+                continue  # newest occurrence only
+            paper = self._paper(row, run_date=row['run_date'], interest=row['interest'])
+            weights = term_weights(paper)
+            if all(weights.get(term) for term in terms):
+                paper['score'] = sum(weights[term] for term in terms)
+                results[row['arxiv_id']] = paper
+        return sorted(results.values(), key=lambda p: -p['score'])
+
+    @staticmethod
+    def _paper(row, **extra):
+        paper = {col: row[col] for col in PAPER_COLUMNS}
+        paper['matched_keywords'] = json.loads(paper['matched_keywords'])
+        paper.update(extra)
+        return paper
+
+
+# ======================
+# HTTP SERVER
+# ======================
+
+class DigestRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ResearchDigest/1.0"
+    api = None        # DigestAPI, set by make_server
+    root = "."        # directory of the generated pages
+    cache = None      # {etag: (raw body, gzipped body)}
+    cache_lock = None
+
+    def log_request(self, code='-', size='-'):
+        pass  # keep the console quiet; errors are still logged
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            if url.path.startswith("/api/"):
+                self.send_api(url.path, parse_qs(url.query), url)
+            else:
+                self.send_static(unquote(url.path))
+        except NotFound as e:
+            self.send_json_error(404, str(e))
+        except ValueError as e:
+            self.send_json_error(400, str(e))
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    # --- API ---
+
+    def route(self, path, query):
+        # Split before unquoting: interest names may contain an encoded "/"
+        parts = [unquote(p) for p in path.split('/')[2:] if p]
+        page = int(query.get('page', ['1'])[0])
+        per_page = min(int(query.get('per_page', [str(PER_PAGE)])[0]), MAX_PER_PAGE)
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive")
+
+        if parts == ['runs']:
+            return paginate(self.api.runs(), page, per_page, path)
+        if len(parts) == 2 and parts[0] == 'digests':
+            return self.api.digest(parts[1])
+        if parts == ['interests']:
+            return self.api.interests()
+        if len(parts) == 3 and parts[0] == 'interests' and parts[2] == 'papers':
+            return paginate(self.api.interest_papers(parts[1]), page, per_page, path)
+        if parts == ['feed']:
+            return paginate(self.api.feed(), page, per_page, path)
+        if parts == ['search']:
+            return paginate(self.api.search(query.get('q', [''])[0]), page, per_page, path)
+        raise NotFound(f"unknown endpoint {path}")
+
+    def send_api(self, path, query, url):
+        etag = '"' + hashlib.sha1(f"{self.api.version()}|{url.path}?{url.query}".encode('utf-8')).hexdigest()[:20] + '"'
+        if self.not_modified(etag):
+            return
+        with self.cache_lock:
+            cached = self.cache.get(etag)
+        if cached is None:
+            with self.api.lock:
+                data = self.route(path, query)
+            body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            cached = (body, gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None)
+            with self.cache_lock:
+                if len(self.cache) >= CACHE_ENTRIES:
+                    self.cache.pop(next(iter(self.cache)))  # oldest entry
+                self.cache[etag] = cached
+        body, gzipped = cached
+        self.send_body(body, gzipped, "application/json; charset=utf-8", etag, "no-cache")
+
+    def send_json_error(self, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    # --- Generated files ---
+
+    def send_static(self, path):
+        relative = posixpath.normpath(path).lstrip('/')
+        if relative in ('', '.'):
+            relative = 'latest.html'
+        if relative.startswith('..') or any(part.startswith('.') for part in relative.split('/')):
+            raise NotFound(path)
+        if not is_public(relative):
+            raise NotFound(path)
+        file_path = os.path.join(self.root, *relative.split('/'))
+        if not os.path.isfile(file_path):
+            self.send_bundled(relative, path)
+            return
+
+        stat = os.stat(file_path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if self.not_modified(etag):
+            return
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        gzipped = None
+        if os.path.isfile(file_path + '.gz') and self.accepts_gzip():
+            with open(file_path + '.gz', 'rb') as f:
+                gzipped = f.read()
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type.endswith(('javascript', 'json', 'xml')):
+            content_type += "; charset=utf-8"
+        # Content-hashed stylesheets never change; everything else is revalidated
+        immutable = relative.startswith('static/')
+        self.send_body(body, gzipped, content_type, etag,
+                       "public, max-age=31536000, immutable" if immutable else "no-cache")
+
+    def send_bundled(self, relative, path):
+        """An archived digest that archive_bundles.py packed: only that day is inflated."""
+        match = BUNDLED_PAGE.match(relative)
+        body = read_bundled(match.group(1), os.path.join(self.root, BUNDLE_DIR)) if match else None
+        if body is None:
+            raise NotFound(path)
+        etag = f'"{zlib.crc32(body):x}-{len(body):x}"'
+        if self.not_modified(etag):
+            return
+        gzipped = gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES and self.accepts_gzip() else None
+        self.send_body(body, gzipped, "text/html; charset=utf-8", etag, "no-cache")
+
+    # --- Helpers ---
+
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def not_modified(self, etag):
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return True
+        return False
+
+    def send_body(self, body, gzipped, content_type, etag, cache_control):
+        use_gzip = gzipped is not None and self.accepts_gzip()
+        payload = gzipped if use_gzip else body
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, store_path="paper_store.db", root="."):
+    handler = type("Handler", (DigestRequestHandler,), {
+        'api': DigestAPI(store_path),
+        'root': root,
+        'cache': {},
+        'cache_lock': threading.Lock()
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# ======================
+# CLIENT (render --api)
+# ======================
+
+def fetch_digest(base_url, which="latest", timeout=30):
+    """Fetch one digest from a running server: (interests dict, run dict)."""
+    request = Request(f"{base_url.rstrip('/')}/api/digests/{which}", headers={'Accept-Encoding': 'gzip'})
+    with urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+    data = json.loads(body)
+    return data['interests'], data['run']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve digests and the paper store as JSON (and the generated pages)")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (0.0.0.0 for the whole LAN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    from main import load_config
+    store_path = load_config(args.config).get('settings', {}).get('paper_store_file', 'paper_store.db')
+    server = make_server(args.host, args.port, store_path)
+    print(f"🌐 Serving {store_path} and this folder on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
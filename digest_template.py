@@ -0,0 +1,308 @@
+"""Precompiled, streaming HTML template for the daily digest page.
+
+Templates are split into literal chunks and field names once at import; rendering
+writes chunks straight to the output file, so time and memory stay linear in the
+number of papers instead of rebuilding one growing string.
+"""
+from string import Formatter
+
+
+def compile_template(text):
+    """Compile a str.format-style template into a function that streams it through `write`."""
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(text)]
+
+    def render(write, values):
+        for literal, field in parts:
+            if literal:
+                write(literal)
+            if field is not None:
+                write(str(values[field]))
+
+    return render
+
+
+# Not inlined: published once as a shared, content-hashed file by static_assets
+DIGEST_CSS = """
+* { box-sizing: border-box; }
+
+:root {
+  --bg: #0f0f0f;
+  --text: #e8e8e8;
+  --muted: #999;
+  --border: #2a2a2a;
+  --card-bg: #1a1a1a;
+  --link: #6ba3ff;
+  --accent: #ff6b6b;
+  --green: #51cf66;
+  --yellow: #ffd43b;
+  --red: #ff6b6b;
+  --layman-bg: #1f2937;
+  --layman-border: #60a5fa;
+}
+
+body {
+  font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+  line-height: 1.5;
+  color: var(--text);
+  background: var(--bg);
+  margin: 0;
+  padding: 1rem;
+}
+
+.container {
+  max-width: 1600px;
+  margin: 0 auto;
+}
+
+header {
+  text-align: center;
+  padding: 2rem 1rem 3rem;
+  border-bottom: 2px solid var(--border);
+  margin-bottom: 2rem;
+}
+
+h1 {
+  font-weight: 900;
+  font-size: 2.5rem;
+  margin: 0;
+  background: linear-gradient(135deg, var(--accent), #ffa94d);
+  -webkit-background-clip: text;
+  -webkit-text-fill-color: transparent;
+  background-clip: text;
+}
+
+.meta {
+  color: var(--muted);
+  font-size: 0.95rem;
+  margin-top: 0.5rem;
+  letter-spacing: 0.5px;
+}
+
+.interest-section {
+  margin-bottom: 3rem;
+}
+
+.interest-header {
+  display: flex;
+  align-items: center;
+  gap: 0.8rem;
+  margin-bottom: 1.2rem;
+  padding: 0.8rem 1rem;
+  background: var(--card-bg);
+  border-radius: 12px;
+  border-left: 4px solid var(--accent);
+}
+
+.interest-title {
+  font-size: 1.3rem;
+  margin: 0;
+  font-weight: 700;
+  color: var(--text);
+}
+
+.papers-grid {
+  display: grid;
+  grid-template-columns: repeat(auto-fill, minmax(380px, 1fr));
+  gap: 1.2rem;
+}
+
+.paper {
+  background: var(--card-bg);
+  border: 1px solid var(--border);
+  border-radius: 12px;
+  padding: 1.2rem;
+  transition: all 0.2s ease;
+  position: relative;
+  display: flex;
+  flex-direction: column;
+  height: 100%;
+}
+
+.paper:hover {
+  border-color: var(--accent);
+  transform: translateY(-2px);
+  box-shadow: 0 8px 24px rgba(255, 107, 107, 0.15);
+}
+
+.paper-header {
+  display: flex;
+  justify-content: space-between;
+  align-items: flex-start;
+  gap: 0.8rem;
+  margin-bottom: 0.8rem;
+}
+
+.difficulty-badge {
+  padding: 0.3rem 0.7rem;
+  border-radius: 20px;
+  font-size: 0.7rem;
+  font-weight: 700;
+  white-space: nowrap;
+  flex-shrink: 0;
+}
+
+.paper h3 {
+  font-size: 1.05rem;
+  margin: 0 0 0.8rem 0;
+  font-weight: 700;
+  line-height: 1.4;
+  color: var(--text);
+}
+
+.layman-box {
+  background: var(--layman-bg);
+  border-left: 3px solid var(--layman-border);
+  padding: 0.7rem 0.9rem;
+  margin-bottom: 0.8rem;
+  border-radius: 6px;
+  font-size: 0.88rem;
+  line-height: 1.5;
+  color: #94a3b8;
+  font-style: italic;
+}
+
+.summary {
+  color: var(--muted);
+  margin-bottom: 1rem;
+  font-size: 0.88rem;
+  line-height: 1.6;
+  flex-grow: 1;
+}
+
+.paper-footer {
+  display: flex;
+  justify-content: space-between;
+  align-items: center;
+  padding-top: 0.8rem;
+  border-top: 1px solid var(--border);
+  margin-top: auto;
+}
+
+.category-tag {
+  background: #1e3a5f;
+  color: #60a5fa;
+  padding: 0.25rem 0.65rem;
+  border-radius: 15px;
+  font-size: 0.75rem;
+  font-weight: 600;
+}
+
+.date {
+  color: var(--muted);
+  font-size: 0.75rem;
+}
+
+.links {
+  display: flex;
+  gap: 1rem;
+  margin-top: 0.8rem;
+}
+
+.links a {
+  color: var(--link);
+  text-decoration: none;
+  font-size: 0.85rem;
+  font-weight: 600;
+  transition: color 0.2s;
+}
+
+.links a:hover {
+  color: var(--accent);
+}
+
+.footer {
+  text-align: center;
+  margin-top: 4rem;
+  padding: 2rem;
+  color: var(--muted);
+  font-size: 0.85rem;
+  border-top: 1px solid var(--border);
+}
+
+@media (max-width: 768px) {
+  .papers-grid {
+    grid-template-columns: 1fr;
+  }
+  h1 {
+    font-size: 2rem;
+  }
+}
+"""
+
+DIGEST_HEAD = compile_template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
+  <title>arXiv Digest • {title_date}</title>
+  <link rel="stylesheet" href="{stylesheet}" />
+</head>
+<body>
+  <div class="container">
+    <header>
+      <h1>arXiv Research Digest</h1>
+      <div class="meta">{meta_date} • {paper_count} papers across {interest_count} interests</div>
+    </header>
+""")
+
+SECTION_OPEN = compile_template("""<section class="interest-section">
+  <div class="interest-header">
+    <span>🔬</span>
+    <h2 class="interest-title">{interest_name}</h2>
+  </div>
+""")
+
+PAPER_CARD = compile_template("""    <article class="paper">
+      <div class="paper-header">
+        <span class="difficulty-badge">{difficulty}</span>
+      </div>
+      <h3>{title}</h3>
+      <div class="layman-box">💡 {layman}</div>
+      <div class="summary">{summary}</div>
+      <div class="paper-footer">
+        <span class="category-tag">{category}</span>
+        <span class="date">{published}</span>
+      </div>
+      <div class="links">
+        <a href="{link}" target="_blank">Abstract ↗</a>
+        <a href="{pdf_link}" target="_blank">PDF ↗</a>
+      </div>
+    </article>
+""")
+
+NO_PAPERS = '  <p>No recent papers found.</p>\n'
+GRID_OPEN = '  <div class="papers-grid">\n'
+GRID_CLOSE = '  </div>\n'
+SECTION_CLOSE = "</section>\n"
+
+DIGEST_FOOT = """    <div class="footer">
+      ✨ Generated automatically • Powered by arXiv API
+    </div>
+  </div>
+</body>
+</html>
+"""
+
+
+def render_digest(write, all_papers_by_interest, digest_date, stylesheet):
+    """Stream the full digest page for `all_papers_by_interest` through `write`."""
+    DIGEST_HEAD(write, {
+        'stylesheet': stylesheet,
+        'title_date': digest_date.strftime('%Y-%m-%d'),
+        'meta_date': digest_date.strftime('%B %d, %Y'),
+        'paper_count': sum(len(p) for p in all_papers_by_interest.values()),
+        'interest_count': len(all_papers_by_interest)
+    })
+
+    for interest_name, papers in all_papers_by_interest.items():
+        SECTION_OPEN(write, {'interest_name': interest_name})
+        if not papers:
+            write(NO_PAPERS)
+        else:
+            write(GRID_OPEN)
+            for paper in papers:
+                PAPER_CARD(write, paper)
+            write(GRID_CLOSE)
+        write(SECTION_CLOSE)
+
+    write(DIGEST_FOOT)
@@ -0,0 +1,398 @@
+"""Distributed runs: a coordinator queues fetch and summarize jobs, worker processes do them.
+
+The coordinator runs the (multi-profile) digest as usual, but every arXiv request and
+every model call becomes a job in a durable SQLite queue (job_queue.db). Workers claim
+jobs, and before each arXiv request they ask the coordinator, which owns the only rate
+limiter, for a slot, so any number of workers together stay within request_interval.
+Finished jobs stay in the queue as a cache, so a restarted run does not redo them.
+
+    python distributed.py coordinate teams/ml/config.json teams/systems/config.json --workers 4
+    python distributed.py worker --coordinator 127.0.0.1:6000     # add a worker by hand
+    python distributed.py status
+
+Workers must be able to open the queue file: other processes on the same machine, or
+hosts sharing it on a local disk. The rate-limit coordinator itself listens on TCP.
+Set DIGEST_AUTHKEY to the same secret on all of them when listening beyond localhost:
+connections carry pickled messages, so the coordinator and workers refuse a
+non-loopback address without it.
+"""
+import os
+import json
+import time
+import socket
+import hashlib
+import ipaddress
+import argparse
+import threading
+import importlib.util
+import multiprocessing
+from datetime import date
+from multiprocessing.connection import Listener, Client
+
+import main
+from host_tuning import load_host_profile, HOST_PROFILE_DIR
+from job_queue import JobQueue, JOB_QUEUE_FILE
+from multi_profile import run_profiles, load_profile
+from pipeline import RateLimiter
+
+COORDINATOR_ADDRESS = "127.0.0.1:6000"
+JOB_TIMEOUT = 1800  # seconds a run waits for one job before giving up on it
+HEARTBEAT_INTERVAL = 10  # seconds between a worker's "still here" updates
+WORKER_STALE = 60        # a ready worker not seen for this long is gone
+WORKER_STARTUP = 300     # how long a worker may take to load the model
+NO_WORKER_GRACE = 30     # seconds a summary waits with no worker able to take it
+
+
+DEFAULT_AUTHKEY = "research-digest"  # only accepted on loopback addresses
+
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def authkey(address):
+    """The shared secret for `address` (host, port); a non-loopback address needs DIGEST_AUTHKEY."""
+    key = os.environ.get("DIGEST_AUTHKEY")
+    if not key:
+        if not is_loopback(address[0]):
+            raise ValueError(f"{address[0]} is reachable from other machines: set DIGEST_AUTHKEY "
+                             f"to a shared secret on the coordinator and every worker")
+        key = DEFAULT_AUTHKEY
+    return key.encode('utf-8')
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+def job_key(*parts):
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# ======================
+# RATE-LIMIT COORDINATOR
+# ======================
+
+class RateLimitCoordinator:
+    """Owns the arXiv rate limiter; every worker asks it for a slot before a request."""
+
+    def __init__(self, address=COORDINATOR_ADDRESS, min_interval=5):
+        self.limiter = RateLimiter(min_interval)
+        address = parse_address(address)
+        self.listener = Listener(address, authkey=authkey(address))
+        host, port = self.listener.address
+        self.address = f"{host}:{port}"
+        self.granted = 0
+
+    def start(self):
+        threading.Thread(target=self._accept, name="rate-limit-coordinator", daemon=True).start()
+        return self
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except multiprocessing.AuthenticationError:
+                continue  # wrong DIGEST_AUTHKEY; ignore that client
+            except OSError:
+                return  # listener closed
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if request == 'acquire':
+                    self.limiter.wait()
+                    self.granted += 1
+                conn.send('ok')
+
+    def close(self):
+        self.listener.close()
+
+
+class RemoteRateLimiter:
+    """Worker-side handle on the coordinator's rate limiter (same wait() as RateLimiter)."""
+
+    def __init__(self, address=COORDINATOR_ADDRESS):
+        self.address = parse_address(address)
+        self.authkey = authkey(self.address)  # checked before any job is claimed
+        self.conn = None
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            if self.conn is None:
+                self.conn = Client(self.address, authkey=self.authkey)
+            self.conn.send('acquire')
+            self.conn.recv()
+
+
+# ======================
+# QUEUE-BACKED FETCHER & SUMMARIZER (coordinator side)
+# ======================
+
+class QueueFetcher:
+    """fetcher(query, max_results, days_back) that has a worker do the request."""
+
+    def __init__(self, queue, timeout=JOB_TIMEOUT):
+        self.queue = queue
+        self.timeout = timeout
+
+    def __call__(self, query, max_results, days_back):
+        days = main.RECENT_DAYS if days_back is None else days_back
+        payload = {'query': query, 'max_results': max_results, 'days_back': days}
+        # The date window moves every day, so a cached response is only valid today
+        job_id = self.queue.put('fetch', job_key(payload, date.today().isoformat()), payload)
+        job = self.queue.wait(job_id, self.timeout)
+        if job['status'] == 'failed':
+            print(f"❌ Error fetching query '{query}': {job['error']}")
+            return None
+        return job['result']['xml']
+
+
+def can_run(queue, kind):
+    """Whether a live worker can run `kind` jobs, or one that is still starting up might."""
+    now = time.time()
+    for worker in queue.workers():
+        if worker['kinds'] is None:
+            if now - worker['started_at'] < WORKER_STARTUP:
+                return True
+        elif kind in worker['kinds'] and now - worker['seen_at'] < WORKER_STALE:
+            return True
+    return False
+
+
+class QueueSummarizer:
+    """Summarization-pipeline stand-in that has a worker run the model.
+
+    When no worker could load the model, calls fail after NO_WORKER_GRACE seconds
+    (and at once from then on), so summaries fall back to trimmed abstracts.
+    """
+
+    def __init__(self, queue, timeout=JOB_TIMEOUT):
+        self.queue = queue
+        self.timeout = timeout
+        self.unavailable = False
+        self._lock = threading.Lock()
+
+    def __call__(self, text, **kwargs):
+        if self.unavailable:
+            raise RuntimeError("no worker can summarize")
+        payload = {'text': text, 'kwargs': kwargs}
+        job_id = self.queue.put('summarize', job_key(payload), payload)
+        deadline = time.monotonic() + self.timeout
+        unable_since = None
+        while True:
+            try:
+                job = self.queue.wait(job_id, min(5, self.timeout))
+                break
+            except TimeoutError:
+                if time.monotonic() > deadline:
+                    raise
+            if can_run(self.queue, 'summarize'):
+                unable_since = None
+                continue
+            unable_since = unable_since or time.monotonic()
+            if self.unavailable or time.monotonic() - unable_since > NO_WORKER_GRACE:
+                self.queue.cancel(job_id, "no worker can summarize")
+                with self._lock:
+                    if not self.unavailable:
+                        print("⚠️ No worker could load the summarizer: summaries fall back to trimmed abstracts")
+                    self.unavailable = True
+                raise RuntimeError("no worker can summarize")
+        if job['status'] == 'failed':
+            raise RuntimeError(job['error'])
+        return job['result']['output']
+
+
+# ======================
+# WORKER
+# ======================
+
+def run_worker(queue_path=JOB_QUEUE_FILE, coordinator=COORDINATOR_ADDRESS, name=None, config=None,
+               stop=None, poll_interval=0.5):
+    """Claim and run fetch and summarize jobs until stopped (Ctrl+C or the `stop` event)."""
+    if config is not None:
+        main.apply_config(config)  # user agent and the like
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    queue = JobQueue(queue_path)
+    limiter = RemoteRateLimiter(coordinator)
+    queue.register_worker(name)  # starting: the model may take a while to load
+
+    def fetch(payload):
+        limiter.wait()
+        xml_data = main.fetch_arxiv_papers(payload['query'], payload['max_results'], payload['days_back'])
+        if xml_data is None:
+            raise RuntimeError("arXiv request failed")
+        return {'xml': xml_data}
+
+    def summarize(payload):
+        return {'output': model(payload['text'], **payload['kwargs'])}
+
+    handlers = {'fetch': fetch}
+    try:
+        model = main.get_summarizer()
+        if model is not None:
+            handlers['summarize'] = summarize
+        queue.register_worker(name, list(handlers))
+        print(f"👷 Worker {name} ready for {', '.join(handlers)} jobs")
+
+        done = 0
+        last_heartbeat = time.monotonic()
+        while stop is None or not stop.is_set():
+            if time.monotonic() - last_heartbeat > HEARTBEAT_INTERVAL:
+                queue.heartbeat(name)
+                last_heartbeat = time.monotonic()
+            job = queue.claim(name, list(handlers))
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+            try:
+                result = handlers[job['kind']](job['payload'])
+            except Exception as e:
+                print(f"⚠️ Worker {name}: {job['kind']} job {job['id']} failed (attempt {job['attempts']}): {e}")
+                queue.fail(job['id'], e)
+            else:
+                queue.complete(job['id'], result)
+                done += 1
+    finally:
+        queue.unregister_worker(name)
+        queue.close()
+    print(f"👷 Worker {name} stopped after {done} jobs")
+
+
+# ======================
+# COORDINATOR
+# ======================
+
+def _profile_settings(config_files):
+    settings = []
+    for path in config_files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings.append(json.load(f).get('settings', {}))
+        except Exception:
+            settings.append({})
+    return settings
+
+
+def worker_plan(config_files, workers=None):
+    """(worker count, worker config) for `workers`, else this host's tuned profile, else 2 workers.
+
+    The profile is looked up like a run of the first config would: its host_profile_dir
+    setting, relative to that profile's output directory.
+    """
+    if workers is not None:
+        return workers, None
+    _, config, output_dir = load_profile(config_files[0])
+    profile_dir = config.get('settings', {}).get('host_profile_dir', HOST_PROFILE_DIR)
+    tuned = (load_host_profile(os.path.join(output_dir, profile_dir)) or {}).get('distributed')
+    if not tuned:
+        return 2, None
+    print(f"🖥️ Host profile: {tuned['workers']} workers with {tuned['torch_threads']} threads each")
+    return tuned['workers'], {'settings': {'torch_threads': tuned['torch_threads']}}
+
+
+def coordinate(config_files, workers=None, queue_path=JOB_QUEUE_FILE, listen=COORDINATOR_ADDRESS):
+    """Run the profiles with fetches and summaries done by `workers` local worker processes.
+
+    Without `workers`, the worker count and threads per worker come from this host's
+    tuned profile (python main.py tune), else 2 workers.
+    """
+    queue_path = os.path.abspath(queue_path)  # profiles run in their own directories
+    queue = JobQueue(queue_path)
+    queue.prune()
+
+    profile_settings = _profile_settings(config_files)
+    coordinator = RateLimitCoordinator(
+        listen, min_interval=max(s.get('request_interval', 5) for s in profile_settings)
+    ).start()
+    print(f"🛰️ Rate-limit coordinator listening on {coordinator.address}, queue {queue_path}")
+
+    workers, worker_config = worker_plan(config_files, workers)
+    stop = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(
+            target=run_worker,
+            kwargs={'queue_path': queue_path, 'coordinator': coordinator.address,
+                    'name': f"local-{i}", 'stop': stop, 'config': worker_config},
+            daemon=True
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    # Workers only take summarize jobs if they can load the model; without transformers, or
+    # once no registered worker could load it, summaries fall back to trimmed abstracts
+    summarizer = None
+    if importlib.util.find_spec("transformers") is not None:
+        summarizer = QueueSummarizer(queue)
+    else:
+        print("⚠️ transformers is not installed: summaries fall back to trimmed abstracts")
+
+    # Keep enough summaries in flight to give every worker something to do
+    in_flight = max(workers * 2, max(s.get('summarize_workers', 1) for s in profile_settings))
+    try:
+        results = run_profiles(
+            config_files,
+            summarizer=summarizer,
+            fetch=QueueFetcher(queue),
+            request_interval=0,  # the coordinator does the rate limiting
+            overrides={'summarize_workers': in_flight}
+        )
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(10)
+        coordinator.close()
+
+    print(f"🛰️ {coordinator.granted} arXiv requests granted; jobs: {json.dumps(queue.counts())}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed digest runs with a job queue and worker processes")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("coordinate", help="run profiles, handing fetches and summaries to workers")
+    p.add_argument("configs", nargs="+", help="one config.json per profile")
+    p.add_argument("--workers", type=int,
+                   help="local worker processes to start (default: from the host profile, else 2)")
+    p.add_argument("--queue", default=JOB_QUEUE_FILE, help="job queue database")
+    p.add_argument("--listen", default=COORDINATOR_ADDRESS, help="host:port for the rate-limit coordinator")
+
+    p = sub.add_parser("worker", help="process jobs until interrupted")
+    p.add_argument("--queue", default=JOB_QUEUE_FILE, help="job queue database")
+    p.add_argument("--coordinator", default=COORDINATOR_ADDRESS, help="host:port of the coordinator")
+    p.add_argument("--config", help="config.json to take the user agent from")
+    p.add_argument("--name", help="worker name shown in the queue")
+
+    p = sub.add_parser("status", help="show job counts")
+    p.add_argument("--queue", default=JOB_QUEUE_FILE, help="job queue database")
+
+    args = parser.parse_args()
+    if args.command in ("coordinate", "worker"):
+        address = args.listen if args.command == "coordinate" else args.coordinator
+        try:
+            authkey(parse_address(address))
+        except ValueError as e:
+            raise SystemExit(f"⚠️ {e}")
+    if args.command == "coordinate":
+        coordinate(args.configs, workers=args.workers, queue_path=args.queue, listen=args.listen)
+    elif args.command == "worker":
+        config = main.load_config(args.config) if args.config else None
+        try:
+            run_worker(args.queue, args.coordinator, name=args.name, config=config)
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(JobQueue(args.queue).counts(), indent=2))
@@ -0,0 +1,210 @@
+"""Machine-readable outputs for other tools, so nobody has to scrape the HTML.
+
+    papers.jsonl          append-only JSON Lines, one line per digest paper:
+                          {"run_id", "run_started_at", "digest_date", "interest", "position",
+                           <paper fields>}
+                          Remember the byte offset you read up to; later runs only append.
+    feed.xml              Atom feed of the newest digest papers (FEED_MAX_ENTRIES). Each run
+                          adds its papers at the top and drops the oldest.
+    paper_store.parquet   optional columnar export of every stored paper of every run
+                          (needs pyarrow; a .arrow/.feather path writes Arrow IPC instead)
+
+Usage:
+    python exports.py columnar paper_store.parquet
+    python exports.py rebuild-jsonl            # rewrite papers.jsonl from the paper store
+"""
+import os
+import json
+import argparse
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from atomic_io import open_atomic
+from paper_store import PaperStore, PAPER_COLUMNS
+from static_assets import write_artifact
+
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+JSONL_FILE = "papers.jsonl"
+FEED_FILE = "feed.xml"
+FEED_MAX_ENTRIES = 200
+FEED_TITLE = "Research Digest"
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ET.register_namespace('', ATOM_NS)
+
+
+def _digest_lines(all_papers_by_interest, run_id, started_at, digest_date):
+    for interest, papers in all_papers_by_interest.items():
+        for position, paper in enumerate(papers):
+            record = {'run_id': run_id, 'run_started_at': started_at, 'digest_date': digest_date.strftime('%Y-%m-%d'),
+                      'interest': interest, 'position': position}
+            record.update((col, paper.get(col)) for col in PAPER_COLUMNS)
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _last_run(path):
+    """(run_id, run_started_at) of the last complete line of a JSON Lines file (reads only its tail)."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 65536))
+        lines = f.read().splitlines()
+    for line in reversed(lines):
+        try:
+            record = json.loads(line)
+            return record['run_id'], record.get('run_started_at')
+        except (ValueError, KeyError):
+            continue  # torn last line or a chunk boundary
+    return None
+
+
+def append_jsonl(all_papers_by_interest, run_id, started_at, digest_date, path=JSONL_FILE):
+    """Append a digest's papers to the JSON Lines log (once per run, also after --resume).
+
+    A run is recognized by its run_id together with its start time: run_ids start over
+    when paper_store.db is recreated, so they alone would skip the new store's runs.
+    """
+    if _last_run(path) == (run_id, started_at):
+        return path
+
+    data = "".join(_digest_lines(all_papers_by_interest, run_id, started_at, digest_date)).encode('utf-8')
+    with open(path, 'ab+') as f:
+        # A crash mid-append can leave a torn last line; start ours on a fresh one
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    print(f"🧾 Appended {sum(len(p) for p in all_papers_by_interest.values())} papers to {path}")
+    return path
+
+
+def rebuild_jsonl(store_path, path=JSONL_FILE):
+    """Rewrite the JSON Lines log from every finished run in the paper store."""
+    with PaperStore(store_path) as store, open_atomic(path) as f:
+        for run in store.list_runs():
+            digest_date = datetime.strptime(run['run_date'], '%Y%m%d')
+            f.writelines(_digest_lines(store.load_digest(run['run_id']), run['run_id'], run['started_at'], digest_date))
+    print(f"🧾 Rebuilt {path} from {store_path}")
+    return path
+
+
+# ======================
+# ATOM FEED
+# ======================
+
+def _atom(tag):
+    return f'{{{ATOM_NS}}}{tag}'
+
+
+def _entry(paper, interest, updated):
+    entry = ET.Element(_atom('entry'))
+    ET.SubElement(entry, _atom('id')).text = f"https://arxiv.org/abs/{paper['arxiv_id']}"
+    ET.SubElement(entry, _atom('title')).text = paper['title']
+    ET.SubElement(entry, _atom('updated')).text = updated
+    if paper.get('published') and paper['published'] != "Unknown":
+        ET.SubElement(entry, _atom('published')).text = f"{paper['published']}T00:00:00Z"
+    ET.SubElement(entry, _atom('link'), href=paper.get('link') or f"https://arxiv.org/abs/{paper['arxiv_id']}")
+    ET.SubElement(entry, _atom('link'), rel='related', type='application/pdf', href=paper.get('pdf_link') or '')
+    ET.SubElement(entry, _atom('category'), term=interest)
+    if paper.get('category'):
+        ET.SubElement(entry, _atom('category'), term=paper['category'], scheme='https://arxiv.org/archive')
+    summary = paper['summary']
+    if paper.get('layman'):
+        summary = f"{summary}\n\n{paper['layman']}"
+    ET.SubElement(entry, _atom('summary')).text = summary
+    return entry
+
+
+def update_atom_feed(all_papers_by_interest, digest_date, path=FEED_FILE,
+                     max_entries=FEED_MAX_ENTRIES, title=FEED_TITLE):
+    """Put a digest's papers at the top of the Atom feed, keeping the newest max_entries."""
+    updated = digest_date.astimezone().isoformat(timespec='seconds')
+    new_entries = [_entry(paper, interest, updated)
+                   for interest, papers in all_papers_by_interest.items() for paper in papers]
+    new_ids = {entry.findtext(_atom('id')) for entry in new_entries}
+
+    old_entries = []
+    if os.path.exists(path):
+        try:
+            old_entries = ET.parse(path).getroot().findall(_atom('entry'))
+        except ET.ParseError as e:
+            print(f"⚠️ Starting a new {path}: {e}")
+    old_entries = [entry for entry in old_entries if entry.findtext(_atom('id')) not in new_ids]
+
+    feed = ET.Element(_atom('feed'))
+    ET.SubElement(feed, _atom('id')).text = f"urn:research-digest:{title}"
+    ET.SubElement(feed, _atom('title')).text = title
+    ET.SubElement(feed, _atom('updated')).text = updated
+    ET.SubElement(ET.SubElement(feed, _atom('author')), _atom('name')).text = title
+    ET.SubElement(feed, _atom('link'), rel='self', href=os.path.basename(path))
+    ET.SubElement(feed, _atom('link'), rel='alternate', href='latest.html')
+    feed.extend((new_entries + old_entries)[:max_entries])
+
+    write_artifact(path, '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(feed, encoding='unicode') + "\n")
+    print(f"📡 Atom feed saved to {path} ({len(new_entries)} new entries)")
+    return path
+
+
+# ======================
+# COLUMNAR EXPORT
+# ======================
+
+def export_columnar(store_path, path="paper_store.parquet"):
+    """Write every stored paper (with its run date) as Parquet, or Arrow IPC for .arrow/.feather."""
+    if pyarrow is None:
+        print("⚠️ pyarrow is not installed; skipping the columnar export (pip install pyarrow)")
+        return None
+
+    with PaperStore(store_path) as store:
+        rows = store.conn.execute(
+            "SELECT r.run_date, p.* FROM papers p JOIN runs r ON r.run_id = p.run_id "
+            "WHERE r.finished_at IS NOT NULL ORDER BY p.run_id, p.interest, p.selected DESC, p.position"
+        )
+        columns = [description[0] for description in rows.description]
+        data = {name: [] for name in columns}
+        for row in rows:
+            for name, value in zip(columns, row):
+                data[name].append(value)
+
+    data['relevance_score'] = [float(v or 0) for v in data['relevance_score']]
+    data['selected'] = [bool(v) for v in data['selected']]
+    data['matched_keywords'] = [json.loads(v) for v in data['matched_keywords']]
+    table = pyarrow.table(data)
+
+    tmp_path = f"{path}.tmp"
+    if path.endswith(('.arrow', '.feather')):
+        pyarrow.feather.write_feather(table, tmp_path)
+    else:
+        pyarrow.parquet.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    print(f"🧊 Exported {table.num_rows} stored papers to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    from main import load_config
+
+    parser = argparse.ArgumentParser(description="Machine-readable exports of the paper store")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("columnar", help="export the paper store as Parquet or Arrow")
+    p.add_argument("path", nargs="?", default="paper_store.parquet")
+    sub.add_parser("rebuild-jsonl", help="rewrite the JSON Lines log from the paper store")
+    args = parser.parse_args()
+
+    settings = load_config(args.config).get('settings', {})
+    store_path = settings.get('paper_store_file', 'paper_store.db')
+    if args.command == "columnar":
+        export_columnar(store_path, args.path)
+    else:
+        rebuild_jsonl(store_path, settings.get('jsonl_file', JSONL_FILE))
@@ -0,0 +1,59 @@
+"""Learn how many fresh papers each interest's primary query yields, run after run.
+
+When an interest has recently come up short (fewer than MIN_PAPERS_THRESHOLD fresh
+papers from its primary query), its wider fallback query is queued together with the
+primary one instead of after it, so a sparse interest no longer costs an extra round
+trip (and rate-limit wait) on the critical path.
+
+Stats file layout:
+    {"interests": {name: {"yield": ewma_of_fresh_papers, "runs": n, "fallbacks": n, "updated": iso}}}
+"""
+import os
+import json
+from datetime import datetime
+
+from atomic_io import atomic_write_json
+
+FALLBACK_STATS_FILE = "fallback_stats.json"
+
+
+class FallbackPlanner:
+    def __init__(self, path=FALLBACK_STATS_FILE, threshold=5, smoothing=0.3, headroom=1.5):
+        self.path = path
+        self.threshold = threshold
+        self.smoothing = smoothing   # weight of the newest run in the moving average
+        self.headroom = headroom     # prefetch while the expected yield is below threshold * headroom
+        self.stats = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('interests', {})
+            except Exception as e:
+                print(f"⚠️ Error loading {self.path}: {e}")
+        return {}
+
+    def expected_yield(self, interest_name):
+        """Moving average of fresh primary-query papers, or None before the first run."""
+        entry = self.stats.get(interest_name)
+        return entry['yield'] if entry else None
+
+    def expects_shortfall(self, interest_name):
+        """True when the fallback query is likely to be needed this run."""
+        expected = self.expected_yield(interest_name)
+        return expected is not None and expected < self.threshold * self.headroom
+
+    def record(self, interest_name, fresh_count, used_fallback):
+        """Fold one run's primary-query yield into the moving average."""
+        entry = self.stats.get(interest_name)
+        if entry is None:
+            entry = self.stats[interest_name] = {'yield': float(fresh_count), 'runs': 0, 'fallbacks': 0}
+        else:
+            entry['yield'] = round(self.smoothing * fresh_count + (1 - self.smoothing) * entry['yield'], 3)
+        entry['runs'] += 1
+        entry['fallbacks'] += int(used_fallback)
+        entry['updated'] = datetime.now().isoformat()
+
+    def save(self):
+        atomic_write_json(self.path, {'interests': self.stats})
@@ -1,205 +1,363 @@
-"""Generate an index.html page to browse all archived digests."""
+"""Generate the archive index: a small index.html plus one page per month.
+
+A manifest (arxiv_archive/manifest.json) records every digest with its date, paper
+count, interests and path. save_html_digest updates it through record_digest(), which
+regenerates only the affected month page and the small top-level index. Digests
+packed by archive_bundles.py point at their month's reading page and name the bundle
+they are in.
+"""
 import os
-from datetime import datetime
+import re
+import sys
+import json
 import glob
+from datetime import datetime
 
-def generate_index():
-    archive_dir = "arxiv_archive"
+from atomic_io import atomic_write_json
+from static_assets import publish_stylesheet, write_artifact
+from archive_bundles import ARCHIVE_DIR, bundled_dates, read_digest, reading_page_link
+MANIFEST_FILE = os.path.join(ARCHIVE_DIR, "manifest.json")
+INDEX_FILE = "index.html"
 
-    # Get all digest files
-    if os.path.exists(archive_dir):
-        digest_files = sorted(glob.glob(os.path.join(archive_dir, "arxiv_digest_*.html")), reverse=True)
-    else:
-        digest_files = []
+# Digests listed directly on index.html; older ones are reached through the month pages
+RECENT_REPORTS = 7
+
+INDEX_CSS = """
+* { box-sizing: border-box; }
+
+body {
+  font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+  background: #0f0f0f;
+  color: #e8e8e8;
+  margin: 0;
+  padding: 2rem;
+}
+
+.container {
+  max-width: 900px;
+  margin: 0 auto;
+}
+
+header {
+  text-align: center;
+  margin-bottom: 3rem;
+  padding-bottom: 2rem;
+  border-bottom: 2px solid #2a2a2a;
+}
+
+h1 {
+  font-weight: 900;
+  font-size: 2.5rem;
+  margin: 0 0 0.5rem 0;
+  background: linear-gradient(135deg, #ff6b6b, #ffa94d);
+  -webkit-background-clip: text;
+  -webkit-text-fill-color: transparent;
+  background-clip: text;
+}
+
+.subtitle {
+  color: #999;
+  font-size: 1rem;
+}
+
+.latest-link {
+  display: inline-block;
+  background: #ff6b6b;
+  color: white;
+  padding: 1rem 2rem;
+  border-radius: 8px;
+  text-decoration: none;
+  font-weight: 700;
+  margin-bottom: 3rem;
+  transition: transform 0.2s, box-shadow 0.2s;
+}
+
+.latest-link:hover {
+  transform: translateY(-2px);
+  box-shadow: 0 8px 24px rgba(255, 107, 107, 0.3);
+}
+
+.archive-list {
+  list-style: none;
+  padding: 0;
+}
+
+.archive-item {
+  background: #1a1a1a;
+  border: 1px solid #2a2a2a;
+  border-radius: 10px;
+  padding: 1.5rem;
+  margin-bottom: 1rem;
+  transition: all 0.2s;
+}
+
+.archive-item:hover {
+  border-color: #ff6b6b;
+  transform: translateX(5px);
+}
 
-    # Parse dates and create entries
-    entries = []
-    for filepath in digest_files:
-        filename = os.path.basename(filepath)
+.archive-item a {
+  text-decoration: none;
+  color: #e8e8e8;
+  display: flex;
+  justify-content: space-between;
+  align-items: center;
+}
+
+.date-info {
+  display: flex;
+  flex-direction: column;
+  gap: 0.3rem;
+}
+
+.date-main {
+  font-size: 1.2rem;
+  font-weight: 700;
+  color: #6ba3ff;
+}
+
+.date-day {
+  font-size: 0.9rem;
+  color: #999;
+}
+
+.arrow {
+  font-size: 1.5rem;
+  color: #ff6b6b;
+}
+
+.no-reports {
+  text-align: center;
+  color: #999;
+  padding: 3rem;
+}
+
+.stats {
+  text-align: center;
+  margin-top: 3rem;
+  padding-top: 2rem;
+  border-top: 1px solid #2a2a2a;
+  color: #999;
+  font-size: 0.9rem;
+}
+"""
+
+# ======================
+# MANIFEST
+# ======================
+
+def load_manifest():
+    """Return {date_str: entry}; date_str is YYYYMMDD."""
+    if os.path.exists(MANIFEST_FILE):
+        try:
+            with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f).get('digests', {})
+        except Exception as e:
+            print(f"⚠️ Error loading archive manifest: {e}")
+    return {}
+
+def save_manifest(digests):
+    atomic_write_json(MANIFEST_FILE, {
+        'digests': dict(sorted(digests.items())),
+        'last_updated': datetime.now().isoformat()
+    })
+
+def scan_archive():
+    """Rebuild manifest entries from the digest files and bundles on disk (bootstrap / --rebuild)."""
+    bundles = bundled_dates()
+    dates = set(bundles)
+    for filepath in glob.glob(os.path.join(ARCHIVE_DIR, "arxiv_digest_*.html")):
         # Extract date from filename: arxiv_digest_20251101.html
-        date_str = filename.replace("arxiv_digest_", "").replace(".html", "")
+        dates.add(os.path.basename(filepath).replace("arxiv_digest_", "").replace(".html", ""))
+
+    digests = {}
+    for date_str in sorted(dates):
         try:
-            date_obj = datetime.strptime(date_str, "%Y%m%d")
-            formatted_date = date_obj.strftime("%B %d, %Y")
-            day_of_week = date_obj.strftime("%A")
-            entries.append({
-                'filename': filename,
-                'date': formatted_date,
-                'day': day_of_week,
-                'date_obj': date_obj
-            })
+            datetime.strptime(date_str, "%Y%m%d")
         except ValueError:
             continue
 
-    html = f"""<!DOCTYPE html>
+        # Paper count and interests are read back from the page itself (one day of a bundle at a time)
+        page = read_digest(date_str).decode('utf-8')
+        count_match = re.search(r'(\d+) papers across \d+ interests', page)
+        digests[date_str] = {
+            'date': f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}",
+            'paper_count': int(count_match.group(1)) if count_match else None,
+            'interests': re.findall(r'<h2 class="interest-title">(.*?)</h2>', page),
+            'path': f"{ARCHIVE_DIR}/arxiv_digest_{date_str}.html"
+        }
+        if date_str in bundles and not os.path.exists(os.path.join(ARCHIVE_DIR, f"arxiv_digest_{date_str}.html")):
+            # Packed days are read on their month's reading page
+            digests[date_str].update(path=reading_page_link(date_str), bundle=bundles[date_str].replace(os.sep, '/'))
+    return digests
+
+# ======================
+# PAGES
+# ======================
+
+def month_page_name(month_key):
+    return f"index_{month_key}.html"
+
+def group_by_month(digests):
+    """Return {YYYYMM: [date_str, ...]} with dates newest first."""
+    months = {}
+    for date_str in sorted(digests, reverse=True):
+        months.setdefault(date_str[:6], []).append(date_str)
+    return months
+
+def render_entry(date_str, entry, href):
+    date_obj = datetime.strptime(date_str, "%Y%m%d")
+    details = date_obj.strftime("%A")
+    if entry.get('paper_count') is not None:
+        details += f" • {entry['paper_count']} papers"
+    if entry.get('interests'):
+        details += f" • {len(entry['interests'])} interests"
+    return f"""      <li class="archive-item">
+        <a href="{href}">
+          <div class="date-info">
+            <div class="date-main">{date_obj.strftime("%B %d, %Y")}</div>
+            <div class="date-day">{details}</div>
+          </div>
+          <div class="arrow">→</div>
+        </a>
+      </li>
+"""
+
+def render_page(title, heading, subtitle, stylesheet, top_link, body, stats):
+    return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>arXiv Digest Archive</title>
-  <style>
-    * {{ box-sizing: border-box; }}
-
-    body {{
-      font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-      background: #0f0f0f;
-      color: #e8e8e8;
-      margin: 0;
-      padding: 2rem;
-    }}
-
-    .container {{
-      max-width: 900px;
-      margin: 0 auto;
-    }}
-
-    header {{
-      text-align: center;
-      margin-bottom: 3rem;
-      padding-bottom: 2rem;
-      border-bottom: 2px solid #2a2a2a;
-    }}
-
-    h1 {{
-      font-weight: 900;
-      font-size: 2.5rem;
-      margin: 0 0 0.5rem 0;
-      background: linear-gradient(135deg, #ff6b6b, #ffa94d);
-      -webkit-background-clip: text;
-      -webkit-text-fill-color: transparent;
-      background-clip: text;
-    }}
-
-    .subtitle {{
-      color: #999;
-      font-size: 1rem;
-    }}
-
-    .latest-link {{
-      display: inline-block;
-      background: #ff6b6b;
-      color: white;
-      padding: 1rem 2rem;
-      border-radius: 8px;
-      text-decoration: none;
-      font-weight: 700;
-      margin-bottom: 3rem;
-      transition: transform 0.2s, box-shadow 0.2s;
-    }}
-
-    .latest-link:hover {{
-      transform: translateY(-2px);
-      box-shadow: 0 8px 24px rgba(255, 107, 107, 0.3);
-    }}
-
-    .archive-list {{
-      list-style: none;
-      padding: 0;
-    }}
-
-    .archive-item {{
-      background: #1a1a1a;
-      border: 1px solid #2a2a2a;
-      border-radius: 10px;
-      padding: 1.5rem;
-      margin-bottom: 1rem;
-      transition: all 0.2s;
-    }}
-
-    .archive-item:hover {{
-      border-color: #ff6b6b;
-      transform: translateX(5px);
-    }}
-
-    .archive-item a {{
-      text-decoration: none;
-      color: #e8e8e8;
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-    }}
-
-    .date-info {{
-      display: flex;
-      flex-direction: column;
-      gap: 0.3rem;
-    }}
-
-    .date-main {{
-      font-size: 1.2rem;
-      font-weight: 700;
-      color: #6ba3ff;
-    }}
-
-    .date-day {{
-      font-size: 0.9rem;
-      color: #999;
-    }}
-
-    .arrow {{
-      font-size: 1.5rem;
-      color: #ff6b6b;
-    }}
-
-    .no-reports {{
-      text-align: center;
-      color: #999;
-      padding: 3rem;
-    }}
-
-    .stats {{
-      text-align: center;
-      margin-top: 3rem;
-      padding-top: 2rem;
-      border-top: 1px solid #2a2a2a;
-      color: #999;
-      font-size: 0.9rem;
-    }}
-  </style>
+  <title>{title}</title>
+  <link rel="stylesheet" href="{stylesheet}" />
 </head>
 <body>
   <div class="container">
     <header>
-      <h1>📚 arXiv Digest Archive</h1>
-      <p class="subtitle">Browse your daily research digests</p>
+      <h1>{heading}</h1>
+      <p class="subtitle">{subtitle}</p>
     </header>
 
     <div style="text-align: center;">
-      <a href="latest.html" class="latest-link">📰 View Latest Digest</a>
+      {top_link}
     </div>
-
-    <h2 style="margin-bottom: 1.5rem; color: #e8e8e8;">Past Reports</h2>
+{body}
+    <div class="stats">
+      {stats}
+    </div>
+  </div>
+</body>
+</html>
 """
 
-    if entries:
-        html += '    <ul class="archive-list">\n'
-        for entry in entries:
-            html += f"""      <li class="archive-item">
-        <a href="arxiv_archive/{entry['filename']}">
+def write_month_page(month_key, date_strs, digests, stylesheet):
+    """Regenerate arxiv_archive/index_YYYYMM.html for one month."""
+    month_name = datetime.strptime(month_key, "%Y%m").strftime("%B %Y")
+    body = f'\n    <h2 style="margin-bottom: 1.5rem; color: #e8e8e8;">{month_name}</h2>\n'
+    body += '    <ul class="archive-list">\n'
+    for date_str in date_strs:
+        body += render_entry(date_str, digests[date_str], os.path.basename(digests[date_str]['path']))
+    body += '    </ul>\n'
+
+    html = render_page(
+        title=f"arXiv Digest Archive • {month_name}",
+        heading=f"📚 {month_name}",
+        subtitle="Daily research digests",
+        stylesheet=stylesheet,
+        top_link='<a href="../index.html" class="latest-link">← All Months</a>',
+        body=body,
+        stats=f'{len(date_strs)} report{"s" if len(date_strs) != 1 else ""} this month'
+    )
+    write_artifact(os.path.join(ARCHIVE_DIR, month_page_name(month_key)), html)
+
+def write_root_index(digests, months, stylesheet):
+    """Regenerate index.html: recent reports plus one link per month."""
+    recent = sorted(digests, reverse=True)[:RECENT_REPORTS]
+
+    body = '\n    <h2 style="margin-bottom: 1.5rem; color: #e8e8e8;">Recent Reports</h2>\n'
+    if recent:
+        body += '    <ul class="archive-list">\n'
+        for date_str in recent:
+            body += render_entry(date_str, digests[date_str], digests[date_str]['path'])
+        body += '    </ul>\n'
+
+        body += '\n    <h2 style="margin-bottom: 1.5rem; color: #e8e8e8;">Browse by Month</h2>\n'
+        body += '    <ul class="archive-list">\n'
+        for month_key, date_strs in months.items():
+            month_name = datetime.strptime(month_key, "%Y%m").strftime("%B %Y")
+            body += f"""      <li class="archive-item">
+        <a href="{ARCHIVE_DIR}/{month_page_name(month_key)}">
           <div class="date-info">
-            <div class="date-main">{entry['date']}</div>
-            <div class="date-day">{entry['day']}</div>
+            <div class="date-main">{month_name}</div>
+            <div class="date-day">{len(date_strs)} report{"s" if len(date_strs) != 1 else ""}</div>
           </div>
           <div class="arrow">→</div>
         </a>
       </li>
 """
-        html += '    </ul>\n'
+        body += '    </ul>\n'
     else:
-        html += '    <div class="no-reports">No archived reports yet. Run the digest script to generate your first report!</div>\n'
+        body += '    <div class="no-reports">No archived reports yet. Run the digest script to generate your first report!</div>\n'
 
-    html += f"""
-    <div class="stats">
-      {len(entries)} report{"s" if len(entries) != 1 else ""} archived • Updated {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
-    </div>
-  </div>
-</body>
-</html>
-"""
+    html = render_page(
+        title="arXiv Digest Archive",
+        heading="📚 arXiv Digest Archive",
+        subtitle="Browse your daily research digests",
+        stylesheet=stylesheet,
+        top_link='<a href="latest.html" class="latest-link">📰 View Latest Digest</a>\n      <a href="search.html" class="latest-link">🔎 Search</a>',
+        body=body,
+        stats=f'{len(digests)} report{"s" if len(digests) != 1 else ""} archived • Updated {datetime.now().strftime("%B %d, %Y at %I:%M %p")}'
+    )
+    write_artifact(INDEX_FILE, html)
+
+def publish_index_stylesheet():
+    return publish_stylesheet('index', INDEX_CSS, ['.', ARCHIVE_DIR])
+
+# ======================
+# ENTRY POINTS
+# ======================
+
+def record_digest(digest_date, paper_count, interests, path):
+    """Add or update one digest in the manifest; regenerate only its month page and index.html."""
+    bootstrap = not os.path.exists(MANIFEST_FILE)
+    digests = scan_archive() if bootstrap else load_manifest()  # first run with a pre-manifest archive
+
+    date_str = digest_date.strftime("%Y%m%d")
+    digests[date_str] = {
+        'date': digest_date.strftime("%Y-%m-%d"),
+        'paper_count': paper_count,
+        'interests': list(interests),
+        'path': path.replace(os.sep, '/')
+    }
+    save_manifest(digests)
+
+    months = group_by_month(digests)
+    stylesheet = publish_index_stylesheet()
+    for month_key in (months if bootstrap else [date_str[:6]]):
+        write_month_page(month_key, months[month_key], digests, stylesheet)
+    write_root_index(digests, months, stylesheet)
+
+def generate_index(rebuild=False, months=()):
+    """Regenerate index.html from the manifest; rebuild rescans the archive and every month page.
+
+    months: YYYYMM keys whose month pages are rewritten in any case (e.g. after a rollup).
+    """
+    refresh = set(months)
+    if rebuild or not os.path.exists(MANIFEST_FILE):
+        digests = scan_archive()
+        save_manifest(digests)
+    else:
+        digests = load_manifest()
 
-    with open("index.html", 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"📑 Index page generated with {len(entries)} reports")
+    months = group_by_month(digests)
+    stylesheet = publish_index_stylesheet()
+    for month_key, date_strs in months.items():
+        month_page = os.path.join(ARCHIVE_DIR, month_page_name(month_key))
+        if rebuild or month_key in refresh or not os.path.exists(month_page):
+            write_month_page(month_key, date_strs, digests, stylesheet)
+    write_root_index(digests, months, stylesheet)
+    print(f"📑 Index page generated with {len(digests)} reports across {len(months)} months")
 
 if __name__ == "__main__":
-    generate_index()
+    generate_index(rebuild="--rebuild" in sys.argv[1:])
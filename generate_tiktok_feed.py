@@ -1,24 +1,291 @@
+import os
 import json
 import random
+import hashlib
 from datetime import datetime
 
+from static_assets import publish_stylesheet, write_artifact
+
+# Papers per lazily loaded data chunk; only the first chunk is embedded in the page
+FEED_CHUNK_SIZE = 20
+
+# Fields the feed actually renders or exports; everything else stays in the paper store
+FEED_FIELDS = ('arxiv_id', 'title', 'summary', 'layman', 'difficulty', 'category',
+               'published', 'link', 'pdf_link', 'interest_category')
+
+FEED_CSS = """
+* {
+  box-sizing: border-box;
+  margin: 0;
+  padding: 0;
+}
+
+:root {
+  --bg: #000000;
+  --text: #ffffff;
+  --muted: #a0a0a0;
+  --card-bg: #1a1a1a;
+  --border: #2a2a2a;
+  --accent: #ff6b6b;
+  --heart-red: #ff4458;
+  --layman-bg: #1f2937;
+  --layman-border: #60a5fa;
+}
+
+body {
+  font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+  background: var(--bg);
+  color: var(--text);
+  overflow-x: hidden;
+  -webkit-font-smoothing: antialiased;
+}
+
+#feed-container {
+  position: relative;
+  height: 100vh;
+  overflow-y: scroll;
+  scroll-snap-type: y mandatory;
+  -webkit-overflow-scrolling: touch;
+  padding-top: 60px; /* Space for fixed header */
+}
+
+#feed-track {
+  position: relative;
+}
+
+/* Cards are absolutely positioned in a track sized for the whole feed,
+   so only the cards near the viewport need to exist in the DOM */
+.paper-card {
+  position: absolute;
+  left: 0;
+  right: 0;
+  height: 100vh;
+  overflow-y: auto;
+  scroll-snap-align: start;
+  scroll-snap-stop: always;
+  display: flex;
+  flex-direction: column;
+  justify-content: center;
+  padding: 2rem 1.5rem;
+  border-bottom: 1px solid var(--border);
+}
+
+.interest-badge {
+  display: inline-block;
+  background: var(--accent);
+  color: white;
+  padding: 0.4rem 0.9rem;
+  border-radius: 20px;
+  font-size: 0.7rem;
+  font-weight: 700;
+  text-transform: uppercase;
+  letter-spacing: 0.5px;
+  margin-bottom: 1rem;
+}
+
+.difficulty-badge {
+  display: inline-block;
+  padding: 0.3rem 0.7rem;
+  border-radius: 15px;
+  font-size: 0.7rem;
+  font-weight: 600;
+  margin-left: 0.5rem;
+}
+
+.paper-title {
+  font-size: 1.5rem;
+  font-weight: 800;
+  line-height: 1.3;
+  margin-bottom: 1rem;
+  color: var(--text);
+}
+
+.layman-box {
+  background: var(--layman-bg);
+  border-left: 3px solid var(--layman-border);
+  padding: 1rem;
+  margin-bottom: 1rem;
+  border-radius: 8px;
+  font-size: 0.95rem;
+  line-height: 1.6;
+  color: #94a3b8;
+  font-style: italic;
+}
+
+.summary {
+  color: var(--muted);
+  font-size: 0.95rem;
+  line-height: 1.6;
+  margin-bottom: 1.5rem;
+}
+
+.paper-meta {
+  display: flex;
+  justify-content: space-between;
+  align-items: center;
+  margin-bottom: 1rem;
+  color: var(--muted);
+  font-size: 0.8rem;
+}
+
+.category-tag {
+  background: #1e3a5f;
+  color: #60a5fa;
+  padding: 0.3rem 0.7rem;
+  border-radius: 15px;
+  font-size: 0.75rem;
+  font-weight: 600;
+}
+
+.links {
+  display: flex;
+  gap: 1.5rem;
+  margin-bottom: 2rem;
+}
+
+.links a {
+  color: #6ba3ff;
+  text-decoration: none;
+  font-size: 0.9rem;
+  font-weight: 600;
+  display: flex;
+  align-items: center;
+  gap: 0.3rem;
+}
+
+.links a:active {
+  color: var(--accent);
+}
+
+/* Fixed header with export button */
+.fixed-header {
+  position: fixed;
+  top: 0;
+  left: 0;
+  right: 0;
+  background: rgba(0, 0, 0, 0.95);
+  backdrop-filter: blur(10px);
+  padding: 0.8rem 1.5rem;
+  display: flex;
+  align-items: center;
+  justify-content: space-between;
+  border-bottom: 1px solid var(--border);
+  z-index: 200;
+}
+
+.like-counter {
+  display: flex;
+  align-items: center;
+  gap: 0.5rem;
+  color: var(--muted);
+  font-size: 0.9rem;
+}
+
+.export-button {
+  background: linear-gradient(135deg, var(--accent), #ffa94d);
+  color: white;
+  border: none;
+  padding: 0.6rem 1.2rem;
+  border-radius: 20px;
+  font-weight: 700;
+  font-size: 0.85rem;
+  cursor: pointer;
+  transition: all 0.2s ease;
+  -webkit-tap-highlight-color: transparent;
+  opacity: 0.5;
+  pointer-events: none;
+}
+
+.export-button.active {
+  opacity: 1;
+  pointer-events: auto;
+}
+
+.export-button.active:active {
+  transform: scale(0.95);
+}
+
+.like-button {
+  position: fixed;
+  bottom: 2rem;
+  right: 1.5rem;
+  width: 60px;
+  height: 60px;
+  border-radius: 50%;
+  background: rgba(26, 26, 26, 0.9);
+  border: 2px solid var(--border);
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  font-size: 1.8rem;
+  cursor: pointer;
+  transition: all 0.2s ease;
+  z-index: 100;
+  -webkit-tap-highlight-color: transparent;
+}
+
+.like-button:active {
+  transform: scale(0.9);
+}
+
+.like-button.liked {
+  background: var(--heart-red);
+  border-color: var(--heart-red);
+  animation: heartbeat 0.3s ease;
+}
+
+@keyframes heartbeat {
+  0%, 100% { transform: scale(1); }
+  50% { transform: scale(1.2); }
+}
+
+.scroll-indicator {
+  position: fixed;
+  bottom: 1rem;
+  left: 50%;
+  transform: translateX(-50%);
+  color: var(--muted);
+  font-size: 0.8rem;
+  animation: bounce 2s infinite;
+  z-index: 50;
+}
+
+@keyframes bounce {
+  0%, 100% { transform: translateX(-50%) translateY(0); }
+  50% { transform: translateX(-50%) translateY(-10px); }
+}
+
+.card-loading {
+  color: var(--muted);
+  text-align: center;
+  font-size: 0.9rem;
+}
+
+.hide-indicator {
+  display: none;
+}
+"""
+
 def interleave_papers_by_interest(all_papers_by_interest):
     """
     Interleave papers round-robin style across interests.
     Returns a flat list cycling through: Interest1[0], Interest2[0], ..., Interest1[1], Interest2[1], ...
+    The input is left untouched: lists and papers are copied before shuffling.
     """
-    # Shuffle papers within each interest category
-    for interest_name in all_papers_by_interest:
-        random.shuffle(all_papers_by_interest[interest_name])
+    # Shuffle copies of the papers within each interest category
+    shuffled = {}
+    for interest_name, papers in all_papers_by_interest.items():
+        shuffled[interest_name] = [dict(p) for p in papers]
+        random.shuffle(shuffled[interest_name])
 
     # Interleave round-robin
     interleaved = []
-    interest_names = list(all_papers_by_interest.keys())
-    max_papers = max(len(papers) for papers in all_papers_by_interest.values()) if all_papers_by_interest else 0
+    interest_names = list(shuffled.keys())
+    max_papers = max(len(papers) for papers in shuffled.values()) if shuffled else 0
 
     for i in range(max_papers):
         for interest_name in interest_names:
-            papers = all_papers_by_interest[interest_name]
+            papers = shuffled[interest_name]
             if i < len(papers):
                 # Add interest category to paper data
                 papers[i]['interest_category'] = interest_name
@@ -26,10 +293,28 @@ def interleave_papers_by_interest(all_papers_by_interest):
 
     return interleaved
 
-def generate_tiktok_html(interleaved_papers):
-    """Generate self-contained TikTok-style feed HTML with embedded data."""
-
-    papers_json = json.dumps(interleaved_papers, indent=2, ensure_ascii=False)
+def compact_json(data):
+    """Unindented JSON that is also safe to inline inside a <script> tag."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+def split_feed_chunks(interleaved_papers, chunk_size=FEED_CHUNK_SIZE):
+    """Reduce papers to FEED_FIELDS and split them into fixed-size chunks."""
+    rows = [{k: p.get(k) for k in FEED_FIELDS} for p in interleaved_papers]
+    return [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+def generate_tiktok_html(chunks, data_dir, stylesheet, chunk_size=FEED_CHUNK_SIZE):
+    """Generate the TikTok-style feed page: first chunk inline, the rest loaded from data_dir on demand."""
+
+    total = sum(len(chunk) for chunk in chunks)
+    version = hashlib.sha1(compact_json(chunks).encode('utf-8')).hexdigest()[:10]
+    manifest_json = compact_json({
+        'total': total,
+        'chunkSize': chunk_size,
+        'chunkCount': len(chunks),
+        'dataDir': data_dir,
+        'version': version
+    })
+    first_chunk_json = compact_json(chunks[0] if chunks else [])
     date_str = datetime.now().strftime('%B %d, %Y')
 
     html = f"""<!DOCTYPE html>
@@ -38,242 +323,7 @@ def generate_tiktok_html(interleaved_papers):
   <meta charset="UTF-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1.0, user-scalable=no"/>
   <title>Research Feed • {date_str}</title>
-  <style>
-    * {{
-      box-sizing: border-box;
-      margin: 0;
-      padding: 0;
-    }}
-
-    :root {{
-      --bg: #000000;
-      --text: #ffffff;
-      --muted: #a0a0a0;
-      --card-bg: #1a1a1a;
-      --border: #2a2a2a;
-      --accent: #ff6b6b;
-      --heart-red: #ff4458;
-      --layman-bg: #1f2937;
-      --layman-border: #60a5fa;
-    }}
-
-    body {{
-      font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-      background: var(--bg);
-      color: var(--text);
-      overflow-x: hidden;
-      -webkit-font-smoothing: antialiased;
-    }}
-
-    #feed-container {{
-      height: 100vh;
-      overflow-y: scroll;
-      scroll-snap-type: y mandatory;
-      -webkit-overflow-scrolling: touch;
-      padding-top: 60px; /* Space for fixed header */
-    }}
-
-    .paper-card {{
-      min-height: 100vh;
-      scroll-snap-align: start;
-      scroll-snap-stop: always;
-      display: flex;
-      flex-direction: column;
-      justify-content: center;
-      padding: 2rem 1.5rem;
-      position: relative;
-      border-bottom: 1px solid var(--border);
-    }}
-
-    .interest-badge {{
-      display: inline-block;
-      background: var(--accent);
-      color: white;
-      padding: 0.4rem 0.9rem;
-      border-radius: 20px;
-      font-size: 0.7rem;
-      font-weight: 700;
-      text-transform: uppercase;
-      letter-spacing: 0.5px;
-      margin-bottom: 1rem;
-    }}
-
-    .difficulty-badge {{
-      display: inline-block;
-      padding: 0.3rem 0.7rem;
-      border-radius: 15px;
-      font-size: 0.7rem;
-      font-weight: 600;
-      margin-left: 0.5rem;
-    }}
-
-    .paper-title {{
-      font-size: 1.5rem;
-      font-weight: 800;
-      line-height: 1.3;
-      margin-bottom: 1rem;
-      color: var(--text);
-    }}
-
-    .layman-box {{
-      background: var(--layman-bg);
-      border-left: 3px solid var(--layman-border);
-      padding: 1rem;
-      margin-bottom: 1rem;
-      border-radius: 8px;
-      font-size: 0.95rem;
-      line-height: 1.6;
-      color: #94a3b8;
-      font-style: italic;
-    }}
-
-    .summary {{
-      color: var(--muted);
-      font-size: 0.95rem;
-      line-height: 1.6;
-      margin-bottom: 1.5rem;
-    }}
-
-    .paper-meta {{
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-      margin-bottom: 1rem;
-      color: var(--muted);
-      font-size: 0.8rem;
-    }}
-
-    .category-tag {{
-      background: #1e3a5f;
-      color: #60a5fa;
-      padding: 0.3rem 0.7rem;
-      border-radius: 15px;
-      font-size: 0.75rem;
-      font-weight: 600;
-    }}
-
-    .links {{
-      display: flex;
-      gap: 1.5rem;
-      margin-bottom: 2rem;
-    }}
-
-    .links a {{
-      color: #6ba3ff;
-      text-decoration: none;
-      font-size: 0.9rem;
-      font-weight: 600;
-      display: flex;
-      align-items: center;
-      gap: 0.3rem;
-    }}
-
-    .links a:active {{
-      color: var(--accent);
-    }}
-
-    /* Fixed header with export button */
-    .fixed-header {{
-      position: fixed;
-      top: 0;
-      left: 0;
-      right: 0;
-      background: rgba(0, 0, 0, 0.95);
-      backdrop-filter: blur(10px);
-      padding: 0.8rem 1.5rem;
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-      border-bottom: 1px solid var(--border);
-      z-index: 200;
-    }}
-
-    .like-counter {{
-      display: flex;
-      align-items: center;
-      gap: 0.5rem;
-      color: var(--muted);
-      font-size: 0.9rem;
-    }}
-
-    .export-button {{
-      background: linear-gradient(135deg, var(--accent), #ffa94d);
-      color: white;
-      border: none;
-      padding: 0.6rem 1.2rem;
-      border-radius: 20px;
-      font-weight: 700;
-      font-size: 0.85rem;
-      cursor: pointer;
-      transition: all 0.2s ease;
-      -webkit-tap-highlight-color: transparent;
-      opacity: 0.5;
-      pointer-events: none;
-    }}
-
-    .export-button.active {{
-      opacity: 1;
-      pointer-events: auto;
-    }}
-
-    .export-button.active:active {{
-      transform: scale(0.95);
-    }}
-
-    .like-button {{
-      position: fixed;
-      bottom: 2rem;
-      right: 1.5rem;
-      width: 60px;
-      height: 60px;
-      border-radius: 50%;
-      background: rgba(26, 26, 26, 0.9);
-      border: 2px solid var(--border);
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      font-size: 1.8rem;
-      cursor: pointer;
-      transition: all 0.2s ease;
-      z-index: 100;
-      -webkit-tap-highlight-color: transparent;
-    }}
-
-    .like-button:active {{
-      transform: scale(0.9);
-    }}
-
-    .like-button.liked {{
-      background: var(--heart-red);
-      border-color: var(--heart-red);
-      animation: heartbeat 0.3s ease;
-    }}
-
-    @keyframes heartbeat {{
-      0%, 100% {{ transform: scale(1); }}
-      50% {{ transform: scale(1.2); }}
-    }}
-
-    .scroll-indicator {{
-      position: fixed;
-      bottom: 1rem;
-      left: 50%;
-      transform: translateX(-50%);
-      color: var(--muted);
-      font-size: 0.8rem;
-      animation: bounce 2s infinite;
-      z-index: 50;
-    }}
-
-    @keyframes bounce {{
-      0%, 100% {{ transform: translateX(-50%) translateY(0); }}
-      50% {{ transform: translateX(-50%) translateY(-10px); }}
-    }}
-
-    .hide-indicator {{
-      display: none;
-    }}
-  </style>
+  <link rel="stylesheet" href="{stylesheet}" />
 </head>
 <body>
   <!-- Fixed Header with Export Button -->
@@ -285,7 +335,9 @@ def generate_tiktok_html(interleaved_papers):
     <button class="export-button" id="exportButton">Export Likes</button>
   </div>
 
-  <div id="feed-container"></div>
+  <div id="feed-container">
+    <div id="feed-track"></div>
+  </div>
 
   <div class="like-button" id="likeButton">
     <span id="heartIcon">♡</span>
@@ -297,28 +349,73 @@ def generate_tiktok_html(interleaved_papers):
 
   <script>
     // ============================================
-    // EMBEDDED PAPERS DATA
+    // FEED DATA (first chunk embedded, the rest loaded on demand)
     // ============================================
-    const papers = {papers_json};
+    const feed = {manifest_json};
+    const chunks = {{ 0: {first_chunk_json} }};
+    const pendingChunks = {{}};
+
+    // Chunk files call this when their <script> loads (works from file:// too)
+    window.feedChunk = function(chunkIndex, rows) {{
+      chunks[chunkIndex] = rows;
+      delete pendingChunks[chunkIndex];
+
+      // Fill in placeholder cards that were waiting for this chunk
+      renderedCards.forEach((card, index) => {{
+        if (chunkOf(index) === chunkIndex) fillCard(card, getPaper(index));
+      }});
+      if (chunkOf(currentPaperIndex) === chunkIndex) updateLikeButton();
+    }};
+
+    function chunkOf(index) {{
+      return Math.floor(index / feed.chunkSize);
+    }}
+
+    function getPaper(index) {{
+      const chunk = chunks[chunkOf(index)];
+      return chunk ? chunk[index % feed.chunkSize] : null;
+    }}
+
+    function loadChunk(chunkIndex) {{
+      if (chunkIndex < 0 || chunkIndex >= feed.chunkCount) return;
+      if (chunks[chunkIndex] || pendingChunks[chunkIndex]) return;
+
+      pendingChunks[chunkIndex] = true;
+      const script = document.createElement('script');
+      script.src = `${{feed.dataDir}}/chunk_${{String(chunkIndex).padStart(4, '0')}}.js?v=${{feed.version}}`;
+      script.onload = () => script.remove();
+      script.onerror = () => {{
+        delete pendingChunks[chunkIndex];
+        script.remove();
+      }};
+      document.head.appendChild(script);
+    }}
 
     // ============================================
     // STATE MANAGEMENT
     // ============================================
     let likes = JSON.parse(localStorage.getItem('tiktok_likes') || '{{}}');
     let currentPaperIndex = 0;
+    let cardHeight = 0;
+
+    // Cards kept in the DOM around the current one; everything else is virtual
+    const WINDOW_BEFORE = 2;
+    const WINDOW_AFTER = 3;
+    const renderedCards = new Map();
+
+    const container = document.getElementById('feed-container');
+    const track = document.getElementById('feed-track');
 
     // ============================================
-    // RENDER FEED
+    // RENDER FEED (virtualized window of cards)
     // ============================================
-    function renderFeed() {{
-      const container = document.getElementById('feed-container');
-
-      papers.forEach((paper, index) => {{
-        const card = document.createElement('div');
-        card.className = 'paper-card';
-        card.dataset.index = index;
+    function fillCard(card, paper) {{
+      if (!paper) {{
+        card.innerHTML = '<div class="card-loading">Loading…</div>';
+        return;
+      }}
 
-        card.innerHTML = `
+      card.innerHTML = `
           <div class="interest-badge">${{paper.interest_category}}</div>
           <div class="difficulty-badge">${{paper.difficulty}}</div>
 
@@ -338,33 +435,103 @@ def generate_tiktok_html(interleaved_papers):
             <a href="${{paper.pdf_link}}" target="_blank">PDF ↗</a>
           </div>
         `;
+    }}
+
+    function positionCard(card, index) {{
+      card.style.top = `${{index * cardHeight}}px`;
+      card.style.height = `${{cardHeight}}px`;
+    }}
+
+    function renderWindow() {{
+      if (feed.total === 0) return;
+
+      const start = Math.max(0, currentPaperIndex - WINDOW_BEFORE);
+      const end = Math.min(feed.total - 1, currentPaperIndex + WINDOW_AFTER);
 
-        container.appendChild(card);
+      // Drop cards that left the window
+      renderedCards.forEach((card, index) => {{
+        if (index < start || index > end) {{
+          if (cardObserver) cardObserver.unobserve(card);
+          card.remove();
+          renderedCards.delete(index);
+        }}
       }});
+
+      // Create cards that entered it
+      for (let index = start; index <= end; index++) {{
+        if (renderedCards.has(index)) continue;
+        const card = document.createElement('div');
+        card.className = 'paper-card';
+        card.dataset.index = index;
+        positionCard(card, index);
+        fillCard(card, getPaper(index));
+        track.appendChild(card);
+        renderedCards.set(index, card);
+        if (cardObserver) cardObserver.observe(card);
+      }}
+
+      // Load the chunks the window needs, and prefetch the next one
+      loadChunk(chunkOf(start));
+      loadChunk(chunkOf(end));
+      loadChunk(chunkOf(end) + 1);
+    }}
+
+    function layoutFeed() {{
+      cardHeight = container.clientHeight;
+      track.style.height = `${{feed.total * cardHeight}}px`;
+      renderedCards.forEach((card, index) => positionCard(card, index));
+      container.scrollTop = track.offsetTop + currentPaperIndex * cardHeight;
     }}
 
     // ============================================
-    // LIKE SYSTEM
+    // ACTIVE CARD TRACKING
     // ============================================
+    // An IntersectionObserver reports when a card becomes mostly visible. Reports are
+    // batched into one update per animation frame, so the window and like button are
+    // touched once per card transition instead of on every scroll event.
+    let pendingIndex = null;
+    let pendingFrame = 0;
+
+    const cardObserver = 'IntersectionObserver' in window
+      ? new IntersectionObserver(entries => {{
+          entries.forEach(entry => {{
+            if (entry.isIntersecting) pendingIndex = Number(entry.target.dataset.index);
+          }});
+          scheduleActiveCard();
+        }}, {{ root: container, threshold: 0.6 }})
+      : null;
+
+    function scheduleActiveCard() {{
+      if (pendingIndex === null || pendingFrame) return;
+      pendingFrame = requestAnimationFrame(commitActiveCard);
+    }}
+
+    function commitActiveCard() {{
+      pendingFrame = 0;
+      const index = pendingIndex;
+      pendingIndex = null;
+      if (index === null || index === currentPaperIndex) return;
+
+      currentPaperIndex = index;
+      renderWindow();
+      updateLikeButton();
+    }}
+
     function getCurrentPaper() {{
-      const container = document.getElementById('feed-container');
-      const scrollPos = container.scrollTop;
-      const windowHeight = window.innerHeight;
-
-      // Find which paper is currently in view
-      const cards = document.querySelectorAll('.paper-card');
-      for (let i = 0; i < cards.length; i++) {{
-        const rect = cards[i].getBoundingClientRect();
-        if (rect.top >= -windowHeight/2 && rect.top < windowHeight/2) {{
-          return i;
-        }}
-      }}
-      return 0;
+      // Fallback for browsers without IntersectionObserver: cards have a fixed
+      // height, so the index follows directly from the scroll offset
+      if (!cardHeight) return 0;
+      const index = Math.round((container.scrollTop - track.offsetTop) / cardHeight);
+      return Math.max(0, Math.min(feed.total - 1, index));
     }}
 
+    // ============================================
+    // LIKE SYSTEM
+    // ============================================
+
     function toggleLike() {{
-      const paperIndex = getCurrentPaper();
-      const paper = papers[paperIndex];
+      const paper = getPaper(currentPaperIndex);
+      if (!paper) return;
       const arxivId = paper.arxiv_id;
 
       const heartIcon = document.getElementById('heartIcon');
@@ -399,12 +566,11 @@ def generate_tiktok_html(interleaved_papers):
     }}
 
     function updateLikeButton() {{
-      const paperIndex = getCurrentPaper();
-      const paper = papers[paperIndex];
+      const paper = getPaper(currentPaperIndex);
       const heartIcon = document.getElementById('heartIcon');
       const likeButton = document.getElementById('likeButton');
 
-      if (likes[paper.arxiv_id]) {{
+      if (paper && likes[paper.arxiv_id]) {{
         heartIcon.textContent = '♥';
         likeButton.classList.add('liked');
       }} else {{
@@ -467,21 +633,30 @@ def generate_tiktok_html(interleaved_papers):
     document.getElementById('likeButton').addEventListener('click', toggleLike);
     document.getElementById('exportButton').addEventListener('click', exportLikes);
 
-    // Update like button when scrolling
-    document.getElementById('feed-container').addEventListener('scroll', () => {{
-      updateLikeButton();
+    // Without IntersectionObserver, track the current card from batched scroll events
+    if (!cardObserver) {{
+      container.addEventListener('scroll', () => {{
+        pendingIndex = getCurrentPaper();
+        scheduleActiveCard();
+      }}, {{ passive: true }});
+    }}
 
-      // Hide scroll indicator after first scroll
-      const scrollIndicator = document.getElementById('scrollIndicator');
-      if (document.getElementById('feed-container').scrollTop > 50) {{
-        scrollIndicator.classList.add('hide-indicator');
+    // Hide scroll indicator after first scroll
+    function hideScrollIndicator() {{
+      if (container.scrollTop > 50) {{
+        document.getElementById('scrollIndicator').classList.add('hide-indicator');
+        container.removeEventListener('scroll', hideScrollIndicator);
       }}
-    }});
+    }}
+    container.addEventListener('scroll', hideScrollIndicator, {{ passive: true }});
+
+    window.addEventListener('resize', layoutFeed);
 
     // ============================================
     // INITIALIZATION
     // ============================================
-    renderFeed();
+    layoutFeed();
+    renderWindow();
     updateLikeButton();
     updateCounter();
     updateExportButton();
@@ -492,6 +667,19 @@ def generate_tiktok_html(interleaved_papers):
 
     return html
 
+def save_feed_chunks(chunks, data_dir):
+    """Write each chunk as a small script calling feedChunk(); remove chunks left over from larger feeds."""
+    os.makedirs(data_dir, exist_ok=True)
+    wanted = set()
+    for chunk_index, chunk in enumerate(chunks):
+        name = f"chunk_{chunk_index:04d}.js"
+        wanted.add(name)
+        write_artifact(os.path.join(data_dir, name), f"feedChunk({chunk_index},{compact_json(chunk)});\n")
+
+    for name in os.listdir(data_dir):
+        if name.startswith("chunk_") and name.split(".js")[0] + ".js" not in wanted:
+            os.remove(os.path.join(data_dir, name))
+
 def save_tiktok_feed(all_papers_by_interest, filename='tiktok_feed.html'):
     """
     Generate and save TikTok-style feed from papers data.
@@ -501,12 +689,17 @@ def save_tiktok_feed(all_papers_by_interest, filename='tiktok_feed.html'):
     interleaved = interleave_papers_by_interest(all_papers_by_interest)
     print(f"\n🔄 Interleaved {len(interleaved)} papers across {len(all_papers_by_interest)} interests")
 
+    # Split into compact chunks; all but the first are loaded on demand by the page
+    chunks = split_feed_chunks(interleaved)
+    data_dir = os.path.splitext(filename)[0] + "_data"
+    save_feed_chunks(chunks, data_dir)
+
     # Generate HTML
-    html = generate_tiktok_html(interleaved)
+    stylesheet = publish_stylesheet('feed', FEED_CSS, [os.path.dirname(filename) or '.'])
+    html = generate_tiktok_html(chunks, os.path.basename(data_dir), stylesheet)
 
     # Save file
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html)
+    write_artifact(filename, html)
 
-    print(f"✨ TikTok feed saved to {filename}")
+    print(f"✨ TikTok feed saved to {filename} ({len(chunks)} data chunks in {data_dir}/)")
     print("📱 Sync with your phone and open in browser!")
@@ -0,0 +1,373 @@
+"""Host auto-tuning: calibrate the summarizer setup on this machine and save it as a host profile.
+
+`python main.py tune` summarizes a fixed set of abstracts under candidate setups
+and measures summaries per second and peak memory (RSS) for each:
+
+    backend        cpu, plus cuda or mps when torch can use them
+    torch_threads  intra-op threads (1, 2, 4, ... up to the CPU count)
+    batch size     summaries computed per model call (summarize_batch_size), fed by
+                   as many summarize workers
+    interop        inter-op threads, tried for the best setup
+    processes      several worker processes splitting the cores (distributed.py)
+
+Every measurement runs in a fresh process through the same code path as a digest
+run (get_summarizer and summarize_abstract), so thread settings and peak memory do
+not leak between candidates. The fastest setup within the memory limit (max_rss_mb
+or --max-memory) is saved to host_profiles/<hostname>.json. Later runs on this host
+load it automatically; settings in config.json still take precedence.
+
+Usage:
+    python main.py tune [--quick] [--max-memory 700]
+    python host_tuning.py show
+"""
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+from datetime import datetime
+
+from atomic_io import atomic_write_json
+
+HOST_PROFILE_DIR = "host_profiles"
+TUNED_SETTINGS = ('summarizer_device', 'torch_threads', 'torch_interop_threads',
+                  'summarize_batch_size', 'summarize_workers')
+
+CALIBRATION_ABSTRACTS = (
+    "We study post-training quantization of transformer language models for inference on "
+    "edge devices. Weights and activations are stored in eight bits with per-channel scales, "
+    "and a calibration pass over a few hundred unlabeled sentences chooses the clipping ranges. "
+    "Outlier channels in the attention projections are kept in higher precision. On three "
+    "summarization and two question answering benchmarks the quantized models retain over 99% "
+    "of the full-precision quality while running 2.7 times faster on a mobile CPU and using a "
+    "quarter of the memory. We release the calibration code and the quantized checkpoints.",
+
+    "Federated learning lets hospitals train a shared model without exchanging patient records, "
+    "but client data is rarely identically distributed. We propose a personalization layer that "
+    "each client fine-tunes locally while the backbone is averaged across sites. A theoretical "
+    "analysis bounds the gap between the personalized and the centralized optimum under "
+    "bounded heterogeneity. Experiments on chest X-ray classification across twelve hospitals "
+    "show a 6.4 point accuracy gain over federated averaging and faster convergence, with no "
+    "increase in communication cost per round.",
+
+    "Large vision models are expensive to deploy on embedded hardware. We present a structured "
+    "pruning method that removes whole attention heads and feed-forward channels based on a "
+    "second-order estimate of their contribution to the loss. Pruning is interleaved with short "
+    "distillation phases from the unpruned teacher. The resulting models are 3.1 times smaller "
+    "and 2.4 times faster on an ARM Cortex-A76 at the same ImageNet accuracy, and transfer "
+    "better to detection and segmentation than unstructured sparse models of equal size.",
+
+    "Music emotion recognition usually relies on large labeled datasets that are costly to "
+    "collect. We introduce a self-supervised pretraining objective that predicts masked "
+    "segments of the mel spectrogram together with their harmonic context. A small encoder "
+    "pretrained this way on unlabeled recordings reaches state-of-the-art valence and arousal "
+    "regression on two benchmarks with a tenth of the labels, and runs in real time on a "
+    "smartphone. Listening tests confirm that its errors align with disagreement among human "
+    "annotators.",
+
+    "We prove convergence guarantees for stochastic gradient descent with delayed gradients in "
+    "the nonconvex setting, as arises in asynchronous distributed training. Our rate depends on "
+    "the average rather than the maximum delay, which removes a pessimistic factor from "
+    "previous analyses. The proof uses a new potential function that couples the iterate with "
+    "a virtual sequence of undelayed updates. Simulations on a cluster with heterogeneous "
+    "workers confirm that step sizes chosen from the average delay train faster without loss "
+    "of stability.",
+
+    "Retrieval-augmented generation improves factual accuracy but adds latency for every "
+    "query. We propose a cache of retrieved passages keyed by query embeddings, with an "
+    "admission policy learned from reuse statistics and a freshness bound for updated "
+    "documents. On an open-domain question answering workload the cache serves 58% of "
+    "retrievals, cutting median latency by 41% with an accuracy drop below half a point. We "
+    "analyze when semantic caching fails and give a simple test for detecting stale entries.",
+
+    "Sensor networks for environmental monitoring must run for years on small batteries. We "
+    "design a duty-cycling scheduler that predicts interesting events from a lightweight "
+    "recurrent model on the node and wakes the radio only when a reading is likely to matter. "
+    "A field deployment of forty nodes over eight months extended battery life from five to "
+    "fourteen months while detecting 97% of the pollution episodes found by always-on "
+    "reference stations. The scheduler needs under four kilobytes of memory.",
+
+    "Benchmarks for code generation models mostly test short standalone functions. We "
+    "introduce a dataset of repository-level tasks that require reading several files, "
+    "respecting project conventions and passing the existing test suite. Each task comes with "
+    "hidden tests written by the original maintainers. Current models solve fewer than a "
+    "third of the tasks, and failures concentrate on cross-file dependencies and error "
+    "handling. We provide an evaluation harness with sandboxed execution and report results "
+    "for eleven open and proprietary models.",
+)
+
+
+def host_name():
+    return re.sub(r'[^\w.-]', '_', platform.node() or 'host')
+
+
+def fingerprint():
+    """What a profile was measured on; a profile from different hardware is not used."""
+    return {'host': platform.node(), 'machine': platform.machine(), 'cpus': os.cpu_count()}
+
+
+def host_profile_path(profile_dir=HOST_PROFILE_DIR):
+    return os.path.join(profile_dir, f"{host_name()}.json")
+
+
+def load_host_profile(profile_dir=HOST_PROFILE_DIR):
+    """This host's tuned profile, or None if there is none (or it was measured elsewhere)."""
+    path = host_profile_path(profile_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Error loading {path}: {e}")
+        return None
+    measured_on = profile.get('fingerprint', {})
+    if any(measured_on.get(k) != v for k, v in fingerprint().items() if k != 'host'):
+        return None
+    profile['path'] = path
+    return profile
+
+
+def describe(setup):
+    text = (f"{setup['summarizer_device']}, {setup['torch_threads']} threads, "
+            f"batch {setup['summarize_batch_size']}")
+    if setup.get('torch_interop_threads'):
+        text += f", {setup['torch_interop_threads']} interop"
+    if setup.get('processes', 1) > 1:
+        text += f", ×{setup['processes']} processes"
+    return text
+
+
+# ======================
+# MEASUREMENT (child process)
+# ======================
+
+def measure(config_path, setup, abstracts, hold=False):
+    """Summarize the calibration abstracts with one setup in this process; print the result as JSON."""
+    from concurrent.futures import ThreadPoolExecutor
+    import main
+    from telemetry import peak_rss_mb
+
+    config = main.load_config(config_path) if os.path.exists(config_path) else {}
+    tuned = {k: setup[k] for k in TUNED_SETTINGS if k in setup}
+    main.apply_config(dict(config, settings={**config.get('settings', {}), **tuned, 'host_profile': False}))
+
+    start = time.perf_counter()
+    if main.get_summarizer() is None:
+        print(json.dumps({'error': 'summarizer unavailable'}), flush=True)
+        return
+    loaded = time.perf_counter()
+    texts = list(CALIBRATION_ABSTRACTS[:abstracts])
+    main.summarize_abstract(texts[0])  # warm-up: first-call allocations and kernel selection
+
+    if hold:
+        # Start the timed part together with the other processes of the same setup
+        print("ready", flush=True)
+        sys.stdin.readline()
+    began = time.time()
+    with ThreadPoolExecutor(max_workers=main.SUMMARIZE_WORKERS) as pool:
+        list(pool.map(main.summarize_abstract, texts))
+    ended = time.time()
+
+    print(json.dumps({
+        'load_seconds': round(loaded - start, 3),
+        'summaries': len(texts),
+        'began': began,
+        'ended': ended,
+        'summaries_per_second': len(texts) / (ended - began),
+        'peak_rss_mb': peak_rss_mb()
+    }), flush=True)
+
+
+def run_setup(config_path, setup, abstracts, processes=1):
+    """Measure a setup in `processes` fresh processes running side by side."""
+    command = [sys.executable, os.path.abspath(__file__), "measure", "--config", config_path,
+               "--setup", json.dumps(setup), "--abstracts", str(abstracts)]
+    if processes > 1:
+        command.append("--hold")
+    children = [subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL, text=True) for _ in range(processes)]
+    try:
+        if processes > 1:
+            for child in children:
+                line = None
+                while line != "ready":
+                    line = child.stdout.readline()
+                    if not line:
+                        return {'error': f"exited with {child.wait()}"}
+                    line = line.strip()
+                    if line.startswith('{"error"'):
+                        return json.loads(line)
+            for child in children:
+                child.stdin.write("\n")
+                child.stdin.flush()
+        results = []
+        for child in children:
+            lines = child.stdout.read().strip().splitlines()
+            child.wait()
+            results.append(json.loads(lines[-1]) if lines else {'error': f"exited with {child.returncode}"})
+    finally:
+        for child in children:
+            if child.poll() is None:
+                child.kill()
+
+    errors = [r['error'] for r in results if 'error' in r]
+    if errors:
+        return {'error': errors[0]}
+    wall = max(r['ended'] for r in results) - min(r['began'] for r in results)
+    return {
+        'summaries_per_second': round(sum(r['summaries'] for r in results) / wall, 3),
+        'peak_rss_mb': round(sum(r['peak_rss_mb'] or 0 for r in results), 1),
+        'load_seconds': max(r['load_seconds'] for r in results)
+    }
+
+
+# ======================
+# TUNING
+# ======================
+
+def available_backends():
+    import torch
+    backends = ['cpu']
+    if torch.cuda.is_available():
+        backends.append('cuda')
+    mps = getattr(torch.backends, 'mps', None)
+    if mps is not None and mps.is_available():
+        backends.append('mps')
+    return backends
+
+
+def thread_counts(cpus, quick=False):
+    counts = {cpus, max(1, cpus // 2)} if quick else {1, 2, 4, cpus // 2, cpus}
+    return sorted(n for n in counts if 1 <= n <= cpus)
+
+
+def candidate_setups(backends, cpus, quick=False):
+    batch_sizes = (1, 4) if quick else (1, 4, 8)
+    for backend in backends:
+        # Accelerators do the math themselves; a couple of CPU threads feed them
+        threads = thread_counts(cpus, quick) if backend == 'cpu' else [min(2, cpus)]
+        for n_threads in threads:
+            for batch_size in batch_sizes + (() if backend == 'cpu' else (16,)):
+                yield {'summarizer_device': backend, 'torch_threads': n_threads,
+                       'summarize_batch_size': batch_size, 'summarize_workers': batch_size}
+
+
+def tune(config_path="config.json", quick=False, max_memory_mb=None, profile_dir=HOST_PROFILE_DIR):
+    """Measure candidate setups on this host and save the best as its host profile."""
+    try:
+        backends = available_backends()
+    except ImportError:
+        print("❌ torch is not installed; there is nothing to tune (pip install -r requirements.txt)")
+        return None
+    cpus = os.cpu_count() or 1
+    abstracts = 4 if quick else len(CALIBRATION_ABSTRACTS)
+    print(f"🔧 Tuning the summarizer on {platform.node()} ({cpus} CPUs, backends: {', '.join(backends)}, "
+          f"{abstracts} calibration abstracts"
+          + (f", memory limit {max_memory_mb} MB" if max_memory_mb else "") + ")")
+
+    results = []
+
+    def trial(setup, processes=1):
+        result = run_setup(config_path, setup, abstracts, processes)
+        if 'error' in result:
+            print(f"   • {describe(setup)}: failed ({result['error']})")
+            return None
+        entry = dict(setup, **result)
+        entry['within_memory'] = max_memory_mb is None or entry['peak_rss_mb'] <= max_memory_mb
+        results.append(entry)
+        print(f"   • {describe(entry)}: {entry['summaries_per_second']:.2f} summaries/s, "
+              f"peak {entry['peak_rss_mb']} MB" + ("" if entry['within_memory'] else " (over the limit)"))
+        return entry
+
+    def best(entries):
+        usable = [e for e in entries if e and e['within_memory']]
+        return max(usable, key=lambda e: (e['summaries_per_second'], -e['peak_rss_mb']), default=None)
+
+    for setup in candidate_setups(backends, cpus, quick):
+        trial(setup)
+    winner = best(results)
+    if winner is None:
+        print("❌ No setup ran within the limits; keeping the defaults")
+        return None
+
+    if not quick:
+        # Inter-op threads only matter for models with parallel branches; check the winner
+        refined = trial(dict({k: winner[k] for k in TUNED_SETTINGS if k in winner}, torch_interop_threads=2))
+        if refined and refined['within_memory'] and refined['summaries_per_second'] > winner['summaries_per_second'] * 1.05:
+            winner = refined
+
+    # Several processes splitting the cores (distributed.py workers)
+    distributed = None
+    if not quick and winner['summarizer_device'] == 'cpu' and cpus >= 2:
+        process_results = []
+        for processes in (2, 4):
+            if processes > cpus:
+                break
+            setup = {k: winner[k] for k in TUNED_SETTINGS if k in winner}
+            setup.update(torch_threads=max(1, cpus // processes), processes=processes)
+            entry = trial(setup, processes)
+            if entry:
+                process_results.append(entry)
+        best_processes = best(process_results)
+        if best_processes and best_processes['summaries_per_second'] > winner['summaries_per_second'] * 1.1:
+            distributed = {'workers': best_processes['processes'], 'torch_threads': best_processes['torch_threads'],
+                           'summaries_per_second': best_processes['summaries_per_second']}
+
+    import torch
+    import transformers
+    profile = {
+        'fingerprint': fingerprint(),
+        'tuned_at': datetime.now().isoformat(),
+        'versions': {'torch': torch.__version__, 'transformers': transformers.__version__},
+        'max_memory_mb': max_memory_mb,
+        'settings': {k: winner[k] for k in TUNED_SETTINGS if winner.get(k) is not None},
+        'summaries_per_second': winner['summaries_per_second'],
+        'peak_rss_mb': winner['peak_rss_mb'],
+        'distributed': distributed,
+        'results': results
+    }
+    os.makedirs(profile_dir, exist_ok=True)
+    path = host_profile_path(profile_dir)
+    atomic_write_json(path, profile)
+
+    baseline = next((e for e in results if e['torch_threads'] == thread_counts(cpus)[-1]
+                     and e['summarize_batch_size'] == 1 and e['summarizer_device'] == 'cpu'), None)
+    print(f"\n🏆 Best: {describe(winner)} — {winner['summaries_per_second']:.2f} summaries/s, "
+          f"peak {winner['peak_rss_mb']} MB"
+          + (f" (×{winner['summaries_per_second'] / baseline['summaries_per_second']:.2f} vs unbatched)"
+             if baseline else ""))
+    if distributed:
+        print(f"👥 distributed.py: {distributed['workers']} worker processes with {distributed['torch_threads']} "
+              f"threads each ({distributed['summaries_per_second']:.2f} summaries/s)")
+    print(f"💾 Host profile saved to {path}; later runs on this host use it")
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarizer auto-tuning for this host")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("show", help="print this host's tuned profile")
+    p.add_argument("--dir", default=HOST_PROFILE_DIR, help="host profile directory")
+    p = sub.add_parser("measure", help=argparse.SUPPRESS)
+    p.add_argument("--config", default="config.json")
+    p.add_argument("--setup", required=True)
+    p.add_argument("--abstracts", type=int, default=len(CALIBRATION_ABSTRACTS))
+    p.add_argument("--hold", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "measure":
+        measure(args.config, json.loads(args.setup), args.abstracts, args.hold)
+    else:
+        profile = load_host_profile(args.dir)
+        if profile is None:
+            print(f"No usable host profile in {host_profile_path(args.dir)}; run `python main.py tune`")
+        else:
+            print(f"🖥️ {profile['path']} (tuned {profile['tuned_at'][:16]}): {describe(profile['settings'])}, "
+                  f"{profile['summaries_per_second']:.2f} summaries/s, peak {profile['peak_rss_mb']} MB")
+            if profile.get('distributed'):
+                print(f"👥 distributed.py: {profile['distributed']['workers']} workers × "
+                      f"{profile['distributed']['torch_threads']} threads")
@@ -0,0 +1,216 @@
+"""Durable SQLite job queue shared by the distributed coordinator and its workers.
+
+Jobs are identified by (kind, key), so putting the same job twice is a no-op and a
+finished job doubles as a cached result. A worker claims a job with a lease; if it
+dies, the job becomes claimable again once the lease runs out, up to MAX_ATTEMPTS.
+Workers also register which job kinds they can run, so the coordinator can tell when
+nobody will ever take a kind of job.
+"""
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+JOB_QUEUE_FILE = "job_queue.db"
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (kind, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, kind, id);
+
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    kinds TEXT,              -- JSON list; NULL while the worker is still starting up
+    started_at REAL NOT NULL,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """SQLite-backed queue; safe to use from several threads and processes at once."""
+
+    def __init__(self, path=JOB_QUEUE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self.conn.executescript(SCHEMA)
+
+    @property
+    def conn(self):
+        # sqlite3 connections must not cross threads, so every thread gets its own
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front (no lost claims)."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ----------------------
+    # Producer side
+    # ----------------------
+
+    def put(self, kind, key, payload):
+        """Queue a job unless one with the same kind and key exists; returns its id."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (kind, key, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), now, now)
+            )
+            return conn.execute("SELECT id FROM jobs WHERE kind = ? AND key = ?", (kind, key)).fetchone()['id']
+
+    def get(self, job_id):
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def wait(self, job_id, timeout=None, poll_interval=0.2):
+        """Block until the job is done or failed, then return it."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job['status'] in ('done', 'failed'):
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"{job['kind']} job {job_id} still {job['status']} after {timeout}s")
+            time.sleep(poll_interval)
+
+    def retry_failed(self):
+        """Give failed jobs a fresh set of attempts (e.g. after fixing a worker)."""
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, error = NULL WHERE status = 'failed'")
+
+    def prune(self, older_than_days=7):
+        """Forget finished jobs older than the given age."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (cutoff,))
+
+    def cancel(self, job_id, error):
+        """Fail a job nobody has claimed yet (e.g. no worker can run its kind)."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                (str(error), time.time(), job_id)
+            )
+
+    def workers(self):
+        """Registered workers: {name, kinds (None while starting), started_at, seen_at}."""
+        rows = self.conn.execute("SELECT * FROM workers ORDER BY name").fetchall()
+        return [dict(row, kinds=json.loads(row['kinds']) if row['kinds'] is not None else None) for row in rows]
+
+    def counts(self):
+        rows = self.conn.execute("SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status").fetchall()
+        counts = {}
+        for row in rows:
+            counts.setdefault(row['kind'], {})[row['status']] = row['n']
+        return counts
+
+    # ----------------------
+    # Worker side
+    # ----------------------
+
+    def register_worker(self, worker, kinds=None):
+        """Announce a worker and the job kinds it can run (None: still starting up)."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (name, kinds, started_at, seen_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET kinds = excluded.kinds, seen_at = excluded.seen_at",
+                (worker, json.dumps(kinds) if kinds is not None else None, now, now)
+            )
+
+    def heartbeat(self, worker):
+        with self._transaction() as conn:
+            conn.execute("UPDATE workers SET seen_at = ? WHERE name = ?", (time.time(), worker))
+
+    def unregister_worker(self, worker):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+    def claim(self, worker, kinds, lease_seconds=LEASE_SECONDS):
+        """Take the oldest runnable job of the given kinds, or None if there is nothing to do."""
+        now = time.time()
+        placeholders = ",".join("?" * len(kinds))
+        with self._transaction() as conn:
+            # A job whose last allowed attempt died with its worker will not come back
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lease expired', updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, MAX_ATTEMPTS)
+            )
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE kind IN ({placeholders}) AND attempts < ? "
+                f"AND (status = 'pending' OR (status = 'running' AND lease_until < ?)) "
+                f"ORDER BY id LIMIT 1",
+                (*kinds, MAX_ATTEMPTS, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "lease_until = ?, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, row['id'])
+            )
+        job = self._job(row)
+        job['attempts'] += 1
+        return job
+
+    def complete(self, job_id, result):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (json.dumps(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id, error):
+        """Record a failed attempt; the job is retried until it runs out of attempts."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (MAX_ATTEMPTS, str(error), time.time(), job_id)
+            )
+
+    @staticmethod
+    def _job(row):
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
@@ -1,39 +1,57 @@
 import os
+import gc
 import time
 import json
+import ctypes
+import threading
+import importlib.util
 import xml.etree.ElementTree as ET
+import argparse
 import requests
-from transformers import pipeline
 from datetime import datetime, timedelta
 from generate_tiktok_feed import save_tiktok_feed
+from paper_store import PaperStore, store_exists
+from checkpoint import RunCheckpoint
+from fallback_planner import FallbackPlanner
+from paper_identity import NearDuplicateIndex, normalize_arxiv_id
+from reranker import Reranker
+from pipeline import Pipeline, PipelineAborted, RateLimiter, MicroBatcher, DONE
+from telemetry import telemetry, current_rss_mb, MemoryWatchdog
+from model_cache import MODEL_NAME, load_summarizer
+from host_tuning import HOST_PROFILE_DIR, load_host_profile, describe
+from trickle import TricklePool, precomputed_summary, FALLBACK_REFRESH
+from atomic_io import atomic_write_json
+from digest_template import render_digest, DIGEST_CSS
+from static_assets import publish_stylesheet, open_artifact, link_artifact
+from generate_index import record_digest
+from search_index import update_search_index
+from exports import append_jsonl, update_atom_feed, export_columnar
 
 # ======================
 # CONFIGURATION
 # ======================
 
-def load_config():
-    """Load configuration from config.json file."""
-    config_file = "config.json"
-
-    # Default configuration (fallback)
-    default_config = {
-        "interests": {
-            "Efficient ML / Edge AI": {
-                "query": 'cat:cs.LG OR cat:cs.CV OR cat:cs.CL',
-                "keywords": ['efficient', 'edge', 'compression', 'quantization', 'pruning', 'distillation', 'inference', 'lightweight', 'mobile', 'accelerat']
-            }
-        },
-        "settings": {
-            "papers_per_interest": 10,
-            "summary_max_length": 160,
-            "recent_days": 7,
-            "fallback_days": 90,
-            "min_papers_threshold": 5,
-            "fetch_multiplier": 5,
-            "user_agent": "ResearchDigestBot/1.0 (github.com/usr-wwelsh)"
+# Default configuration (used when no config.json is given)
+DEFAULT_CONFIG = {
+    "interests": {
+        "Efficient ML / Edge AI": {
+            "query": 'cat:cs.LG OR cat:cs.CV OR cat:cs.CL',
+            "keywords": ['efficient', 'edge', 'compression', 'quantization', 'pruning', 'distillation', 'inference', 'lightweight', 'mobile', 'accelerat']
         }
+    },
+    "settings": {
+        "papers_per_interest": 10,
+        "summary_max_length": 160,
+        "recent_days": 7,
+        "fallback_days": 90,
+        "min_papers_threshold": 5,
+        "fetch_multiplier": 5,
+        "user_agent": "ResearchDigestBot/1.0 (github.com/usr-wwelsh)"
     }
+}
 
+def load_config(config_file="config.json"):
+    """Load configuration from config.json file."""
     if os.path.exists(config_file):
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
@@ -42,39 +60,219 @@ def load_config():
                 return config
         except Exception as e:
             print(f"⚠️ Error loading config file: {e}. Using defaults.")
-            return default_config
+            return DEFAULT_CONFIG
     else:
         print(f"⚠️ {config_file} not found. Using default configuration.")
-        return default_config
-
-# Load configuration
-config = load_config()
-INTERESTS = config.get('interests', {})
-settings = config.get('settings', {})
-
-PAPERS_PER_INTEREST = settings.get('papers_per_interest', 10)
-SUMMARY_MAX_LENGTH = settings.get('summary_max_length', 160)
-USER_AGENT = settings.get('user_agent', 'ResearchDigestBot/1.0')
-
-# Date filtering: Only fetch papers from the last N days (set to 0 to disable)
-RECENT_DAYS = settings.get('recent_days', 7)
-FALLBACK_DAYS = settings.get('fallback_days', 90)
-MIN_PAPERS_THRESHOLD = settings.get('min_papers_threshold', 5)
-FETCH_MULTIPLIER = settings.get('fetch_multiplier', 5)
-
-# Deduplication: Track papers we've already shown
-SEEN_PAPERS_FILE = "seen_papers.json"
-
-# Initialize summarizer (optional)
-try:
-    summarizer = pipeline(
-        "summarization",
-        model="sshleifer/distilbart-cnn-12-6",
-        device=-1
-    )
-except Exception as e:
-    print(f"⚠️ Summarizer unavailable ({e}). Using raw abstracts.")
-    summarizer = None
+        return DEFAULT_CONFIG
+
+def apply_config(config, host_profile=True):
+    """Set the module-level settings below from a config dict (same layout as config.json).
+
+    host_profile=False skips this host's tuned profile (no file is read).
+    """
+    global INTERESTS, settings, PAPERS_PER_INTEREST, SUMMARY_MAX_LENGTH, USER_AGENT
+    global RECENT_DAYS, FALLBACK_DAYS, MIN_PAPERS_THRESHOLD, FETCH_MULTIPLIER
+    global SEEN_PAPERS_FILE, PAPER_STORE_FILE, CHECKPOINT_DIR
+    global REQUEST_INTERVAL, QUEUE_SIZE, FETCH_WORKERS, PARSE_WORKERS, SUMMARIZE_WORKERS
+    global FALLBACK_STATS_FILE, SPECULATIVE_FALLBACK, RUN_REPORT_FILE, PROFILE_DIR
+    global ARXIV_SOURCE, SNAPSHOT_DB, NEAR_DUPLICATE_THRESHOLD
+    global JSONL_FILE, ATOM_FEED_FILE, ATOM_FEED_ENTRIES, COLUMNAR_EXPORT
+    global RERANKER_FILE, PERSONALIZATION_WEIGHT
+    global LOW_MEMORY, MAX_RSS_MB, TORCH_THREADS, SUMMARIZER_DTYPE, MODEL_CACHE, MODEL_CACHE_DIR
+    global HOST_PROFILE, SUMMARIZER_DEVICE, TORCH_INTEROP_THREADS, SUMMARIZE_BATCH_SIZE
+    global TRICKLE_INTERVAL_MINUTES, TRICKLE_MAX_AGE_HOURS
+
+    INTERESTS = config.get('interests', {})
+    settings = config.get('settings', {})
+
+    # Summarizer setup measured on this machine by `python main.py tune`; config.json still wins
+    HOST_PROFILE = None
+    if host_profile and settings.get('host_profile', True):
+        HOST_PROFILE = load_host_profile(settings.get('host_profile_dir', HOST_PROFILE_DIR))
+        if HOST_PROFILE:
+            settings = {**HOST_PROFILE['settings'], **settings}
+
+    PAPERS_PER_INTEREST = settings.get('papers_per_interest', 10)
+    SUMMARY_MAX_LENGTH = settings.get('summary_max_length', 160)
+    USER_AGENT = settings.get('user_agent', 'ResearchDigestBot/1.0')
+
+    # Date filtering: Only fetch papers from the last N days (set to 0 to disable)
+    RECENT_DAYS = settings.get('recent_days', 7)
+    FALLBACK_DAYS = settings.get('fallback_days', 90)
+    MIN_PAPERS_THRESHOLD = settings.get('min_papers_threshold', 5)
+    FETCH_MULTIPLIER = settings.get('fetch_multiplier', 5)
+
+    # Deduplication: Track papers we've already shown
+    SEEN_PAPERS_FILE = settings.get('seen_papers_file', 'seen_papers.json')
+
+    # Paper store: every processed paper per run, used by `python main.py render`
+    PAPER_STORE_FILE = settings.get('paper_store_file', 'paper_store.db')
+
+    # Checkpoints of an in-progress run, used by `python main.py --resume`
+    CHECKPOINT_DIR = settings.get('checkpoint_dir', 'checkpoints')
+
+    # Low-memory profile for small always-on hosts: the model is only loaded for the summarize
+    # stage (after selection, in bfloat16, on few threads) and unloaded again before rendering.
+    # max_rss_mb is a resident-memory target that the run watches, enforces and reports.
+    LOW_MEMORY = settings.get('low_memory', False)
+    MAX_RSS_MB = settings.get('max_rss_mb')
+    TORCH_THREADS = settings.get('torch_threads', 2 if LOW_MEMORY else None)
+    SUMMARIZER_DTYPE = settings.get('summarizer_dtype', 'bfloat16' if LOW_MEMORY else None)
+
+    # Summarizer backend ("cpu", "cuda" or "mps"), inter-op threads and summaries per model call
+    SUMMARIZER_DEVICE = settings.get('summarizer_device', 'cpu')
+    TORCH_INTEROP_THREADS = settings.get('torch_interop_threads')
+    SUMMARIZE_BATCH_SIZE = settings.get('summarize_batch_size', 1)
+
+    # Summarizer weights converted once to safetensors and memory-mapped on every later start
+    MODEL_CACHE = settings.get('model_cache', True)
+    MODEL_CACHE_DIR = settings.get('model_cache_dir', 'model_cache')
+
+    # Staged pipeline: minimum seconds between arXiv requests, queue bound and workers per stage
+    REQUEST_INTERVAL = settings.get('request_interval', 5)
+    QUEUE_SIZE = settings.get('queue_size', 2 if LOW_MEMORY else 8)
+    FETCH_WORKERS = settings.get('fetch_workers', 1)
+    PARSE_WORKERS = settings.get('parse_workers', 1)
+    SUMMARIZE_WORKERS = settings.get('summarize_workers', SUMMARIZE_BATCH_SIZE)  # batches need concurrent callers
+
+    # Learned per-interest yield, used to fetch likely-needed fallback queries up front
+    FALLBACK_STATS_FILE = settings.get('fallback_stats_file', 'fallback_stats.json')
+    SPECULATIVE_FALLBACK = settings.get('speculative_fallback', True)
+
+    # JSON report of stage timings and counters, written next to latest.html after each run
+    RUN_REPORT_FILE = settings.get('run_report_file', 'run_report.json')
+    PROFILE_DIR = settings.get('profile_dir', 'profiles')
+
+    # Where papers come from: "api" (export.arxiv.org) or "snapshot" (local store, see arxiv_snapshot.py)
+    ARXIV_SOURCE = settings.get('arxiv_source', 'api')
+    SNAPSHOT_DB = settings.get('snapshot_db', 'arxiv_snapshot.db')
+
+    # Title + abstract similarity above which two IDs count as one paper (0 disables)
+    NEAR_DUPLICATE_THRESHOLD = settings.get('near_duplicate_threshold', 0.8)
+
+    # Machine-readable outputs (see exports.py); columnar_export is a .parquet/.arrow path or null
+    JSONL_FILE = settings.get('jsonl_file', 'papers.jsonl')
+    ATOM_FEED_FILE = settings.get('atom_feed_file', 'feed.xml')
+    ATOM_FEED_ENTRIES = settings.get('atom_feed_entries', 200)
+    COLUMNAR_EXPORT = settings.get('columnar_export')
+
+    # Personal re-ranker learned from exported likes (reranker.py); its score is added to relevance
+    RERANKER_FILE = settings.get('reranker_file', 'reranker_weights.json')
+    PERSONALIZATION_WEIGHT = settings.get('personalization_weight', 3)
+
+    # Trickle mode (python main.py trickle): poll interval, and how recent a poll must be
+    # for a digest run to take its candidates and summaries from the trickle pool
+    TRICKLE_INTERVAL_MINUTES = settings.get('trickle_interval_minutes', 60)
+    TRICKLE_MAX_AGE_HOURS = settings.get('trickle_max_age_hours', 12)
+
+# Date the digest is made for; None means now (set by run_digest(as_of=...) for backfills)
+AS_OF = None
+
+# Defaults until a config is applied: importing this module reads no files and loads no model
+apply_config(DEFAULT_CONFIG, host_profile=False)
+
+# Summarizer is loaded on first use so commands like `render` start instantly
+summarizer = None
+_summarizer_loaded = False
+_summarizer_lock = threading.Lock()  # summarize workers may ask for it at the same time
+
+# Set when the run went over max_rss_mb: the remaining papers get trimmed abstracts
+memory_pressure = False
+
+def get_summarizer():
+    """Load the summarization pipeline once (optional; None if unavailable)."""
+    global summarizer, _summarizer_loaded
+    with _summarizer_lock:
+        if not _summarizer_loaded:
+            _summarizer_loaded = True
+            try:
+                with telemetry.timer('model_load'):
+                    from transformers import pipeline
+                    import torch
+                    if TORCH_THREADS:
+                        torch.set_num_threads(TORCH_THREADS)
+                    if TORCH_INTEROP_THREADS:
+                        try:
+                            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+                        except RuntimeError:
+                            pass  # can only be set once per process, before any parallel work
+                    device = -1 if SUMMARIZER_DEVICE == 'cpu' else SUMMARIZER_DEVICE
+                    summarizer = None
+                    if MODEL_CACHE:
+                        try:
+                            summarizer = load_summarizer(MODEL_NAME, MODEL_CACHE_DIR, SUMMARIZER_DTYPE, device)
+                        except Exception as e:
+                            print(f"⚠️ Model cache unusable ({e}). Loading the model directly.")
+                    if summarizer is None:
+                        model_kwargs = {}
+                        if importlib.util.find_spec("accelerate") is not None:
+                            model_kwargs['low_cpu_mem_usage'] = True  # no second copy of the weights while loading
+                        summarizer = pipeline(
+                            "summarization",
+                            model=MODEL_NAME,
+                            device=device,
+                            torch_dtype=getattr(torch, SUMMARIZER_DTYPE) if SUMMARIZER_DTYPE else None,
+                            model_kwargs=model_kwargs
+                        )
+                    if SUMMARIZE_BATCH_SIZE > 1:
+                        summarizer = BatchedSummarizer(summarizer, SUMMARIZE_BATCH_SIZE)
+            except Exception as e:
+                print(f"⚠️ Summarizer unavailable ({e}). Using raw abstracts.")
+                summarizer = None
+        return summarizer
+
+class BatchedSummarizer:
+    """Summarization pipeline whose concurrent calls are run as batches of up to batch_size."""
+
+    def __init__(self, model, batch_size):
+        self.model = model
+        self.batch_size = batch_size
+        self._batchers = {}  # call options -> MicroBatcher
+        self._lock = threading.Lock()
+
+    def __call__(self, text, **kwargs):
+        key = json.dumps(kwargs, sort_keys=True)
+        with self._lock:
+            if key not in self._batchers:
+                def summarize_batch(texts):
+                    telemetry.count('summary_batches')
+                    return self.model(texts, batch_size=len(texts), **kwargs)
+                self._batchers[key] = MicroBatcher(summarize_batch, self.batch_size)
+            batcher = self._batchers[key]
+        return [batcher(text)]
+
+def release_memory():
+    """Collect garbage and hand freed heap pages back to the OS (glibc keeps them otherwise)."""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # not glibc
+
+def unload_summarizer():
+    """Drop the loaded model so its memory is freed; the next summary loads it again."""
+    global summarizer, _summarizer_loaded
+    with _summarizer_lock:
+        loaded = summarizer is not None
+        summarizer = None
+        _summarizer_loaded = False
+    if loaded:
+        release_memory()
+        print(f"🧹 Summarizer unloaded (RSS now {current_rss_mb()} MB)")
+
+def on_memory_pressure(rss_mb):
+    """Called by the watchdog when RSS goes over max_rss_mb: free what we can, then stop using the model."""
+    global memory_pressure
+    telemetry.count('rss_target_exceeded')
+    release_memory()
+    rss_after = current_rss_mb()
+    if rss_after is not None and rss_after <= MAX_RSS_MB:
+        print(f"⚠️ RSS reached {rss_mb} MB (target {MAX_RSS_MB} MB); freed memory, now {rss_after} MB")
+        return
+    print(f"⚠️ RSS at {rss_mb} MB is over the {MAX_RSS_MB} MB target: "
+          f"unloading the summarizer, remaining papers get trimmed abstracts")
+    memory_pressure = True
+    unload_summarizer()
 
 # ======================
 # DEDUPLICATION HELPERS
@@ -94,11 +292,10 @@ def load_seen_papers():
 def save_seen_papers(seen_ids):
     """Save the set of seen paper IDs."""
     try:
-        with open(SEEN_PAPERS_FILE, 'w') as f:
-            json.dump({
-                'seen_ids': list(seen_ids),
-                'last_updated': datetime.now().isoformat()
-            }, f, indent=2)
+        atomic_write_json(SEEN_PAPERS_FILE, {
+            'seen_ids': list(seen_ids),
+            'last_updated': datetime.now().isoformat()
+        })
     except Exception as e:
         print(f"⚠️ Error saving seen papers: {e}")
 
@@ -110,7 +307,7 @@ def get_date_filter(days=None):
     if days <= 0:
         return ""
 
-    end_date = datetime.now()
+    end_date = AS_OF or datetime.now()
     start_date = end_date - timedelta(days=days)
 
     # arXiv date format: YYYYMMDD0000 to YYYYMMDD2359
@@ -121,14 +318,24 @@ def get_date_filter(days=None):
 # ARXIV FETCH & PARSE
 # ======================
 
-def fetch_arxiv_papers(query, max_results=5, days_back=None):
-    url = "http://export.arxiv.org/api/query"
+def window_start(days):
+    """First day (YYYY-MM-DD) of a last-N-days window like get_date_filter's; None for no window."""
+    if days <= 0:
+        return None
+    return ((AS_OF or datetime.now()) - timedelta(days=days)).strftime('%Y-%m-%d')
 
+def build_query(query, days_back=None):
+    """Interest query plus the submittedDate window, as sent to arXiv."""
     # Add date filter if configured
     date_filter = get_date_filter(days_back)
     if date_filter:
         # Combine user query with date filter using AND
         query = f"({query}) AND {date_filter}"
+    return query
+
+def fetch_arxiv_papers(query, max_results=5, days_back=None):
+    url = "http://export.arxiv.org/api/query"
+    query = build_query(query, days_back)
 
     params = {
         "search_query": query,
@@ -139,25 +346,43 @@ def fetch_arxiv_papers(query, max_results=5, days_back=None):
     }
     headers = {"User-Agent": USER_AGENT}
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=20)
-        response.raise_for_status()
-        return response.text
+        with telemetry.timer('fetch'):
+            telemetry.count('requests')
+            response = requests.get(url, params=params, headers=headers, timeout=20)
+            response.raise_for_status()
+            telemetry.count('bytes_fetched', len(response.content))
+            return response.text
     except Exception as e:
+        telemetry.count('request_errors')
         print(f"❌ Error fetching query '{query}': {e}")
         return None
 
+ATOM_ENTRY = '{http://www.w3.org/2005/Atom}entry'
+PARSE_CHUNK_SIZE = 1 << 16
+
+def iter_entries(xml_data):
+    """Yield each Atom <entry> as soon as it is parsed, then free it (no tree of the whole feed)."""
+    parser = ET.XMLPullParser(('end',))
+    for start in range(0, len(xml_data), PARSE_CHUNK_SIZE):
+        parser.feed(xml_data[start:start + PARSE_CHUNK_SIZE])
+        for _, elem in parser.read_events():
+            if elem.tag == ATOM_ENTRY:
+                yield elem
+                elem.clear()
+    parser.close()
+
 def parse_papers(xml_data):
     if not xml_data:
         return []
     try:
-        root = ET.fromstring(xml_data)
+        return list(_parse_entries(xml_data))
     except ET.ParseError:
         return []
 
+def _parse_entries(xml_data):
     namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-    papers = []
 
-    for entry in root.findall('atom:entry', namespace):
+    for entry in iter_entries(xml_data):
         title_elem = entry.find('atom:title', namespace)
         summary_elem = entry.find('atom:summary', namespace)
         id_elem = entry.find('atom:id', namespace)
@@ -171,25 +396,30 @@ def parse_papers(xml_data):
         link = id_elem.text
         published = published_elem.text.split('T')[0] if published_elem is not None else "Unknown"
 
-        # Extract arXiv ID
-        arxiv_id = link.split('/abs/')[-1].split('v')[0]
+        # Extract arXiv ID (without version; old-style IDs like solv-int/9901001 keep their archive)
+        arxiv_id, version = normalize_arxiv_id(link)
 
         # Get primary category
         primary_cat_elem = entry.find('.//{http://arxiv.org/schemas/atom}primary_category')
         category = primary_cat_elem.get('term') if primary_cat_elem is not None else "unknown"
 
-        papers.append({
+        yield {
             'title': title,
             'summary': summary,
             'link': link,
             'pdf_link': f"https://arxiv.org/pdf/{arxiv_id}.pdf",
             'arxiv_id': arxiv_id,
+            'version': version,
             'category': category,
             'published': published
-        })
-    return papers
+        }
 
-def summarize_abstract(abstract):
+def summarize_abstract(abstract, summarizer=None):
+    if memory_pressure:
+        summarizer = None
+        telemetry.count('summaries_skipped_for_memory')
+    else:
+        summarizer = summarizer or get_summarizer()
     if summarizer is None:
         return abstract[:SUMMARY_MAX_LENGTH] + ("..." if len(abstract) > SUMMARY_MAX_LENGTH else "")
     try:
@@ -322,296 +552,261 @@ def generate_layman_context(title, abstract):
 # HTML OUTPUT
 # ======================
 
-def save_html_digest(all_papers_by_interest, filename=None):
+def save_html_digest(all_papers_by_interest, filename=None, digest_date=None, latest_file="latest.html"):
     # Create archive directory if it doesn't exist
     archive_dir = "arxiv_archive"
     if not os.path.exists(archive_dir):
         os.makedirs(archive_dir)
 
-    if filename is None:
-        date_str = datetime.now().strftime('%Y%m%d')
+    if digest_date is None:
+        digest_date = datetime.now()
+
+    archived = filename is None
+    if archived:
+        date_str = digest_date.strftime('%Y%m%d')
         filename = os.path.join(archive_dir, f"arxiv_digest_{date_str}.html")
 
-    # Also save as latest.html for easy syncing
-    latest_file = "latest.html"
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1.0"/>
-  <title>arXiv Digest • {datetime.now().strftime('%Y-%m-%d')}</title>
-  <style>
-    * {{ box-sizing: border-box; }}
-
-    :root {{
-      --bg: #0f0f0f;
-      --text: #e8e8e8;
-      --muted: #999;
-      --border: #2a2a2a;
-      --card-bg: #1a1a1a;
-      --link: #6ba3ff;
-      --accent: #ff6b6b;
-      --green: #51cf66;
-      --yellow: #ffd43b;
-      --red: #ff6b6b;
-      --layman-bg: #1f2937;
-      --layman-border: #60a5fa;
-    }}
-
-    body {{
-      font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-      line-height: 1.5;
-      color: var(--text);
-      background: var(--bg);
-      margin: 0;
-      padding: 1rem;
-    }}
-
-    .container {{
-      max-width: 1600px;
-      margin: 0 auto;
-    }}
-
-    header {{
-      text-align: center;
-      padding: 2rem 1rem 3rem;
-      border-bottom: 2px solid var(--border);
-      margin-bottom: 2rem;
-    }}
-
-    h1 {{
-      font-weight: 900;
-      font-size: 2.5rem;
-      margin: 0;
-      background: linear-gradient(135deg, var(--accent), #ffa94d);
-      -webkit-background-clip: text;
-      -webkit-text-fill-color: transparent;
-      background-clip: text;
-    }}
-
-    .meta {{
-      color: var(--muted);
-      font-size: 0.95rem;
-      margin-top: 0.5rem;
-      letter-spacing: 0.5px;
-    }}
-
-    .interest-section {{
-      margin-bottom: 3rem;
-    }}
-
-    .interest-header {{
-      display: flex;
-      align-items: center;
-      gap: 0.8rem;
-      margin-bottom: 1.2rem;
-      padding: 0.8rem 1rem;
-      background: var(--card-bg);
-      border-radius: 12px;
-      border-left: 4px solid var(--accent);
-    }}
-
-    .interest-title {{
-      font-size: 1.3rem;
-      margin: 0;
-      font-weight: 700;
-      color: var(--text);
-    }}
-
-    .papers-grid {{
-      display: grid;
-      grid-template-columns: repeat(auto-fill, minmax(380px, 1fr));
-      gap: 1.2rem;
-    }}
-
-    .paper {{
-      background: var(--card-bg);
-      border: 1px solid var(--border);
-      border-radius: 12px;
-      padding: 1.2rem;
-      transition: all 0.2s ease;
-      position: relative;
-      display: flex;
-      flex-direction: column;
-      height: 100%;
-    }}
-
-    .paper:hover {{
-      border-color: var(--accent);
-      transform: translateY(-2px);
-      box-shadow: 0 8px 24px rgba(255, 107, 107, 0.15);
-    }}
-
-    .paper-header {{
-      display: flex;
-      justify-content: space-between;
-      align-items: flex-start;
-      gap: 0.8rem;
-      margin-bottom: 0.8rem;
-    }}
-
-    .difficulty-badge {{
-      padding: 0.3rem 0.7rem;
-      border-radius: 20px;
-      font-size: 0.7rem;
-      font-weight: 700;
-      white-space: nowrap;
-      flex-shrink: 0;
-    }}
-
-    .paper h3 {{
-      font-size: 1.05rem;
-      margin: 0 0 0.8rem 0;
-      font-weight: 700;
-      line-height: 1.4;
-      color: var(--text);
-    }}
-
-    .layman-box {{
-      background: var(--layman-bg);
-      border-left: 3px solid var(--layman-border);
-      padding: 0.7rem 0.9rem;
-      margin-bottom: 0.8rem;
-      border-radius: 6px;
-      font-size: 0.88rem;
-      line-height: 1.5;
-      color: #94a3b8;
-      font-style: italic;
-    }}
-
-    .summary {{
-      color: var(--muted);
-      margin-bottom: 1rem;
-      font-size: 0.88rem;
-      line-height: 1.6;
-      flex-grow: 1;
-    }}
-
-    .paper-footer {{
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-      padding-top: 0.8rem;
-      border-top: 1px solid var(--border);
-      margin-top: auto;
-    }}
-
-    .category-tag {{
-      background: #1e3a5f;
-      color: #60a5fa;
-      padding: 0.25rem 0.65rem;
-      border-radius: 15px;
-      font-size: 0.75rem;
-      font-weight: 600;
-    }}
-
-    .date {{
-      color: var(--muted);
-      font-size: 0.75rem;
-    }}
-
-    .links {{
-      display: flex;
-      gap: 1rem;
-      margin-top: 0.8rem;
-    }}
-
-    .links a {{
-      color: var(--link);
-      text-decoration: none;
-      font-size: 0.85rem;
-      font-weight: 600;
-      transition: color 0.2s;
-    }}
-
-    .links a:hover {{
-      color: var(--accent);
-    }}
-
-    .footer {{
-      text-align: center;
-      margin-top: 4rem;
-      padding: 2rem;
-      color: var(--muted);
-      font-size: 0.85rem;
-      border-top: 1px solid var(--border);
-    }}
-
-    @media (max-width: 768px) {{
-      .papers-grid {{
-        grid-template-columns: 1fr;
-      }}
-      h1 {{
-        font-size: 2rem;
-      }}
-    }}
-  </style>
-</head>
-<body>
-  <div class="container">
-    <header>
-      <h1>arXiv Research Digest</h1>
-      <div class="meta">{datetime.now().strftime('%B %d, %Y')} • {sum(len(p) for p in all_papers_by_interest.values())} papers across {len(all_papers_by_interest)} interests</div>
-    </header>
-"""
-
-    for interest_name, papers in all_papers_by_interest.items():
-        html += f"""<section class="interest-section">
-  <div class="interest-header">
-    <span>🔬</span>
-    <h2 class="interest-title">{interest_name}</h2>
-  </div>
-"""
-        if not papers:
-            html += '  <p>No recent papers found.</p>\n'
-        else:
-            html += '  <div class="papers-grid">\n'
-            for paper in papers:
-                html += f"""    <article class="paper">
-      <div class="paper-header">
-        <span class="difficulty-badge">{paper['difficulty']}</span>
-      </div>
-      <h3>{paper['title']}</h3>
-      <div class="layman-box">💡 {paper['layman']}</div>
-      <div class="summary">{paper['summary']}</div>
-      <div class="paper-footer">
-        <span class="category-tag">{paper['category']}</span>
-        <span class="date">{paper['published']}</span>
-      </div>
-      <div class="links">
-        <a href="{paper['link']}" target="_blank">Abstract ↗</a>
-        <a href="{paper['pdf_link']}" target="_blank">PDF ↗</a>
-      </div>
-    </article>
-"""
-            html += '  </div>\n'
-        html += "</section>\n"
-
-    html += """    <div class="footer">
-      ✨ Generated automatically • Powered by arXiv API
-    </div>
-  </div>
-</body>
-</html>
-"""
-    # Save archived version
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html)
+    # The stylesheet lives next to both the archive page and latest.html so the same
+    # relative link works from either location
+    page_dirs = [os.path.dirname(filename) or '.']
+    if latest_file:
+        page_dirs.append(os.path.dirname(latest_file) or '.')
+    stylesheet = publish_stylesheet('digest', DIGEST_CSS, page_dirs)
+
+    # Stream the archived version straight to disk (untouched if nothing changed)
+    with open_artifact(filename) as f:
+        render_digest(f.write, all_papers_by_interest, digest_date, stylesheet)
     print(f"✨ HTML digest saved to {filename}")
 
-    # Also save as latest.html for quick access
-    with open(latest_file, 'w', encoding='utf-8') as f:
-        f.write(html)
-    print(f"📄 Latest digest saved to {latest_file}")
+    # latest.html is the same file: hardlink it instead of writing it twice (None skips it)
+    if latest_file:
+        link_artifact(filename, latest_file)
+        print(f"📄 Latest digest saved to {latest_file}")
+
+    # Keep the archive manifest and the affected index pages current
+    if archived:
+        record_digest(
+            digest_date,
+            sum(len(p) for p in all_papers_by_interest.values()),
+            all_papers_by_interest.keys(),
+            filename
+        )
+        update_search_index(all_papers_by_interest, digest_date)
+    return filename
+
+def save_exports(all_papers_by_interest, run_id, started_at, digest_date):
+    """Append the digest to the JSON Lines log, update the Atom feed and, if set, the columnar export."""
+    outputs = {
+        'jsonl': append_jsonl(all_papers_by_interest, run_id, started_at, digest_date, JSONL_FILE),
+        'atom': update_atom_feed(all_papers_by_interest, digest_date, ATOM_FEED_FILE, ATOM_FEED_ENTRIES)
+    }
+    if COLUMNAR_EXPORT:
+        outputs['columnar'] = export_columnar(PAPER_STORE_FILE, COLUMNAR_EXPORT)
+    return outputs
+
+# ======================
+# RENDER FROM STORE
+# ======================
+
+def render_from_store(store_path=None):
+    """Rebuild archive pages, latest.html and tiktok_feed.html from the paper store."""
+    store_path = store_path or PAPER_STORE_FILE
+    if not store_exists(store_path):
+        print(f"⚠️ No paper store found at {store_path}. Run the digest first.")
+        return
+
+    with PaperStore(store_path) as store:
+        runs = store.list_runs()
+        if not runs:
+            print("⚠️ Paper store has no completed runs yet.")
+            return
+
+        # One archive page per day: the last run of that day wins
+        runs_by_date = {}
+        for run in runs:
+            runs_by_date[run['run_date']] = run
+
+        latest_run = runs[-1]
+        for run_date, run in sorted(runs_by_date.items()):
+            papers = store.load_digest(run['run_id'])
+            is_latest = run['run_id'] == latest_run['run_id']
+            save_html_digest(
+                papers,
+                digest_date=datetime.strptime(run_date, '%Y%m%d'),
+                latest_file="latest.html" if is_latest else None
+            )
+
+        save_tiktok_feed(store.load_digest(latest_run['run_id']))
+
+    print(f"\n✅ Re-rendered {len(runs_by_date)} digests from {store_path}")
+
+def render_from_api(base_url):
+    """Render latest.html, its archive page and tiktok_feed.html from a digest_server.py API."""
+    from digest_server import fetch_digest
+    papers, run = fetch_digest(base_url)
+    save_html_digest(papers, digest_date=datetime.strptime(run['run_date'], '%Y%m%d'))
+    save_tiktok_feed(papers)
+    print(f"\n✅ Rendered digest {run['run_date']} from {base_url}")
 
 # ======================
 # MAIN EXECUTION
 # ======================
 
-if __name__ == "__main__":
-    # Load previously seen papers
-    seen_papers = load_seen_papers()
+def score_paper(p, keywords, analyses=None, reranker=None):
+    """Score and classify one fresh paper in place (cheap; runs before selection).
+
+    `analyses` caches the interest-independent part per paper, so a paper cross-listed
+    under several interests is only classified once per run. A trained `reranker`
+    adds a learned personal_score that selection ranks by alongside relevance.
+    """
+    # Store original abstract for analysis
+    original_abstract = p['summary']
+    p['abstract'] = original_abstract
+
+    # Calculate relevance score FIRST (before summarization)
+    calculate_relevance_score(p, keywords)
+    if reranker is not None:
+        p['personal_score'] = round(PERSONALIZATION_WEIGHT * reranker.score(p), 3)
+
+    analysis = analyses.get(p['arxiv_id']) if analyses is not None else None
+    if analysis is None:
+        analysis = {
+            # Estimate difficulty level (use ORIGINAL abstract before summarization)
+            'difficulty': estimate_difficulty(original_abstract, p['category']),
+            # Generate layman context (use ORIGINAL abstract for better keyword extraction)
+            'layman': generate_layman_context(p['title'], original_abstract)
+        }
+        if analyses is not None:
+            analyses[p['arxiv_id']] = analysis
+    else:
+        telemetry.count('cross_listed')
+    p.update(analysis)
+    return p
+
+def summarize_paper(p, checkpoint=None, summarizer=None, precomputed=None):
+    """Summarize one selected paper in place, reusing a checkpointed or trickle-pool summary if there is one."""
+    cached_summary = checkpoint.summary(p['arxiv_id']) if checkpoint else None
+    pooled_summary = precomputed_summary(precomputed, p) if cached_summary is None else None
+    if cached_summary is not None:
+        p['summary'] = cached_summary
+        telemetry.count('summary_cache_hits')
+    elif pooled_summary is not None:
+        p['summary'] = pooled_summary
+        telemetry.count('trickle_summaries')
+    else:
+        with telemetry.timer('summarize'):
+            p['summary'] = summarize_abstract(p['abstract'], summarizer)
+        telemetry.count('summaries')
+        if checkpoint:
+            checkpoint.save_summary(p['arxiv_id'], p['summary'])
+    return p
+
+def select_fresh(papers, keywords, seen_papers, duplicates=None, analyses=None, reranker=None):
+    """Drop already-seen papers, score the rest and sort them by relevance (highest first).
+
+    With a NearDuplicateIndex, a paper also counts as seen when a near-identical one
+    (e.g. a re-submission under a new ID) already is, and only one of a group of
+    near-identical candidates is kept.
+    """
+    with telemetry.timer('score'):
+        fresh = []
+        listed = set()
+        for p in papers:
+            if p['arxiv_id'] in seen_papers or p['arxiv_id'] in listed:
+                continue
+            canonical_id = duplicates.canonical_id(p) if duplicates is not None else p['arxiv_id']
+            if canonical_id in seen_papers or canonical_id in listed:
+                telemetry.count('near_duplicates')
+                continue
+            listed.update((p['arxiv_id'], canonical_id))
+            fresh.append(score_paper(p, keywords, analyses, reranker))
+        fresh.sort(key=lambda x: x['relevance_score'] + x.get('personal_score', 0), reverse=True)
+    return fresh
+
+def default_fetcher():
+    """(fetcher, snapshot store or None) for the configured arxiv_source."""
+    if ARXIV_SOURCE == 'snapshot':
+        from arxiv_snapshot import SnapshotStore
+        snapshot = SnapshotStore(SNAPSHOT_DB)
+
+        def fetcher(query, max_results, days_back):
+            with telemetry.timer('fetch'):
+                return snapshot.feed(build_query(query, days_back), max_results)
+        return fetcher, snapshot
+
+    limiter = RateLimiter(REQUEST_INTERVAL)
+
+    def fetcher(query, max_results, days_back):
+        with telemetry.timer('rate_limit_wait'):
+            limiter.wait()  # Be kind: keep requests REQUEST_INTERVAL seconds apart
+        return fetch_arxiv_papers(query, max_results, days_back)
+    return fetcher, None
+
+def run_digest(config=None, *, store=None, summarizer=None, fetcher=None, resume=False, as_of=None):
+    """Fetch, score and summarize papers for every interest, then write all outputs.
+
+    The work runs as overlapping stages connected by bounded queues:
+    fetch → parse → dedupe/score/select → summarize → store/render. Summarizing one
+    interest overlaps with fetching the next ones, while a shared rate limiter keeps
+    arXiv requests at least REQUEST_INTERVAL seconds apart.
+
+    Everything expensive can be passed in and kept warm across calls:
+        config      config dict (config.json layout), a path to one, or None for ./config.json
+        store       PaperStore to record the run in (default: opened from paper_store_file)
+        summarizer  callable with the transformers summarization pipeline's signature
+                    (default: the lazily loaded distilbart model, shared by all calls)
+        fetcher     fetcher(query, max_results, days_back) -> Atom XML or None
+                    (default: the arXiv API, rate limited, or the local snapshot store when
+                    arxiv_source is "snapshot"; a custom fetcher does its own limiting)
+        as_of       datetime to build the digest for (date windows, run date and archive
+                    page), e.g. to backfill past days from a snapshot; default now
+
+    Returns a dict with run_id, papers ({interest: [paper, ...]}), new_papers,
+    duplicates, tracked_papers, outputs (files written) and report (the run report).
+    """
+    if config is None or isinstance(config, str):
+        config = load_config(config or "config.json")
+    apply_config(config)
+    global AS_OF, memory_pressure
+    AS_OF = as_of
+
+    snapshot = None
+    if fetcher is None:
+        fetcher, snapshot = default_fetcher()
+    telemetry.reset()
+    memory_pressure = False
+    watchdog = MemoryWatchdog(MAX_RSS_MB, on_memory_pressure).start() if MAX_RSS_MB else None
+
+    owns_store = store is None
+    if owns_store:
+        store = PaperStore(PAPER_STORE_FILE)
+    checkpoint = RunCheckpoint(CHECKPOINT_DIR)
+    all_papers = {}
+
+    if resume and checkpoint.resume():
+        run_id = checkpoint.state['store_run_id']
+        seen_papers = set(checkpoint.state['seen_ids'])
+        new_papers_count = checkpoint.state['counts']['new_papers']
+        duplicate_count = checkpoint.state['counts']['duplicates']
+        stored_digest = store.load_digest(run_id)
+        for interest_name in checkpoint.state['completed_interests']:
+            all_papers[interest_name] = stored_digest.get(interest_name, [])
+        print(f"♻️ Resuming interrupted run: {len(all_papers)} interests done, "
+              f"{len(checkpoint.summaries)} summaries checkpointed")
+    else:
+        if resume:
+            print("ℹ️ No checkpoint to resume. Starting a fresh run.")
+        elif checkpoint.exists():
+            print("ℹ️ Discarding checkpoint of an unfinished run (use --resume to continue it)")
+
+        # Load previously seen papers
+        seen_papers = load_seen_papers()
+        new_papers_count = 0
+        duplicate_count = 0
+        run_id = store.start_run(INTERESTS.keys(), run_date=as_of.strftime('%Y%m%d') if as_of else None)
+        checkpoint.begin(run_id, seen_papers)
+    run_started_at = store.get_run(run_id)['started_at']
+
     print(f"📋 Loaded {len(seen_papers)} previously seen papers")
 
     if RECENT_DAYS > 0:
@@ -619,106 +814,431 @@ if __name__ == "__main__":
     else:
         print("📅 Fetching all available papers (no date filter)")
 
-    all_papers = {}
-    new_papers_count = 0
-    duplicate_count = 0
-
-    for interest_name, interest_config in INTERESTS.items():
-        query = interest_config['query']
-        keywords = interest_config['keywords']
-
-        print(f"\n🔍 Fetching papers for: {interest_name}")
-        xml_data = fetch_arxiv_papers(query, PAPERS_PER_INTEREST * FETCH_MULTIPLIER)  # Fetch more to filter
-        papers = parse_papers(xml_data) if xml_data else []
-
-        print(f"   → Found {len(papers)} papers")
-
-        # Filter out duplicates and calculate relevance
-        fresh_papers = []
-        for p in papers:
-            if p['arxiv_id'] not in seen_papers:
-                # Store original abstract for analysis
-                original_abstract = p['summary']
-
-                # Calculate relevance score FIRST (before summarization)
-                calculate_relevance_score(p, keywords)
-
-                # Estimate difficulty level (use ORIGINAL abstract before summarization)
-                p['difficulty'] = estimate_difficulty(original_abstract, p['category'])
-
-                # Generate layman context (use ORIGINAL abstract for better keyword extraction)
-                p['layman'] = generate_layman_context(p['title'], original_abstract)
-
-                # Generate summary (do this last to avoid losing original abstract)
-                p['summary'] = summarize_abstract(original_abstract)
-
-                fresh_papers.append(p)
+    pending = [(index, name, interest_config)
+               for index, (name, interest_config) in enumerate(INTERESTS.items())
+               if not checkpoint.is_interest_done(name)]
+    max_results = PAPERS_PER_INTEREST * FETCH_MULTIPLIER  # Fetch more to filter
+
+    # Candidates and summaries the trickle poller already has (not for backfills)
+    pooled, trickle_summaries = {}, {}
+    if as_of is None:
+        with TricklePool(store.path) as pool:
+            for _, interest_name, interest_config in pending:
+                for stage, days in (('primary', RECENT_DAYS), ('fallback', FALLBACK_DAYS)):
+                    papers = pool.candidates(interest_name, stage, interest_config['query'], since=window_start(days),
+                                             max_age_hours=TRICKLE_MAX_AGE_HOURS, limit=max_results)
+                    if papers is not None:
+                        pooled[(interest_name, stage)] = papers
+            if pooled:
+                trickle_summaries = pool.summaries()
+        if pooled:
+            print(f"💧 Trickle pool: candidates for {sum(s == 'primary' for _, s in pooled)}/{len(pending)} "
+                  f"interests, {len(trickle_summaries)} summaries ready")
+
+    planner = FallbackPlanner(FALLBACK_STATS_FILE, threshold=MIN_PAPERS_THRESHOLD)
+    duplicates_index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD)  # one paper, one summary per run
+    analyses = {}
+    reranker = Reranker(RERANKER_FILE) if PERSONALIZATION_WEIGHT and os.path.exists(RERANKER_FILE) else None
+    if reranker is not None and reranker.is_trained:
+        print(f"🎯 Re-ranking with weights learned from {len(reranker.exports)} like exports")
+    else:
+        reranker = None
+    if HOST_PROFILE:
+        print(f"🖥️ Host profile {HOST_PROFILE['path']}: {describe(settings)}")
+    pl = Pipeline(wrap=telemetry.profiled)
+    fetch_jobs = pl.queue(priority=True)     # (interest index, stage rank) -> fetch job
+    raw_queue = pl.queue(QUEUE_SIZE)         # fetched XML (or checkpointed candidates)
+    parsed_queue = pl.queue(QUEUE_SIZE)      # parsed candidates per interest and stage
+    # selected papers waiting for the model (unbounded in low-memory mode: see start_summarize)
+    summarize_queue = pl.queue(0 if LOW_MEMORY else QUEUE_SIZE)
+    results_queue = pl.queue()               # selections and finished summaries, drained below
+
+    def queue_fetch(index, interest_name, stage, query, days_back=None):
+        rank = 0 if stage == 'primary' else 1  # an interest's fallback goes ahead of later primaries
+        fetch_jobs.put(((index, rank), {
+            'interest': interest_name, 'stage': stage, 'query': query, 'days_back': days_back
+        }))
+
+    # --- Stage 1: fetch (rate limited, skips anything already checkpointed) ---
+    def fetch(job):
+        papers = checkpoint.candidates(job['interest'], job['stage'])
+        if papers is not None:
+            print(f"   ♻️ {job['interest']}: reusing {len(papers)} checkpointed {job['stage']} candidates")
+            telemetry.count('checkpoint_hits')
+            return [(job, None, papers)]
+
+        papers = pooled.get((job['interest'], job['stage']))
+        if papers is not None:
+            telemetry.count('trickle_hits')
+            return [(job, None, papers)]
+
+        xml_data = checkpoint.raw_response(job['query'], max_results, job['days_back'])
+        if xml_data is not None:
+            telemetry.count('checkpoint_hits')
+        else:
+            xml_data = fetcher(job['query'], max_results, job['days_back'])
+            if xml_data:
+                checkpoint.save_raw_response(job['query'], max_results, job['days_back'], xml_data)
+        return [(job, xml_data, None)]
+
+    # --- Stage 2: parse ---
+    def parse(item):
+        job, xml_data, papers = item
+        if papers is None:
+            with telemetry.timer('parse'):
+                papers = parse_papers(xml_data) if xml_data else []
+            if xml_data:
+                checkpoint.save_candidates(job['interest'], job['stage'], papers)
+        telemetry.count('candidates', len(papers))
+        return [(job, papers)]
+
+    # --- Stage 3: dedupe, score and select (in interest order, so seen_papers stays consistent) ---
+    def mark_seen(papers):
+        # A selected paper's near-duplicates under other IDs are seen too
+        seen_papers.update(p['arxiv_id'] for p in papers)
+        seen_papers.update(duplicates_index.canonical_id(p) for p in papers)
+
+    def run_select_stage():
+        buffered = {}
+
+        def candidates_for(interest_name, stage):
+            while (interest_name, stage) not in buffered:
+                item = pl.get(parsed_queue)
+                if item is DONE:
+                    raise RuntimeError(f"fetch stage ended before {stage} results for {interest_name}")
+                job, papers = item
+                buffered[(job['interest'], job['stage'])] = papers
+            return buffered.pop((interest_name, stage))
+
+        for index, interest_name, interest_config in pending:
+            query = interest_config['query']
+            keywords = interest_config['keywords']
+
+            papers = candidates_for(interest_name, 'primary')
+            fresh_papers = select_fresh(papers, keywords, seen_papers, duplicates_index, analyses, reranker)
+            duplicates = len(papers) - len(fresh_papers)
+
+            # Take top N papers and mark them as seen
+            top_papers = fresh_papers[:PAPERS_PER_INTEREST]
+            processed = list(fresh_papers)
+            mark_seen(top_papers)
+
+            print(f"\n🔍 {interest_name}: found {len(papers)} papers")
+            print(f"   ✨ {len(top_papers)} new papers (from {len(fresh_papers)} candidates, skipped {duplicates} duplicates)")
+            if top_papers:
+                print(f"   📊 Relevance scores: {[p['relevance_score'] for p in top_papers]}")
+
+            # FALLBACK: If we didn't get enough papers, try wider date range (only 1 extra request)
+            needs_fallback = len(top_papers) < MIN_PAPERS_THRESHOLD and FALLBACK_DAYS > RECENT_DAYS
+            planner.record(interest_name, len(top_papers), needs_fallback)
+            if needs_fallback:
+                if interest_name in prefetched:
+                    print(f"   🔄 Low yield, using prefetched fallback search (last {FALLBACK_DAYS} days)...")
+                else:
+                    print(f"   🔄 Low yield, trying fallback search (last {FALLBACK_DAYS} days)...")
+                    queue_fetch(index, interest_name, 'fallback', query, days_back=FALLBACK_DAYS)
+                papers_fallback = candidates_for(interest_name, 'fallback')
+
+                fallback_fresh = select_fresh(papers_fallback, keywords, seen_papers, duplicates_index, analyses,
+                                              reranker)
+                processed.extend(fallback_fresh)
+
+                # Add top fallback papers to fill quota
+                additional_papers = fallback_fresh[:PAPERS_PER_INTEREST - len(top_papers)]
+                mark_seen(additional_papers)
+                top_papers.extend(additional_papers)
+                print(f"   ✨ {interest_name} after fallback: {len(top_papers)} total papers "
+                      f"({len(papers_fallback)} found in fallback)")
+
+            # Tell the collector what to expect before handing papers to the summarizers
+            pl.put(results_queue, ('selected', {
+                'interest': interest_name,
+                'processed': processed,
+                'top_papers': top_papers,
+                'duplicates': duplicates
+            }))
+            for p in top_papers:
+                pl.put(summarize_queue, (interest_name, p))
+
+        fetch_jobs.put(DONE)
+        pl.put(summarize_queue, DONE)
+
+        # Drain prefetched fallbacks that turned out not to be needed
+        while pl.get(parsed_queue) is not DONE:
+            pass
+
+        if LOW_MEMORY:
+            # Feeds and candidates are gone; only now bring in the model
+            release_memory()
+            start_summarize()
+
+    # --- Stage 4: summarize (only the selected papers) ---
+    def summarize(item):
+        interest_name, p = item
+        summarize_paper(p, checkpoint, summarizer, trickle_summaries)
+        return [('summarized', interest_name)]
+
+    def start_summarize():
+        pl.stage("summarize", summarize_queue, results_queue, summarize, workers=SUMMARIZE_WORKERS)
+
+    # Queue every primary query, plus the fallback of interests that usually come up short
+    prefetched = set()
+    for index, interest_name, interest_config in pending:
+        queue_fetch(index, interest_name, 'primary', interest_config['query'])
+        if SPECULATIVE_FALLBACK and FALLBACK_DAYS > RECENT_DAYS and planner.expects_shortfall(interest_name):
+            print(f"🔮 {interest_name}: prefetching fallback search "
+                  f"(expected {planner.expected_yield(interest_name):.1f} fresh papers)")
+            queue_fetch(index, interest_name, 'fallback', interest_config['query'], days_back=FALLBACK_DAYS)
+            prefetched.add(interest_name)
+
+    pl.stage("fetch", fetch_jobs, raw_queue, fetch, workers=FETCH_WORKERS)
+    pl.stage("parse", raw_queue, parsed_queue, parse, workers=PARSE_WORKERS)
+    pl.spawn("select", run_select_stage)
+    if not LOW_MEMORY:
+        start_summarize()  # overlaps with fetching the next interests
+
+    # --- Stage 5: store each interest as soon as it is complete (in order), then render ---
+    selections = {}
+    remaining = {}
+    order = [name for _, name, _ in pending]
+    next_to_store = 0
+    try:
+        while True:
+            item = pl.get(results_queue)
+            if item is DONE:
+                break
+            kind, payload = item
+            if kind == 'selected':
+                selections[payload['interest']] = payload
+                remaining[payload['interest']] = remaining.get(payload['interest'], 0) + len(payload['top_papers'])
             else:
-                duplicate_count += 1
-
-        # Sort by relevance score (highest first)
-        fresh_papers.sort(key=lambda x: x['relevance_score'], reverse=True)
-
-        # Take top N papers
-        top_papers = fresh_papers[:PAPERS_PER_INTEREST]
-
-        # Mark these papers as seen
-        for p in top_papers:
-            seen_papers.add(p['arxiv_id'])
-            new_papers_count += 1
-
-        all_papers[interest_name] = top_papers
-        print(f"   ✨ {len(top_papers)} new papers (from {len(fresh_papers)} candidates, skipped {len(papers) - len(fresh_papers)} duplicates)")
-        if top_papers:
-            print(f"   📊 Relevance scores: {[p['relevance_score'] for p in top_papers]}")
-
-        # FALLBACK: If we didn't get enough papers, try wider date range (only 1 extra request)
-        if len(top_papers) < MIN_PAPERS_THRESHOLD and FALLBACK_DAYS > RECENT_DAYS:
-            print(f"   🔄 Low yield, trying fallback search (last {FALLBACK_DAYS} days)...")
-            time.sleep(5)  # Respect rate limit before fallback request
-
-            xml_data_fallback = fetch_arxiv_papers(query, PAPERS_PER_INTEREST * FETCH_MULTIPLIER, days_back=FALLBACK_DAYS)
-            papers_fallback = parse_papers(xml_data_fallback) if xml_data_fallback else []
-
-            print(f"   → Found {len(papers_fallback)} papers in fallback")
-
-            # Process fallback papers
-            fallback_fresh = []
-            for p in papers_fallback:
-                if p['arxiv_id'] not in seen_papers:
-                    original_abstract = p['summary']
-                    calculate_relevance_score(p, keywords)
-                    p['difficulty'] = estimate_difficulty(original_abstract, p['category'])
-                    p['layman'] = generate_layman_context(p['title'], original_abstract)
-                    p['summary'] = summarize_abstract(original_abstract)
-                    fallback_fresh.append(p)
-
-            # Sort fallback papers by relevance
-            fallback_fresh.sort(key=lambda x: x['relevance_score'], reverse=True)
-
-            # Add top fallback papers to fill quota
-            needed = PAPERS_PER_INTEREST - len(top_papers)
-            additional_papers = fallback_fresh[:needed]
-
-            for p in additional_papers:
-                seen_papers.add(p['arxiv_id'])
-                new_papers_count += 1
+                remaining[payload] = remaining.get(payload, 0) - 1
+
+            while next_to_store < len(order) and remaining.get(order[next_to_store]) == 0 \
+                    and order[next_to_store] in selections:
+                selection = selections.pop(order[next_to_store])
+                interest_name = selection['interest']
+                top_papers = selection['top_papers']
+
+                # Keep every processed paper so the digest can be re-rendered later
+                with telemetry.timer('store'):
+                    store.add_papers(run_id, interest_name, selection['processed'], [p['arxiv_id'] for p in top_papers])
+                completed_seen = set(checkpoint.state['seen_ids']) | {p['arxiv_id'] for p in top_papers}
+                checkpoint.complete_interest(interest_name, completed_seen, len(top_papers), selection['duplicates'])
+                all_papers[interest_name] = top_papers
+                new_papers_count += len(top_papers)
+                duplicate_count += selection['duplicates']
+                print(f"   ✅ {interest_name}: {len(top_papers)} papers summarized and stored")
+                next_to_store += 1
+    except PipelineAborted:
+        pass  # a stage failed; join() re-raises its error
+    except BaseException as e:
+        pl.fail(e)
+    try:
+        pl.join()
+    except BaseException:
+        if watchdog is not None:
+            watchdog.stop()
+        raise
 
-            top_papers.extend(additional_papers)
-            all_papers[interest_name] = top_papers
-            print(f"   ✨ After fallback: {len(top_papers)} total papers")
+    if LOW_MEMORY and summarizer is None:
+        unload_summarizer()  # rendering does not need it
 
-        # Be kind: 5-second delay between queries (extra respectful to arXiv)
-        time.sleep(5)
+    # Keep the digest in configured interest order
+    all_papers = {name: all_papers[name] for name in INTERESTS if name in all_papers}
 
     # Save updated seen papers
     save_seen_papers(seen_papers)
+    planner.save()
+    store.finish_run(run_id)
+    if owns_store:
+        store.close()
+    if snapshot is not None:
+        snapshot.close()
 
     print(f"\n📊 Summary:")
     print(f"   • Total new papers: {new_papers_count}")
     print(f"   • Total duplicates skipped: {duplicate_count}")
     print(f"   • Total tracked papers: {len(seen_papers)}")
 
-    save_html_digest(all_papers)
-    save_tiktok_feed(all_papers)
-    print("\n✅ Done! Open the HTML files in your browser.")
\ No newline at end of file
+    # Exports first: they record the ranked order, before the feed interleaves it
+    with telemetry.timer('export'):
+        outputs = save_exports(all_papers, run_id, run_started_at, as_of or datetime.now())
+    with telemetry.timer('render'):
+        digest_file = save_html_digest(all_papers, digest_date=as_of)
+        save_tiktok_feed(all_papers)
+
+    # Everything is persisted; the checkpoint is no longer needed
+    checkpoint.clear()
+    memory = {'low_memory': LOW_MEMORY, 'rss_target_mb': MAX_RSS_MB}
+    if watchdog is not None:
+        watchdog.stop()
+        memory.update(max_sampled_rss_mb=watchdog.max_rss_mb, target_exceeded=watchdog.exceeded,
+                      summaries_skipped=telemetry.counters.get('summaries_skipped_for_memory', 0))
+    report = telemetry.write_report(
+        RUN_REPORT_FILE,
+        run_id=run_id,
+        resumed=resume,
+        interests=len(INTERESTS),
+        new_papers=new_papers_count,
+        duplicates=duplicate_count,
+        workers={'fetch': FETCH_WORKERS, 'parse': PARSE_WORKERS, 'summarize': SUMMARIZE_WORKERS},
+        memory=memory
+    )
+    if MAX_RSS_MB:
+        within = report['peak_rss_mb'] is None or report['peak_rss_mb'] <= MAX_RSS_MB
+        print(f"{'✅' if within else '⚠️'} Peak RSS {report['peak_rss_mb']} MB against a {MAX_RSS_MB} MB target")
+    print("\n✅ Done! Open the HTML files in your browser.")
+
+    return {
+        'run_id': run_id,
+        'papers': all_papers,
+        'new_papers': new_papers_count,
+        'duplicates': duplicate_count,
+        'tracked_papers': len(seen_papers),
+        'outputs': {
+            'digest': digest_file,
+            'latest': 'latest.html',
+            'feed': 'tiktok_feed.html',
+            'report': RUN_REPORT_FILE,
+            **outputs
+        },
+        'report': report
+    }
+
+def trickle_poll(pool, fetcher):
+    """One trickle round: poll every interest, pool the candidates and summarize the likely picks."""
+    seen_papers = load_seen_papers()  # the digest adds its picks after every run
+    planner = FallbackPlanner(FALLBACK_STATS_FILE, threshold=MIN_PAPERS_THRESHOLD)
+    duplicates_index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD)
+    analyses = {}
+    reranker = Reranker(RERANKER_FILE) if PERSONALIZATION_WEIGHT and os.path.exists(RERANKER_FILE) else None
+    if reranker is not None and not reranker.is_trained:
+        reranker = None
+    max_results = PAPERS_PER_INTEREST * FETCH_MULTIPLIER
+    new_total = summarized = 0
+
+    for interest_name, interest_config in INTERESTS.items():
+        query = interest_config['query']
+        keywords = interest_config['keywords']
+        stages = [('primary', RECENT_DAYS)]
+        wants_fallback = FALLBACK_DAYS > RECENT_DAYS and planner.expects_shortfall(interest_name)
+        last_fallback = pool.last_poll(interest_name, 'fallback', query)
+        if wants_fallback and (last_fallback is None or datetime.now() - last_fallback > FALLBACK_REFRESH):
+            stages.append(('fallback', FALLBACK_DAYS))
+
+        for stage, days in stages:
+            xml_data = fetcher(query, max_results, days if stage == 'fallback' else None)
+            if xml_data is None:
+                continue
+            with telemetry.timer('parse'):
+                papers = parse_papers(xml_data)
+            new_papers = pool.add_candidates(interest_name, stage, query, papers)
+            new_total += new_papers
+            if new_papers:
+                print(f"   💧 {interest_name}: {new_papers} new {stage} candidates")
+
+        # Rank the pool as the digest would (same max_results per query, same seen and
+        # near-duplicate ids) and summarize whatever currently makes the cut
+        def pick(stage, days, count):
+            papers = pool.candidates(interest_name, stage, query, since=window_start(days), limit=max_results) or []
+            picked = select_fresh(papers, keywords, seen_papers, duplicates_index, analyses, reranker)[:count]
+            seen_papers.update(p['arxiv_id'] for p in picked)
+            seen_papers.update(duplicates_index.canonical_id(p) for p in picked)
+            return picked
+
+        picks = pick('primary', RECENT_DAYS, PAPERS_PER_INTEREST)
+        if len(picks) < MIN_PAPERS_THRESHOLD and FALLBACK_DAYS > RECENT_DAYS:
+            picks.extend(pick('fallback', FALLBACK_DAYS, PAPERS_PER_INTEREST - len(picks)))
+
+        if get_summarizer() is None:
+            continue  # truncated abstracts are as cheap to make at digest time
+        for p in picks:
+            if not pool.has_summary(p):
+                with telemetry.timer('summarize'):
+                    pool.save_summary(p, summarize_abstract(p['abstract']))
+                summarized += 1
+
+    pool.prune(max(RECENT_DAYS, FALLBACK_DAYS) + 1)
+    return new_total, summarized
+
+def run_trickle(config=None, once=False, interval_minutes=None, store_path=None):
+    """Poll arXiv at a low rate all day, keeping the next digest's candidates and summaries ready.
+
+    Requests stay request_interval seconds apart as in a digest run; the digest
+    afterwards finds the candidates and summaries in the trickle pool (see trickle.py).
+    """
+    if config is None or isinstance(config, str):
+        config = load_config(config or "config.json")
+    apply_config(config)
+    interval = (interval_minutes or TRICKLE_INTERVAL_MINUTES) * 60
+    fetcher, snapshot = default_fetcher()
+    print(f"💧 Trickle mode: polling {len(INTERESTS)} interests "
+          + ("once" if once else f"every {interval / 60:.0f} minutes (Ctrl+C to stop)"))
+
+    try:
+        while True:
+            started = time.monotonic()
+            with TricklePool(store_path or PAPER_STORE_FILE) as pool:
+                new_total, summarized = trickle_poll(pool, fetcher)
+            print(f"💧 {datetime.now().strftime('%H:%M')}: {new_total} new candidates, "
+                  f"{summarized} summaries precomputed")
+            if once:
+                break
+            if LOW_MEMORY:
+                unload_summarizer()  # idle until the next poll
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+    finally:
+        if snapshot is not None:
+            snapshot.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="arXiv research digest")
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "render", "tune", "trickle"],
+                        help="run: fetch and summarize new papers (default); "
+                             "render: rebuild HTML outputs from the paper store (or --api); "
+                             "tune: find the fastest summarizer setup for this host; "
+                             "trickle: poll arXiv all day so the next run is near-instant")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile CPU (cProfile) and memory (tracemalloc) into profiles/")
+    parser.add_argument("--source", choices=["api", "snapshot"],
+                        help="fetch from the arXiv API or the local snapshot store (default: arxiv_source setting)")
+    parser.add_argument("--as-of", type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help="build the digest for a past date, YYYY-MM-DD (backfills)")
+    parser.add_argument("--api", metavar="URL",
+                        help="render: take the latest digest from a digest_server.py instance instead")
+    parser.add_argument("--quick", action="store_true", help="tune: fewer candidates and abstracts")
+    parser.add_argument("--max-memory", type=int, metavar="MB",
+                        help="tune: ignore setups whose peak RSS exceeds this (default: max_rss_mb setting)")
+    parser.add_argument("--once", action="store_true", help="trickle: poll once and exit (e.g. from cron)")
+    parser.add_argument("--interval", type=int, metavar="MIN",
+                        help="trickle: minutes between polls (default: trickle_interval_minutes setting)")
+    args = parser.parse_args()
+
+    if args.profile:
+        telemetry.start_profiling()
+    try:
+        config = load_config(args.config)
+        if args.source:
+            config = dict(config, settings={**config.get('settings', {}), 'arxiv_source': args.source})
+        if args.command == "tune":
+            apply_config(config)
+            from host_tuning import tune
+            tune(args.config, quick=args.quick, max_memory_mb=args.max_memory or MAX_RSS_MB,
+                 profile_dir=settings.get('host_profile_dir', HOST_PROFILE_DIR))
+        elif args.command == "trickle":
+            run_trickle(config, once=args.once, interval_minutes=args.interval)
+        elif args.command == "render":
+            apply_config(config)
+            if args.api:
+                render_from_api(args.api)
+            else:
+                render_from_store()
+        else:
+            run_digest(config, resume=args.resume, as_of=args.as_of)
+    finally:
+        if args.profile:
+            telemetry.dump_profile(PROFILE_DIR)
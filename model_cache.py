@@ -0,0 +1,179 @@
+"""Local summarizer cache: the weights are converted once and then mapped, not read, at start-up.
+
+build_cache() loads the model the usual way one time and saves it to
+model_cache/<model>[-<dtype>]/: model.safetensors (in the configured dtype), the config,
+the generation settings and the fast tokenizer already built (tokenizer.json).
+
+Later starts build the model skeleton without allocating or initializing weights and
+point every parameter straight into the safetensors file through a private
+(copy-on-write) mmap. Nothing is deserialized or copied: pages are read when first
+touched, and processes summarizing at the same time share them through the page cache.
+
+Usage:
+    python model_cache.py build [--dtype bfloat16] [--force]
+    python model_cache.py info
+"""
+import os
+import json
+import glob
+import mmap
+import shutil
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+
+from atomic_io import atomic_write_json
+
+MODEL_NAME = "sshleifer/distilbart-cnn-12-6"
+MODEL_CACHE_DIR = "model_cache"
+CACHE_INFO = "cache_info.json"
+
+# safetensors dtype names -> torch dtype attribute names
+SAFETENSORS_DTYPES = {
+    'F64': 'float64', 'F32': 'float32', 'F16': 'float16', 'BF16': 'bfloat16',
+    'I64': 'int64', 'I32': 'int32', 'I16': 'int16', 'I8': 'int8', 'U8': 'uint8', 'BOOL': 'bool',
+}
+
+
+def cache_path(model_name=MODEL_NAME, cache_dir=MODEL_CACHE_DIR, dtype=None):
+    """Directory holding the converted model (one per model and dtype)."""
+    name = model_name.strip('/').replace('/', '--')
+    return os.path.join(cache_dir, f"{name}-{dtype}" if dtype else name)
+
+
+def is_built(path):
+    return os.path.exists(os.path.join(path, CACHE_INFO))
+
+
+def build_cache(model_name=MODEL_NAME, cache_dir=MODEL_CACHE_DIR, dtype=None, force=False):
+    """Convert the model to safetensors plus a prebuilt tokenizer (once; concurrent builds are safe)."""
+    path = cache_path(model_name, cache_dir, dtype)
+    if is_built(path) and not force:
+        return path
+
+    import torch
+    import transformers
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    print(f"🧊 Converting {model_name} into the model cache ({path})...")
+    model = AutoModelForSeq2SeqLM.from_pretrained(
+        model_name, torch_dtype=getattr(torch, dtype) if dtype else None
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=cache_dir)
+    try:
+        model.save_pretrained(build_dir, safe_serialization=True)
+        tokenizer.save_pretrained(build_dir)
+        atomic_write_json(os.path.join(build_dir, CACHE_INFO), {
+            'model': model_name,
+            'dtype': dtype or str(model.dtype).replace('torch.', ''),
+            'transformers': transformers.__version__,
+            'torch': torch.__version__,
+            'created': datetime.now().isoformat()
+        })
+        if force and os.path.isdir(path):
+            shutil.rmtree(path)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            if not is_built(path):
+                raise
+            # Another process finished the same build first; use theirs
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    print(f"✅ Model cache ready: {path}")
+    return path
+
+
+def map_safetensors(path):
+    """{name: tensor} backed by a copy-on-write mmap of a safetensors file (no data is read)."""
+    import torch
+
+    with open(path, 'rb') as f:
+        header_size = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)  # the tensors keep it alive
+
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == '__metadata__':
+            continue
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info['dtype']])
+        begin, end = info['data_offsets']
+        if end == begin:
+            tensor = torch.empty(0, dtype=dtype)
+        else:
+            count = (end - begin) // torch.empty(0, dtype=dtype).element_size()
+            tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + begin)
+        tensors[name] = tensor.reshape(info['shape'])
+    return tensors
+
+
+def load_cached_model(path):
+    """Seq2seq model whose weights live in the cache's mmapped safetensors files."""
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, GenerationConfig
+    try:
+        from transformers.modeling_utils import no_init_weights
+    except ImportError:
+        no_init_weights = contextlib.nullcontext
+
+    config = AutoConfig.from_pretrained(path)
+    # Parameters get shapes but no memory, and random initialization (seconds of work) is skipped
+    with torch.device('meta'), no_init_weights():
+        model = AutoModelForSeq2SeqLM.from_config(config)
+
+    state = {}
+    for weights_file in sorted(glob.glob(os.path.join(path, "*.safetensors"))):
+        state.update(map_safetensors(weights_file))
+    model.load_state_dict(state, strict=False, assign=True)
+    model.tie_weights()  # tied embeddings are stored only once
+
+    missing = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+               if tensor.is_meta]
+    if missing:
+        raise ValueError(f"cache has no weights for {', '.join(missing[:3])}")
+    if os.path.exists(os.path.join(path, "generation_config.json")):
+        model.generation_config = GenerationConfig.from_pretrained(path)
+    return model.eval()
+
+
+def load_summarizer(model_name=MODEL_NAME, cache_dir=MODEL_CACHE_DIR, dtype=None, device=-1):
+    """Summarization pipeline from the model cache, converting the model on first use."""
+    from transformers import AutoTokenizer, pipeline
+
+    path = build_cache(model_name, cache_dir, dtype)
+    model = load_cached_model(path)
+    tokenizer = AutoTokenizer.from_pretrained(path)
+    return pipeline("summarization", model=model, tokenizer=tokenizer, device=device)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory-mapped summarizer model cache")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="convert the summarizer model into the cache")
+    p.add_argument("--model", default=MODEL_NAME)
+    p.add_argument("--dtype", help="weight dtype, e.g. bfloat16 (default: the summarizer_dtype setting)")
+    p.add_argument("--force", action="store_true", help="rebuild even if the cache exists")
+    sub.add_parser("info", help="list the converted models")
+    args = parser.parse_args()
+
+    from main import load_config
+    settings = load_config(args.config).get('settings', {})
+    cache_dir = settings.get('model_cache_dir', MODEL_CACHE_DIR)
+
+    if args.command == "build":
+        dtype = args.dtype or settings.get('summarizer_dtype', 'bfloat16' if settings.get('low_memory') else None)
+        build_cache(args.model, cache_dir, dtype, force=args.force)
+    else:
+        for info_file in sorted(glob.glob(os.path.join(cache_dir, "*", CACHE_INFO))):
+            path = os.path.dirname(info_file)
+            with open(info_file, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            size_mb = sum(os.path.getsize(w) for w in glob.glob(os.path.join(path, "*.safetensors"))) / (1024 * 1024)
+            print(f"🧊 {info['model']} ({info['dtype']}, {size_mb:.0f} MB, transformers {info['transformers']}) → {path}")
@@ -0,0 +1,164 @@
+"""Run the digest for several profiles (e.g. one config.json per team) in one go.
+
+Every distinct arXiv query is fetched once for all profiles, and every distinct
+abstract is summarized once, by one model set up from the first profile's settings. Ranking, seen-paper histories and all outputs stay per
+profile: each profile runs in its own output directory (the `output_dir` setting,
+default: the folder of its config file) with its own paper store and archive.
+
+Usage:
+    python multi_profile.py teams/ml/config.json teams/systems/config.json
+"""
+import os
+import threading
+import argparse
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+import main
+from pipeline import RateLimiter
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ET.register_namespace('', ATOM_NS)
+ET.register_namespace('arxiv', 'http://arxiv.org/schemas/atom')
+ET.register_namespace('opensearch', 'http://a9.com/-/spec/opensearch/1.1/')
+
+
+def trim_feed(xml_data, max_results):
+    """Keep the first max_results entries of an Atom feed (results are newest first)."""
+    root = ET.fromstring(xml_data)
+    entries = root.findall(f'{{{ATOM_NS}}}entry')
+    if len(entries) <= max_results:
+        return xml_data
+    for entry in entries[max_results:]:
+        root.remove(entry)
+    return ET.tostring(root, encoding='unicode')
+
+
+class SharedFetcher:
+    """Fetch each distinct (query, date window) once for every profile, rate limited.
+
+    plan() records the largest max_results any profile needs per query, so one
+    request serves them all; smaller requests get the same newest-first feed trimmed.
+    """
+
+    def __init__(self, fetch=None, request_interval=5):
+        self.fetch = fetch or main.fetch_arxiv_papers
+        self.limiter = RateLimiter(request_interval)
+        self.max_results = {}
+        self.responses = {}
+        self.requests = 0
+        self.hits = 0
+        self._lock = threading.Lock()  # fetch workers of a run may call concurrently
+
+    def plan(self, config):
+        settings = config.get('settings', {})
+        max_results = settings.get('papers_per_interest', 10) * settings.get('fetch_multiplier', 5)
+        windows = (settings.get('recent_days', 7), settings.get('fallback_days', 90))
+        for interest in config.get('interests', {}).values():
+            for days in windows:
+                key = (interest['query'], days)
+                self.max_results[key] = max(self.max_results.get(key, 0), max_results)
+
+    def __call__(self, query, max_results, days_back):
+        days = main.RECENT_DAYS if days_back is None else days_back
+        key = (query, days)
+        with self._lock:
+            if key in self.responses:
+                self.hits += 1
+            else:
+                self.limiter.wait()
+                self.requests += 1
+                self.responses[key] = self.fetch(query, max(max_results, self.max_results.get(key, 0)), days)
+            xml_data = self.responses[key]
+        return trim_feed(xml_data, max_results) if xml_data else xml_data
+
+
+class SharedSummarizer:
+    """Wrap a summarization pipeline so each distinct abstract is summarized only once."""
+
+    def __init__(self, model):
+        self.model = model
+        self.summaries = {}
+        self.calls = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, **kwargs):
+        key = (text, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key in self.summaries:
+                self.hits += 1
+                return self.summaries[key]
+        result = self.model(text, **kwargs)
+        with self._lock:
+            self.calls += 1
+            self.summaries[key] = result
+        return result
+
+
+@contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def load_profile(config_file, overrides=None):
+    """Return (name, config, output_dir) for one profile's config file."""
+    config_file = os.path.abspath(config_file)
+    config = main.load_config(config_file)
+    if overrides:
+        config = dict(config, settings={**config.get('settings', {}), **overrides})
+    settings = config.get('settings', {})
+    output_dir = os.path.join(os.path.dirname(config_file), settings.get('output_dir', '.'))
+    name = settings.get('profile_name') or os.path.basename(os.path.dirname(config_file))
+    return name, config, os.path.normpath(output_dir)
+
+
+def run_profiles(config_files, *, summarizer=None, fetch=None, request_interval=None, overrides=None):
+    """Run every profile, sharing fetches and summaries. Returns {profile name: run_digest result}.
+
+    `overrides` replaces settings in every profile (e.g. more summarize workers).
+    """
+    profiles = [load_profile(path, overrides) for path in config_files]
+    if request_interval is None:
+        request_interval = max(config.get('settings', {}).get('request_interval', 5) for _, config, _ in profiles)
+
+    fetcher = SharedFetcher(fetch, request_interval)
+    for _, config, _ in profiles:
+        fetcher.plan(config)
+
+    model = summarizer
+    if model is None:
+        # The one shared model is built with the first profile's settings (threads, dtype,
+        # device, model cache) and this host's tuned profile, as a single run would be
+        _, config, output_dir = profiles[0]
+        with working_directory(output_dir):
+            main.apply_config(config)
+            model = main.get_summarizer()
+    shared_summarizer = SharedSummarizer(model) if model is not None else None
+
+    results = {}
+    for name, config, output_dir in profiles:
+        print(f"\n👥 Profile: {name} → {output_dir}")
+        with working_directory(output_dir):
+            results[name] = main.run_digest(config, summarizer=shared_summarizer, fetcher=fetcher)
+
+    print(f"\n📊 {len(profiles)} profiles:")
+    print(f"   • arXiv requests: {fetcher.requests} ({fetcher.hits} served from the shared cache)")
+    if shared_summarizer is not None:
+        print(f"   • Summaries: {shared_summarizer.calls} computed, {shared_summarizer.hits} reused")
+    for name, result in results.items():
+        print(f"   • {name}: {result['new_papers']} new papers → {result['outputs']['digest']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the digest for several profiles, sharing fetches and summaries")
+    parser.add_argument("configs", nargs="+", help="one config.json per profile")
+    args = parser.parse_args()
+    run_profiles(args.configs)
@@ -0,0 +1,102 @@
+"""Paper identity: arXiv ID normalization and near-duplicate detection within a run.
+
+arXiv IDs come in two schemes, both optionally followed by a version:
+
+    2501.01234v2            new style (YYMM.NNNNN; YYMM.NNNN before 2015)
+    solv-int/9901001v1      old style (archive/YYMMNNN), sometimes with a subject
+    math.GT/0309136         class that is not part of the ID (-> math/0309136)
+
+normalize_arxiv_id() maps links, "arXiv:" prefixes and versioned IDs to
+(base ID, version), so every version of a paper is tracked as one paper.
+
+NearDuplicateIndex catches the same paper under different IDs (re-submissions,
+duplicates): MinHash signatures of word shingles of title + abstract, bucketed with
+LSH bands so each paper is only compared with likely matches, then confirmed with
+the exact Jaccard similarity of the shingle sets.
+"""
+import re
+import random
+import hashlib
+
+NEW_STYLE_ID = re.compile(r'(\d{4}\.\d{4,5})(v\d+)?$')
+OLD_STYLE_ID = re.compile(r'([a-z][a-z\-]*)(?:\.[A-Z]{2})?/(\d{7})(v\d+)?$')
+
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+
+
+def normalize_arxiv_id(text):
+    """(base ID, version or None) for an arXiv ID or abs/pdf link; (text, None) if unrecognized."""
+    text = text.strip()
+    for marker in ('/abs/', '/pdf/'):
+        if marker in text:
+            text = text.split(marker, 1)[1]
+    if text.lower().startswith('arxiv:'):
+        text = text[6:]
+    if text.endswith('.pdf'):
+        text = text[:-4]
+
+    match = NEW_STYLE_ID.search(text)
+    if match:
+        return match.group(1), match.group(2)
+    match = OLD_STYLE_ID.search(text)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}", match.group(3)
+    return text, None
+
+
+def shingles(paper):
+    """Word shingles of a paper's title and abstract (case and punctuation ignored)."""
+    words = re.findall(r'\w+', f"{paper['title']} {paper.get('abstract') or paper['summary']}".lower())
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class NearDuplicateIndex:
+    """Run-wide MinHash/LSH index that maps each paper to the first near-identical one seen."""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=32, bands=16, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_perm)]
+        self.buckets = {}     # (band, band signature) -> [arxiv_id, ...]
+        self.shingles = {}    # arxiv_id -> shingle set of indexed papers
+        self.position = {}    # arxiv_id -> order in which it was indexed
+        self.canonical = {}   # arxiv_id -> arxiv_id of the paper it duplicates (or itself)
+
+    def signature(self, shingle_set):
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+                  for s in shingle_set]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self.permutations]
+
+    def canonical_id(self, paper):
+        """ID of the first indexed paper this one nearly duplicates, else its own (now indexed)."""
+        arxiv_id = paper['arxiv_id']
+        if arxiv_id in self.canonical:
+            return self.canonical[arxiv_id]
+
+        shingle_set = shingles(paper)
+        if not shingle_set or self.threshold <= 0:
+            self.canonical[arxiv_id] = arxiv_id
+            return arxiv_id
+
+        signature = self.signature(shingle_set)
+        keys = [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+        candidates = {other for key in keys for other in self.buckets.get(key, ())}
+        for other in sorted(candidates, key=self.position.get):  # earliest indexed wins
+            other_set = self.shingles[other]
+            if len(shingle_set & other_set) / len(shingle_set | other_set) >= self.threshold:
+                self.canonical[arxiv_id] = self.canonical[other]
+                return self.canonical[arxiv_id]
+
+        for key in keys:
+            self.buckets.setdefault(key, []).append(arxiv_id)
+        self.shingles[arxiv_id] = shingle_set
+        self.position[arxiv_id] = len(self.position)
+        self.canonical[arxiv_id] = arxiv_id
+        return arxiv_id
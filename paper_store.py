@@ -0,0 +1,158 @@
+"""Local paper store: keeps every processed paper per run so digests can be re-rendered."""
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+PAPER_STORE_FILE = "paper_store.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    interests TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS papers (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    interest TEXT NOT NULL,
+    arxiv_id TEXT NOT NULL,
+    selected INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL DEFAULT 0,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    difficulty TEXT,
+    layman TEXT,
+    category TEXT,
+    published TEXT,
+    link TEXT,
+    pdf_link TEXT,
+    relevance_score NUMERIC NOT NULL DEFAULT 0,
+    matched_keywords TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (run_id, interest, arxiv_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_papers_arxiv_id ON papers(arxiv_id);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(run_date);
+"""
+
+PAPER_COLUMNS = (
+    'arxiv_id', 'title', 'abstract', 'summary', 'difficulty', 'layman',
+    'category', 'published', 'link', 'pdf_link', 'relevance_score', 'matched_keywords'
+)
+
+
+class PaperStore:
+    """SQLite-backed store of processed papers, grouped by run and interest."""
+
+    def __init__(self, path=PAPER_STORE_FILE, check_same_thread=True):
+        self.path = path
+        # check_same_thread=False lets a caller share the connection under its own lock
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------
+    # Writing
+    # ----------------------
+
+    def start_run(self, interests, run_date=None):
+        """Register a new run and return its id."""
+        now = datetime.now()
+        run_date = run_date or now.strftime('%Y%m%d')
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (run_date, started_at, interests) VALUES (?, ?, ?)",
+                (run_date, now.isoformat(), json.dumps(list(interests)))
+            )
+        return cur.lastrowid
+
+    def add_papers(self, run_id, interest, papers, selected_ids=()):
+        """Store processed papers for one interest; papers in selected_ids make the digest."""
+        positions = {arxiv_id: i for i, arxiv_id in enumerate(selected_ids)}
+        rows = []
+        for paper in papers:
+            arxiv_id = paper['arxiv_id']
+            rows.append((
+                run_id, interest, arxiv_id, int(arxiv_id in positions),
+                positions.get(arxiv_id, 0),
+                paper['title'],
+                paper.get('abstract', paper['summary']),
+                paper['summary'],
+                paper.get('difficulty'),
+                paper.get('layman'),
+                paper.get('category'),
+                paper.get('published'),
+                paper.get('link'),
+                paper.get('pdf_link'),
+                paper.get('relevance_score', 0),
+                json.dumps(paper.get('matched_keywords', []))
+            ))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO papers (run_id, interest, arxiv_id, selected, position, title, abstract, "
+                "summary, difficulty, layman, category, published, link, pdf_link, relevance_score, matched_keywords) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def finish_run(self, run_id):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                (datetime.now().isoformat(), run_id)
+            )
+
+    # ----------------------
+    # Reading
+    # ----------------------
+
+    def list_runs(self, finished_only=True):
+        """Return run rows, oldest first."""
+        sql = "SELECT * FROM runs"
+        if finished_only:
+            sql += " WHERE finished_at IS NOT NULL"
+        sql += " ORDER BY run_id"
+        return [dict(row) for row in self.conn.execute(sql)]
+
+    def get_run(self, run_id):
+        run = self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(run) if run else None
+
+    def latest_run(self):
+        runs = self.list_runs()
+        return runs[-1] if runs else None
+
+    def load_digest(self, run_id, selected_only=True):
+        """Load a run as {interest: [paper, ...]} in digest order."""
+        run = self.conn.execute("SELECT interests FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if run is None:
+            return {}
+
+        papers_by_interest = {name: [] for name in json.loads(run['interests'])}
+        sql = "SELECT * FROM papers WHERE run_id = ?"
+        if selected_only:
+            sql += " AND selected = 1"
+        sql += " ORDER BY interest, selected DESC, position, relevance_score DESC"
+
+        for row in self.conn.execute(sql, (run_id,)):
+            paper = {col: row[col] for col in PAPER_COLUMNS}
+            paper['matched_keywords'] = json.loads(paper['matched_keywords'])
+            papers_by_interest.setdefault(row['interest'], []).append(paper)
+        return papers_by_interest
+
+
+def store_exists(path=PAPER_STORE_FILE):
+    return os.path.exists(path)
@@ -0,0 +1,188 @@
+"""Small threaded stage runner: workers connected by bounded queues.
+
+Each stage runs in its own thread(s) and hands items to the next stage through a
+bounded queue, so a slow stage applies backpressure instead of buffering the whole
+run in memory. The first exception in any worker stops every stage and is re-raised
+from Pipeline.join().
+"""
+import time
+import queue
+import itertools
+import threading
+
+# End-of-stream marker passed down the queues
+DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Raised inside workers blocked on a queue once another stage has failed."""
+
+
+class PriorityQueue(queue.PriorityQueue):
+    """Queue of (priority, item) pairs that hands out bare items, lowest priority first.
+
+    DONE can be put on its own and always sorts after every real item.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self._seq = itertools.count()
+
+    def _put(self, entry):
+        if entry is DONE:
+            super()._put((1, 0, next(self._seq), DONE))
+        else:
+            priority, item = entry
+            super()._put((0, priority, next(self._seq), item))
+
+    def _get(self):
+        return super()._get()[-1]
+
+
+class RateLimiter:
+    """Enforce a minimum interval between calls, shared by every thread that uses it."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._next_allowed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_allowed = time.monotonic() + self.min_interval
+
+
+class MicroBatcher:
+    """Combine calls from concurrent threads into batched calls of fn(items) -> results.
+
+    A caller that finds no batch running runs one with everything queued so far (up
+    to batch_size); calls that arrive meanwhile form the next batch. Batches grow with
+    the number of waiting threads, and a lone caller never waits for company.
+    """
+
+    def __init__(self, fn, batch_size):
+        self.fn = fn
+        self.batch_size = batch_size
+        self.batches = 0
+        self.items = 0
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._pending = []
+
+    def __call__(self, item):
+        slot = {'item': item, 'done': False}
+        with self._lock:
+            self._pending.append(slot)
+        while True:
+            with self._run_lock:
+                if slot['done']:
+                    break
+                with self._lock:
+                    batch = self._pending[:self.batch_size]
+                    del self._pending[:self.batch_size]
+                try:
+                    results = self.fn([s['item'] for s in batch])
+                except Exception as e:
+                    for s in batch:
+                        s.update(error=e, done=True)
+                else:
+                    for s, result in zip(batch, results):
+                        s.update(result=result, done=True)
+                self.batches += 1
+                self.items += len(batch)
+        if 'error' in slot:
+            raise slot['error']
+        return slot['result']
+
+
+class Pipeline:
+    def __init__(self, poll_interval=0.1, wrap=None):
+        self.poll_interval = poll_interval
+        self.wrap = wrap  # optional decorator for every thread target (e.g. profiling)
+        self.threads = []
+        self.error = None
+        self.stopped = threading.Event()
+
+    def queue(self, maxsize=0, priority=False):
+        return PriorityQueue(maxsize) if priority else queue.Queue(maxsize)
+
+    def get(self, q):
+        """Blocking get that gives up once the pipeline has been stopped."""
+        while True:
+            if self.stopped.is_set():
+                raise PipelineAborted()
+            try:
+                return q.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+    def put(self, q, item):
+        """Blocking put that gives up once the pipeline has been stopped."""
+        while True:
+            if self.stopped.is_set():
+                raise PipelineAborted()
+            try:
+                q.put(item, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                continue
+
+    def fail(self, error):
+        if self.error is None:
+            self.error = error
+        self.stopped.set()
+
+    def spawn(self, name, target, *args):
+        """Run target(*args) in a daemon thread; an exception stops the whole pipeline."""
+        def run():
+            try:
+                target(*args)
+            except PipelineAborted:
+                pass
+            except BaseException as e:
+                self.fail(e)
+
+        if self.wrap is not None:
+            run = self.wrap(run)
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+        return thread
+
+    def stage(self, name, inbox, outbox, handle, workers=1):
+        """Run `workers` threads applying handle(item) -> iterable of outputs until DONE.
+
+        DONE is forwarded to `outbox` once every worker of this stage has finished.
+        """
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def work():
+            try:
+                while True:
+                    item = self.get(inbox)
+                    if item is DONE:
+                        self.put(inbox, DONE)  # let sibling workers see it too
+                        break
+                    for output in handle(item) or ():
+                        self.put(outbox, output)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and not self.stopped.is_set():
+                    self.put(outbox, DONE)
+
+        for i in range(workers):
+            self.spawn(f"{name}-{i}", work)
+
+    def join(self):
+        """Wait for every stage; re-raise the first worker error, if any."""
+        for thread in self.threads:
+            while thread.is_alive():
+                thread.join(self.poll_interval)
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,264 @@
+"""Personal re-ranker learned from the feed's "Export Likes" files (arxiv_likes_*.json).
+
+A logistic regression over hashed features (title words, abstract words, arXiv
+category). Each export is a snapshot of every current like, so the newest export
+decides: its papers are positives, and papers the digest showed (selected in the
+paper store) before its date but that it does not list are negatives, including
+papers that were liked before and unliked since. Training is incremental: every
+ingest only updates the weights with examples it has not learned yet, or whose label
+changed. The weights are a small sparse JSON file.
+
+At selection time each candidate costs one sparse dot product, and the learned
+score is added to the keyword relevance score (personalization_weight).
+
+Usage:
+    python reranker.py ingest ~/Downloads/arxiv_likes_*.json
+    python reranker.py show                     # strongest learned features
+"""
+import os
+import re
+import sys
+import glob
+import json
+import math
+import zlib
+import random
+import argparse
+from datetime import datetime
+
+from atomic_io import atomic_write_json
+from paper_store import PaperStore, store_exists
+
+RERANKER_FILE = "reranker_weights.json"
+HASH_BITS = 18
+TOKEN_RE = re.compile(r'[a-z][a-z0-9\-]{2,}')
+
+
+def features(paper, dim=1 << HASH_BITS):
+    """Sparse {bucket: value} of a paper's title/abstract words and category."""
+    tokens = {f"t:{w}" for w in TOKEN_RE.findall(paper['title'].lower())}
+    tokens.update(f"a:{w}" for w in TOKEN_RE.findall((paper.get('abstract') or paper.get('summary') or '').lower()))
+    if paper.get('category'):
+        tokens.add(f"c:{paper['category']}")
+    if not tokens:
+        return {}
+    value = 1 / math.sqrt(len(tokens))  # unit length, so long abstracts do not dominate
+    x = {}
+    for token in tokens:
+        bucket = zlib.crc32(token.encode('utf-8')) & (dim - 1)
+        x[bucket] = x.get(bucket, 0.0) + value
+    return x
+
+
+class Reranker:
+    def __init__(self, path=RERANKER_FILE, learning_rate=0.5, l2=1e-4):
+        self.path = path
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.dim = 1 << HASH_BITS
+        self.bias = 0.0
+        self.weights = {}   # bucket -> weight (only non-zero ones)
+        self.trained = {}   # arxiv_id -> label it was last trained with
+        self.exports = []   # export files ingested so far
+        self.last_export = ""  # export_date of the newest snapshot learned from
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading {self.path}: {e}")
+            return
+        self.dim = data.get('dim', self.dim)
+        self.bias = data.get('bias', 0.0)
+        self.weights = {int(k): v for k, v in data.get('weights', {}).items()}
+        self.trained = data.get('trained', {})
+        self.exports = data.get('exports', [])
+        self.last_export = data.get('last_export', "")
+
+    @property
+    def is_trained(self):
+        return bool(self.weights)
+
+    def margin(self, x):
+        return self.bias + sum(self.weights.get(i, 0.0) * v for i, v in x.items())
+
+    def score(self, paper):
+        """Learned preference in (-1, 1); 0 means no opinion (or no model yet)."""
+        if not self.weights:
+            return 0.0
+        # The bias only shifts every paper alike; leaving it out keeps scores from saturating
+        return math.tanh((self.margin(features(paper, self.dim)) - self.bias) / 2)
+
+    def update(self, x, label, weight=1.0):
+        """One logistic-loss SGD step on a sparse example."""
+        margin = max(-30.0, min(30.0, self.margin(x)))
+        gradient = (1 / (1 + math.exp(-margin)) - label) * weight
+        step = self.learning_rate * gradient
+        self.bias -= step
+        for i, v in x.items():
+            w = self.weights.get(i, 0.0)
+            w -= step * v + self.learning_rate * self.l2 * w
+            if abs(w) < 1e-6:
+                self.weights.pop(i, None)
+            else:
+                self.weights[i] = w
+
+    def train(self, examples, epochs=5, seed=0):
+        """Fit (paper, label) examples, positives weighted up to balance the classes."""
+        if not examples:
+            return
+        positives = sum(label for _, label in examples)
+        negatives = len(examples) - positives
+        positive_weight = negatives / positives if positives and negatives else 1.0
+        vectors = [(features(paper, self.dim), label) for paper, label in examples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(vectors)
+            for x, label in vectors:
+                self.update(x, label, positive_weight if label else 1.0)
+        for paper, label in examples:
+            self.trained[paper['arxiv_id']] = label
+
+    def save(self):
+        atomic_write_json(self.path, {
+            'dim': self.dim,
+            'bias': round(self.bias, 6),
+            'weights': {str(i): round(w, 6) for i, w in sorted(self.weights.items())},
+            'trained': self.trained,
+            'exports': self.exports,
+            'last_export': self.last_export,
+            'updated': datetime.now().isoformat()
+        }, indent=None)
+
+
+# ======================
+# INGESTION
+# ======================
+
+def shown_papers(store_path):
+    """{arxiv_id: (paper, first run date)} of every paper a digest showed."""
+    if not store_exists(store_path):
+        return {}
+    shown = {}
+    with PaperStore(store_path) as store:
+        rows = store.conn.execute(
+            "SELECT r.run_date, p.arxiv_id, p.title, p.abstract, p.category FROM papers p "
+            "JOIN runs r ON r.run_id = p.run_id WHERE p.selected = 1 AND r.finished_at IS NOT NULL "
+            "ORDER BY r.run_date"
+        )
+        for row in rows:
+            if row['arxiv_id'] not in shown:
+                shown[row['arxiv_id']] = (
+                    {'arxiv_id': row['arxiv_id'], 'title': row['title'],
+                     'abstract': row['abstract'], 'category': row['category']},
+                    row['run_date']
+                )
+    return shown
+
+
+def ingest_likes(export_files, store_path="paper_store.db", path=RERANKER_FILE):
+    """Train the re-ranker on like exports; only new or relabelled examples are learned.
+
+    The newest export (by export_date) is the current set of likes. A paper liked in
+    an earlier export or training but missing from it was unliked and becomes a
+    negative. Exports older than one already learned from only add likes.
+    """
+    reranker = Reranker(path)
+    shown = shown_papers(store_path)
+
+    exports = []
+    for export_file in sorted(export_files):
+        try:
+            with open(export_file, 'r', encoding='utf-8') as f:
+                export = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Skipping {export_file}: {e}")
+            continue
+        exports.append(export)
+        name = os.path.basename(export_file)
+        if name not in reranker.exports:
+            reranker.exports.append(name)
+    exports.sort(key=lambda export: export.get('export_date', ''))
+
+    known = {}  # every paper any export liked
+    for export in exports:
+        for paper in export.get('liked_papers', []):
+            if paper.get('arxiv_id'):
+                known[paper['arxiv_id']] = paper
+    newest = exports[-1] if exports else {}
+    newest_date = newest.get('export_date', '')
+    snapshot = newest_date >= reranker.last_export  # not older than what was learned already
+
+    # Papers shown up to the newest export were seen by the user; unliked ones are negatives
+    cutoff = max(newest_date, reranker.last_export)[:10].replace('-', '') or datetime.now().strftime('%Y%m%d')
+    if snapshot:
+        liked = {p['arxiv_id'] for p in newest.get('liked_papers', []) if p.get('arxiv_id')}
+        labels = {arxiv_id: 1 for arxiv_id in liked}
+        # Liked before (in an older export or an earlier ingest) but not any more
+        previously_liked = set(known) | {i for i, label in reranker.trained.items() if label == 1}
+        for arxiv_id in previously_liked - liked:
+            labels[arxiv_id] = 0
+        for arxiv_id, (_, run_date) in shown.items():
+            if arxiv_id not in liked and run_date <= cutoff:
+                labels[arxiv_id] = 0
+    else:
+        # Older than what was learned: it can only add papers nothing has labelled yet
+        labels = {arxiv_id: 1 for arxiv_id in known if arxiv_id not in reranker.trained}
+        for arxiv_id, (_, run_date) in shown.items():
+            if arxiv_id not in known and run_date <= cutoff and arxiv_id not in reranker.trained:
+                labels[arxiv_id] = 0
+
+    examples = []
+    for arxiv_id, label in labels.items():
+        if reranker.trained.get(arxiv_id) == label:
+            continue
+        # The store has the abstract as well; an unliked paper it never showed only has its export entry
+        paper = shown[arxiv_id][0] if arxiv_id in shown else known.get(arxiv_id)
+        if paper is not None:
+            examples.append((paper, label))
+    if snapshot:
+        reranker.last_export = newest_date
+
+    reranker.train(examples)
+    reranker.save()
+    positives = sum(label for _, label in examples)
+    print(f"🎯 Re-ranker trained on {positives} new likes and {len(examples) - positives} new negatives or unlikes "
+          f"({len(reranker.trained)} examples, {len(reranker.weights)} weights) → {path}")
+    return reranker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Personal re-ranker trained from exported likes")
+    parser.add_argument("--config", default="config.json", help="configuration file (default: config.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("ingest", help="learn from arxiv_likes_*.json exports")
+    p.add_argument("exports", nargs="+", help="export files (globs allowed)")
+    p = sub.add_parser("show", help="print the strongest learned title/abstract words")
+    p.add_argument("--store", help="paper store to name the features from")
+    args = parser.parse_args()
+
+    from main import load_config
+    settings = load_config(args.config).get('settings', {})
+    store_path = settings.get('paper_store_file', 'paper_store.db')
+    weights_path = settings.get('reranker_file', RERANKER_FILE)
+
+    if args.command == "ingest":
+        files = [f for pattern in args.exports for f in (glob.glob(pattern) or [pattern])]
+        missing = [f for f in files if not os.path.exists(f)]
+        if missing:
+            sys.exit(f"❌ Not found: {', '.join(missing)}")
+        ingest_likes(files, store_path, weights_path)
+    else:
+        # Hashes are one-way: name the buckets from the words of stored papers
+        reranker = Reranker(weights_path)
+        names = {}
+        for paper, _ in shown_papers(args.store or store_path).values():
+            for token in [f"t:{w}" for w in TOKEN_RE.findall(paper['title'].lower())] + [f"c:{paper['category']}"]:
+                names.setdefault(zlib.crc32(token.encode('utf-8')) & (reranker.dim - 1), token)
+        ranked = sorted(((w, names[i]) for i, w in reranker.weights.items() if i in names), reverse=True)
+        print("👍 " + ", ".join(f"{name} {w:+.2f}" for w, name in ranked[:15]))
+        print("👎 " + ", ".join(f"{name} {w:+.2f}" for w, name in ranked[-15:][::-1]))
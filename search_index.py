@@ -0,0 +1,394 @@
+"""Static full-text search over every archived paper, with no server.
+
+An inverted index over titles, summaries and categories is kept in small shard files
+under search_index/, updated incrementally each time a digest is archived:
+
+    search_index/meta.json      arxiv_id -> doc id map and the next free doc id
+    search_index/terms/abc.js   {term: [[doc_id, weight], ...]} for terms starting with "abc"
+    search_index/docs/0000.js   {doc_id: {title, link, date, ...}} for DOC_SHARD_SIZE docs
+
+search.html loads only the term shards for the words typed and the doc shards for the
+top hits. Shards are small scripts calling searchShard(name, {...}) so the page also
+works when opened straight from a synced folder (file://).
+
+Usage: python search_index.py --rebuild   (re-index every digest in the paper store)
+"""
+import os
+import re
+import sys
+import json
+import shutil
+from datetime import datetime
+from collections import defaultdict
+
+from atomic_io import atomic_write_json
+from static_assets import publish_stylesheet, write_artifact
+
+SEARCH_DIR = "search_index"
+SEARCH_PAGE = "search.html"
+
+# Terms are sharded by their first PREFIX_LEN characters; docs in fixed-size id blocks
+PREFIX_LEN = 3
+DOC_SHARD_SIZE = 500
+
+# Field weights: a word in the title counts more than one in the summary
+FIELD_WEIGHTS = (('title', 3), ('category', 2), ('summary', 1))
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'for', 'from', 'has', 'have',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to',
+    'we', 'which', 'while', 'with'
+}
+
+
+def tokenize(text):
+    """Lowercase alphanumeric words, minus stopwords and single characters (mirrored in search.html)."""
+    return [t for t in re.findall(r'[a-z0-9]+', (text or '').lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def term_weights(paper):
+    weights = defaultdict(int)
+    for field, weight in FIELD_WEIGHTS:
+        for term in tokenize(paper.get(field)):
+            weights[term] += weight
+    return weights
+
+
+# ======================
+# SHARD FILES
+# ======================
+
+def _shard_path(index_dir, name):
+    return os.path.join(index_dir, *name.split('/')) + ".js"
+
+
+def read_shard(index_dir, name):
+    path = _shard_path(index_dir, name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    # searchShard("name",{...});
+    return json.loads(text[text.index(',') + 1:text.rindex(')')])
+
+
+def write_shard(index_dir, name, data):
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    write_artifact(_shard_path(index_dir, name), f"searchShard({json.dumps(name)},{payload});\n")
+
+
+def load_meta(index_dir):
+    path = os.path.join(index_dir, "meta.json")
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading search index meta: {e}")
+    return {'next_id': 0, 'ids': {}}
+
+
+# ======================
+# INDEXING
+# ======================
+
+def update_search_index(all_papers_by_interest, digest_date, index_dir=SEARCH_DIR):
+    """Add newly archived papers to the index, rewriting only the shards they touch."""
+    meta = load_meta(index_dir)
+    first_new_id = meta['next_id']
+    date = digest_date.strftime('%Y-%m-%d')
+
+    term_updates = defaultdict(lambda: defaultdict(list))
+    doc_updates = defaultdict(dict)
+    for interest_name, papers in all_papers_by_interest.items():
+        for paper in papers:
+            if paper['arxiv_id'] in meta['ids']:
+                continue
+            doc_id = meta['next_id']
+            meta['next_id'] += 1
+            meta['ids'][paper['arxiv_id']] = doc_id
+
+            for term, weight in term_weights(paper).items():
+                term_updates[term[:PREFIX_LEN]][term].append([doc_id, weight])
+            doc_updates[f"{doc_id // DOC_SHARD_SIZE:04d}"][str(doc_id)] = {
+                'title': paper['title'],
+                'link': paper.get('link'),
+                'date': date,
+                'interest': interest_name,
+                'category': paper.get('category'),
+                'summary': paper.get('summary', '')[:240]
+            }
+
+    if meta['next_id'] == first_new_id:
+        return 0
+
+    for prefix, terms in term_updates.items():
+        shard = read_shard(index_dir, f"terms/{prefix}")
+        for term, postings in terms.items():
+            # Drop postings from an earlier attempt that crashed before meta.json was saved
+            kept = [p for p in shard.get(term, []) if p[0] < first_new_id]
+            shard[term] = kept + postings
+        write_shard(index_dir, f"terms/{prefix}", shard)
+
+    for block, docs in doc_updates.items():
+        shard = read_shard(index_dir, f"docs/{block}")
+        shard.update(docs)
+        write_shard(index_dir, f"docs/{block}", shard)
+
+    # meta.json goes last: until it is saved, the new ids are not considered indexed
+    atomic_write_json(os.path.join(index_dir, "meta.json"), meta, indent=None)
+    write_search_page(index_dir, meta['next_id'])
+
+    added = meta['next_id'] - first_new_id
+    print(f"🔎 Search index updated with {added} papers ({meta['next_id']} total)")
+    return added
+
+
+def rebuild_search_index(store_path, index_dir=SEARCH_DIR):
+    """Re-index every completed run in the paper store from scratch."""
+    from paper_store import PaperStore
+
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+    with PaperStore(store_path) as store:
+        for run in store.list_runs():
+            update_search_index(store.load_digest(run['run_id']), datetime.strptime(run['run_date'], '%Y%m%d'), index_dir)
+
+
+# ======================
+# SEARCH PAGE
+# ======================
+
+SEARCH_CSS = """
+* { box-sizing: border-box; }
+
+body {
+  font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+  background: #0f0f0f;
+  color: #e8e8e8;
+  margin: 0;
+  padding: 2rem;
+}
+
+.container {
+  max-width: 900px;
+  margin: 0 auto;
+}
+
+h1 {
+  font-weight: 900;
+  font-size: 2.2rem;
+  margin: 0 0 1.5rem 0;
+  text-align: center;
+  background: linear-gradient(135deg, #ff6b6b, #ffa94d);
+  -webkit-background-clip: text;
+  -webkit-text-fill-color: transparent;
+  background-clip: text;
+}
+
+#query {
+  width: 100%;
+  padding: 1rem 1.2rem;
+  font-size: 1.1rem;
+  border-radius: 10px;
+  border: 1px solid #2a2a2a;
+  background: #1a1a1a;
+  color: #e8e8e8;
+  outline: none;
+}
+
+#query:focus {
+  border-color: #ff6b6b;
+}
+
+.status {
+  color: #999;
+  font-size: 0.9rem;
+  margin: 1rem 0;
+}
+
+.result {
+  background: #1a1a1a;
+  border: 1px solid #2a2a2a;
+  border-radius: 10px;
+  padding: 1.2rem;
+  margin-bottom: 1rem;
+}
+
+.result a {
+  color: #6ba3ff;
+  font-weight: 700;
+  text-decoration: none;
+}
+
+.result-meta {
+  color: #999;
+  font-size: 0.8rem;
+  margin: 0.4rem 0;
+}
+
+.result-summary {
+  color: #bbb;
+  font-size: 0.88rem;
+  line-height: 1.5;
+}
+"""
+
+
+def write_search_page(index_dir, doc_count):
+    stylesheet = publish_stylesheet('search', SEARCH_CSS, ['.'])
+    stopwords_json = json.dumps(sorted(STOPWORDS))
+
+    html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Search • arXiv Digest Archive</title>
+  <link rel="stylesheet" href="{stylesheet}" />
+</head>
+<body>
+  <div class="container">
+    <h1>🔎 Search the Archive</h1>
+    <input id="query" type="search" placeholder="Search {doc_count} archived papers…" autofocus />
+    <div class="status" id="status"></div>
+    <div id="results"></div>
+  </div>
+
+  <script>
+    const INDEX_DIR = {json.dumps(index_dir)};
+    const PREFIX_LEN = {PREFIX_LEN};
+    const DOC_SHARD_SIZE = {DOC_SHARD_SIZE};
+    const MAX_RESULTS = 50;
+    const STOPWORDS = new Set({stopwords_json});
+
+    // ============================================
+    // SHARD LOADING (only the shards a query needs)
+    // ============================================
+    const shards = {{}};
+    const waiting = {{}};
+
+    window.searchShard = function(name, data) {{
+      shards[name] = data;
+      (waiting[name] || []).forEach(resolve => resolve(data));
+      delete waiting[name];
+    }};
+
+    function loadShard(name) {{
+      if (shards[name]) return Promise.resolve(shards[name]);
+      return new Promise(resolve => {{
+        if (!waiting[name]) {{
+          waiting[name] = [];
+          const script = document.createElement('script');
+          script.src = `${{INDEX_DIR}}/${{name}}.js`;
+          script.onload = () => script.remove();
+          // A missing shard just means no term has that prefix
+          script.onerror = () => {{ script.remove(); window.searchShard(name, {{}}); }};
+          document.head.appendChild(script);
+        }}
+        waiting[name].push(resolve);
+      }});
+    }}
+
+    // Must match tokenize() in search_index.py
+    function tokenize(text) {{
+      return (text.toLowerCase().match(/[a-z0-9]+/g) || [])
+        .filter(t => t.length > 1 && !STOPWORDS.has(t));
+    }}
+
+    // ============================================
+    // SEARCH
+    // ============================================
+    let searchSeq = 0;
+
+    async function runSearch(query) {{
+      const seq = ++searchSeq;
+      const terms = [...new Set(tokenize(query))];
+      if (!terms.length) {{
+        showResults([], '');
+        return;
+      }}
+
+      const termShards = await Promise.all(terms.map(t => loadShard(`terms/${{t.slice(0, PREFIX_LEN)}}`)));
+
+      // Every term must match; the last one also matches as a prefix while typing
+      let scores = null;
+      terms.forEach((term, i) => {{
+        const shard = termShards[i];
+        const isLast = i === terms.length - 1;
+        const keys = isLast ? Object.keys(shard).filter(k => k.startsWith(term)) : (shard[term] ? [term] : []);
+
+        const termScores = new Map();
+        keys.forEach(key => shard[key].forEach(([doc, weight]) => {{
+          termScores.set(doc, (termScores.get(doc) || 0) + weight);
+        }}));
+
+        if (scores === null) {{
+          scores = termScores;
+        }} else {{
+          const merged = new Map();
+          termScores.forEach((weight, doc) => {{
+            if (scores.has(doc)) merged.set(doc, scores.get(doc) + weight);
+          }});
+          scores = merged;
+        }}
+      }});
+
+      // Best score first, newer papers (higher ids) break ties
+      const ranked = [...scores].sort((a, b) => b[1] - a[1] || b[0] - a[0]);
+      const top = ranked.slice(0, MAX_RESULTS);
+
+      const blocks = [...new Set(top.map(([doc]) => Math.floor(doc / DOC_SHARD_SIZE)))];
+      await Promise.all(blocks.map(b => loadShard(`docs/${{String(b).padStart(4, '0')}}`)));
+      if (seq !== searchSeq) return;  // a newer query already started
+
+      const docs = top.map(([doc]) => shards[`docs/${{String(Math.floor(doc / DOC_SHARD_SIZE)).padStart(4, '0')}}`][doc]);
+      showResults(docs.filter(Boolean), `${{ranked.length}} result${{ranked.length === 1 ? '' : 's'}}`);
+    }}
+
+    function showResults(docs, status) {{
+      document.getElementById('status').textContent = status;
+      const results = document.getElementById('results');
+      results.textContent = '';
+
+      docs.forEach(doc => {{
+        const item = document.createElement('div');
+        item.className = 'result';
+
+        const link = document.createElement('a');
+        link.href = doc.link;
+        link.target = '_blank';
+        link.textContent = doc.title;
+
+        const meta = document.createElement('div');
+        meta.className = 'result-meta';
+        meta.textContent = `${{doc.date}} • ${{doc.interest}} • ${{doc.category}}`;
+
+        const summary = document.createElement('div');
+        summary.className = 'result-summary';
+        summary.textContent = doc.summary;
+
+        item.append(link, meta, summary);
+        results.appendChild(item);
+      }});
+    }}
+
+    let debounce = 0;
+    document.getElementById('query').addEventListener('input', event => {{
+      clearTimeout(debounce);
+      debounce = setTimeout(() => runSearch(event.target.value), 120);
+    }});
+  </script>
+</body>
+</html>
+"""
+    write_artifact(SEARCH_PAGE, html)
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv[1:]:
+        from main import load_config
+        settings = load_config().get('settings', {})
+        rebuild_search_index(settings.get('paper_store_file', 'paper_store.db'))
+    else:
+        print("Usage: python search_index.py --rebuild")
@@ -0,0 +1,96 @@
+"""Shared static assets and precompressed artifacts for the generated pages.
+
+Stylesheets are minified, named by content hash and written once into a `static/`
+folder next to the pages that use them, instead of being inlined in every page.
+Generated pages are only rewritten when their content changed, and each one gets
+.gz (and .br, if the brotli package is installed) precompressed copies.
+"""
+import os
+import re
+import gzip
+import hashlib
+from contextlib import contextmanager
+
+from atomic_io import open_atomic, link_or_copy
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "static"
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def publish_stylesheet(name, css, page_dirs):
+    """Write static/<name>.<hash>.css next to each page directory and return its relative href."""
+    minified = minify_css(css)
+    digest = hashlib.sha256(minified.encode('utf-8')).hexdigest()[:10]
+    href = f"{STATIC_DIR}/{name}.{digest}.css"
+
+    for page_dir in dict.fromkeys(page_dirs):
+        path = os.path.join(page_dir, href)
+        if not os.path.exists(path):
+            write_artifact(path, minified)
+    return href
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _compressed_paths(path):
+    paths = [path + ".gz"]
+    if brotli is not None:
+        paths.append(path + ".br")
+    return paths
+
+
+def precompress(path):
+    """Write .gz (and .br when available) copies of `path` for static servers."""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    with open_atomic(path + ".gz", 'wb') as f:
+        # mtime=0 keeps the gzip bytes stable for identical input
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open_atomic(path + ".br", 'wb') as f:
+            f.write(brotli.compress(data))
+
+
+@contextmanager
+def open_artifact(path):
+    """Stream a generated file; it (and its compressed copies) only change when the content did."""
+    before = _stat_key(path)
+    with open_atomic(path, skip_unchanged=True) as f:
+        yield f
+
+    changed = _stat_key(path) != before
+    if changed or not all(os.path.exists(p) for p in _compressed_paths(path)):
+        precompress(path)
+
+
+def write_artifact(path, text):
+    with open_artifact(path) as f:
+        f.write(text)
+
+
+def link_artifact(src, dst):
+    """Point dst (and its compressed copies) at src without writing the content again."""
+    link_or_copy(src, dst)
+    for src_copy, dst_copy in zip(_compressed_paths(src), _compressed_paths(dst)):
+        link_or_copy(src_copy, dst_copy)
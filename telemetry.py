@@ -0,0 +1,216 @@
+"""Lightweight run telemetry: stage timers, counters, peak memory and optional profiling.
+
+Stage timers add up the time spent inside each stage across all worker threads, so
+with several workers a stage's seconds can exceed the run's wall time. The run report
+is plain JSON, written next to latest.html:
+
+    {"started_at": ..., "wall_seconds": ..., "peak_rss_mb": ...,
+     "stages": {name: {"seconds": s, "calls": n}}, "counters": {name: n}, "run": {...}}
+"""
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from atomic_io import atomic_write_json, atomic_write_text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RUN_REPORT_FILE = "run_report.json"
+PROFILE_DIR = "profiles"
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if it cannot be measured)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+    return None
+
+
+def current_rss_mb():
+    """Resident memory of this process right now in MB (None if it cannot be measured)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return round(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    return None
+
+
+class MemoryWatchdog:
+    """Sample RSS in the background and call on_exceed(rss_mb) whenever it crosses limit_mb."""
+
+    def __init__(self, limit_mb, on_exceed, interval=0.25):
+        self.limit_mb = limit_mb
+        self.on_exceed = on_exceed
+        self.interval = interval
+        self.max_rss_mb = 0.0
+        self.exceeded = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.max_rss_mb = rss
+            self._thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        above = False
+        while not self._stop.wait(self.interval):
+            rss = current_rss_mb()
+            if rss is None:
+                continue  # unreadable this time (e.g. /proc); try the next sample
+            self.max_rss_mb = max(self.max_rss_mb, rss)
+            if rss > self.limit_mb and not above:
+                self.exceeded += 1
+                self.on_exceed(rss)
+            above = rss > self.limit_mb
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            rss = current_rss_mb()
+            if rss is not None:
+                self.max_rss_mb = max(self.max_rss_mb, rss)
+
+
+class Telemetry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = []
+        self.profiling = False
+        self.reset()
+
+    def reset(self):
+        """Start a new run: clear timers and counters (profiling carries on)."""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.stages = {}
+            self.counters = {}
+
+    @contextmanager
+    def timer(self, stage):
+        """Add the time spent in the block to `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+                entry['seconds'] += elapsed
+                entry['calls'] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, **run_info):
+        with self._lock:
+            return {
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'wall_seconds': round(time.perf_counter() - self._start, 3),
+                'peak_rss_mb': peak_rss_mb(),
+                'stages': {name: {'seconds': round(entry['seconds'], 3), 'calls': entry['calls']}
+                           for name, entry in self.stages.items()},
+                'counters': dict(self.counters),
+                'run': run_info
+            }
+
+    def write_report(self, path=RUN_REPORT_FILE, **run_info):
+        """Write the JSON run report and print a one-line-per-stage summary."""
+        report = self.report(**run_info)
+        atomic_write_json(path, report)
+
+        print(f"\n⏱️ Run report saved to {path} ({report['wall_seconds']:.1f}s wall, "
+              f"peak RSS {report['peak_rss_mb']} MB)")
+        for name, entry in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+            print(f"   • {name}: {entry['seconds']:.2f}s ({entry['calls']} calls)")
+        return report
+
+    # ----------------------
+    # Profiling (--profile)
+    # ----------------------
+
+    def start_profiling(self):
+        """Profile the calling thread and every thread started through profiled()."""
+        self.profiling = True
+        tracemalloc.start(25)
+        profile = cProfile.Profile()
+        self._profiles.append(profile)
+        profile.enable()
+
+    def profiled(self, target):
+        """Wrap a thread target so it is profiled too while profiling is on."""
+        if not self.profiling:
+            return target
+
+        def run(*args, **kwargs):
+            profile = cProfile.Profile()
+            with self._lock:
+                self._profiles.append(profile)
+            profile.enable()
+            try:
+                return target(*args, **kwargs)
+            finally:
+                profile.disable()
+        return run
+
+    def dump_profile(self, directory=PROFILE_DIR, top=25):
+        """Stop profiling and write merged cProfile stats plus the top tracemalloc allocations."""
+        if not self.profiling:
+            return None
+        self._profiles[0].disable()
+        snapshot = tracemalloc.take_snapshot()
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.profiling = False
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        prof_file = os.path.join(directory, f"run_{stamp}.prof")
+        mem_file = os.path.join(directory, f"run_{stamp}_memory.txt")
+
+        stats = pstats.Stats(self._profiles[0])
+        for profile in self._profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(prof_file)
+
+        lines = [f"Peak traced memory: {traced_peak / (1024 * 1024):.1f} MB", ""]
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:top]]
+        atomic_write_text(mem_file, "\n".join(lines) + "\n")
+
+        print(f"🔬 Profile saved to {prof_file} (view with: python -m pstats {prof_file})")
+        print(f"🔬 Memory allocations saved to {mem_file}")
+        stats.sort_stats('cumulative').print_stats(top)
+        return prof_file
+
+
+# Shared by every module of a run
+telemetry = Telemetry()
@@ -0,0 +1,55 @@
+"""digest_server.py must only serve generated pages, never config, state or code."""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from digest_server import make_server
+
+
+class StaticFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for name, text in [("latest.html", "<html>latest</html>"),
+                           ("config.json", '{"settings": {}}'),
+                           ("main.py", "print('hi')"),
+                           ("seen_papers.json", "[]")]:
+            with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        store_path = os.path.join(self.root, "paper_store.db")
+        self.server = make_server("127.0.0.1", 0, store_path, self.root)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.RequestHandlerClass.api.store.close()
+        shutil.rmtree(self.root)
+
+    def status(self, path):
+        try:
+            with urlopen(self.base + path, timeout=10) as response:
+                return response.status
+        except HTTPError as e:
+            return e.code
+
+    def test_serves_generated_pages(self):
+        self.assertEqual(self.status("/latest.html"), 200)
+        self.assertEqual(self.status("/"), 200)
+
+    def test_refuses_config_store_and_code(self):
+        for path in ("/config.json", "/paper_store.db", "/main.py", "/seen_papers.json",
+                     "/./config.json", "/static/../config.json"):
+            with self.subTest(path=path):
+                self.assertEqual(self.status(path), 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
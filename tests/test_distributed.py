@@ -0,0 +1,44 @@
+"""distributed.py takes its worker count from this host's tuned profile."""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distributed import worker_plan
+from host_tuning import fingerprint, host_profile_path
+
+
+class WorkerPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.root, "config.json")
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump({'settings': {'host_profile_dir': "profiles"}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def save_profile(self, distributed):
+        path = host_profile_path(os.path.join(self.root, "profiles"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint(), 'settings': {}, 'distributed': distributed}, f)
+
+    def test_defaults_to_two_workers(self):
+        self.assertEqual(worker_plan([self.config_file]), (2, None))
+
+    def test_saved_profile_sets_worker_count(self):
+        self.save_profile({'workers': 5, 'torch_threads': 3})
+        self.assertEqual(worker_plan([self.config_file]), (5, {'settings': {'torch_threads': 3}}))
+
+    def test_explicit_workers_win(self):
+        self.save_profile({'workers': 5, 'torch_threads': 3})
+        self.assertEqual(worker_plan([self.config_file], workers=4), (4, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""Trickle pool: digest candidates and summaries computed ahead of time, kept in the paper store.
+
+`python main.py trickle` polls each interest's arXiv query every trickle_interval_minutes
+(requests still request_interval seconds apart) and adds the parsed candidates to this
+pool. After every poll it ranks the pool the way the digest will (seen papers, near
+duplicates, keywords, re-ranker) and summarizes the papers that currently make the cut.
+
+A digest run takes an interest's candidates from the pool instead of arXiv when the
+same query was polled within trickle_max_age_hours, and uses the precomputed
+summaries, so it only selects and renders. Anything the pool cannot answer (a new
+query, a stale poll, a paper without a summary) is fetched or summarized as before.
+
+Tables (in paper_store.db):
+    trickle_polls       (interest, stage) -> query and time of the last poll
+    trickle_candidates  parsed candidates per interest and stage ('primary' / 'fallback')
+    trickle_summaries   arxiv_id -> summary, with a hash of the abstract it was made from
+"""
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+
+from paper_store import PAPER_STORE_FILE
+
+TRICKLE_INTERVAL_MINUTES = 60
+TRICKLE_MAX_AGE_HOURS = 12
+FALLBACK_REFRESH = timedelta(hours=6)  # the wide fallback window changes slowly
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trickle_polls (
+    interest TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    query TEXT NOT NULL,
+    polled_at TEXT NOT NULL,
+    PRIMARY KEY (interest, stage)
+);
+
+CREATE TABLE IF NOT EXISTS trickle_candidates (
+    interest TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    arxiv_id TEXT NOT NULL,
+    published TEXT,
+    fetched_at TEXT NOT NULL,
+    paper TEXT NOT NULL,
+    PRIMARY KEY (interest, stage, arxiv_id)
+);
+
+CREATE TABLE IF NOT EXISTS trickle_summaries (
+    arxiv_id TEXT PRIMARY KEY,
+    abstract_hash TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    summarized_at TEXT NOT NULL
+);
+"""
+
+
+def abstract_hash(abstract):
+    return hashlib.sha1(abstract.encode('utf-8')).hexdigest()[:16]
+
+
+class TricklePool:
+    def __init__(self, path=PAPER_STORE_FILE):
+        self.path = path
+        # The trickle process writes while a digest run may be reading
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------
+    # Polling
+    # ----------------------
+
+    def last_poll(self, interest, stage, query):
+        """When this exact query was last polled for the interest (None if never)."""
+        row = self.conn.execute(
+            "SELECT query, polled_at FROM trickle_polls WHERE interest = ? AND stage = ?", (interest, stage)
+        ).fetchone()
+        if row is None or row['query'] != query:
+            return None
+        return datetime.fromisoformat(row['polled_at'])
+
+    def add_candidates(self, interest, stage, query, papers):
+        """Pool one poll's parsed papers; returns how many were not pooled yet."""
+        now = datetime.now().isoformat()
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT query FROM trickle_polls WHERE interest = ? AND stage = ?", (interest, stage)
+            ).fetchone()
+            if row is not None and row['query'] != query:
+                # The interest's query changed: its old candidates no longer apply
+                self.conn.execute("DELETE FROM trickle_candidates WHERE interest = ? AND stage = ?",
+                                  (interest, stage))
+            known = {r['arxiv_id'] for r in self.conn.execute(
+                "SELECT arxiv_id FROM trickle_candidates WHERE interest = ? AND stage = ?", (interest, stage))}
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO trickle_candidates (interest, stage, arxiv_id, published, fetched_at, paper) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(interest, stage, p['arxiv_id'], p.get('published'), now, json.dumps(p, ensure_ascii=False))
+                 for p in papers]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO trickle_polls (interest, stage, query, polled_at) VALUES (?, ?, ?, ?)",
+                (interest, stage, query, now)
+            )
+        return sum(p['arxiv_id'] not in known for p in papers)
+
+    def candidates(self, interest, stage, query, since=None, max_age_hours=None, limit=None):
+        """Pooled candidates of this query, newest first; None without a (recent enough) poll.
+
+        since: only papers published on or after this date (YYYY-MM-DD), like the query's date window.
+        limit: at most this many, like the max_results of an API request.
+        """
+        polled_at = self.last_poll(interest, stage, query)
+        if polled_at is None:
+            return None
+        if max_age_hours is not None and datetime.now() - polled_at > timedelta(hours=max_age_hours):
+            return None
+        sql = "SELECT paper FROM trickle_candidates WHERE interest = ? AND stage = ?"
+        params = [interest, stage]
+        if since:
+            sql += " AND published >= ?"
+            params.append(since)
+        sql += " ORDER BY published DESC, arxiv_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row['paper']) for row in self.conn.execute(sql, params)]
+
+    def prune(self, keep_days):
+        """Drop candidates not seen in a poll for keep_days, and summaries nobody can use any more."""
+        cutoff = (datetime.now() - timedelta(days=keep_days)).isoformat()
+        with self.conn:
+            self.conn.execute("DELETE FROM trickle_candidates WHERE fetched_at < ?", (cutoff,))
+            self.conn.execute(
+                "DELETE FROM trickle_summaries WHERE arxiv_id NOT IN (SELECT arxiv_id FROM trickle_candidates)"
+            )
+
+    # ----------------------
+    # Summaries
+    # ----------------------
+
+    def has_summary(self, paper):
+        row = self.conn.execute(
+            "SELECT abstract_hash FROM trickle_summaries WHERE arxiv_id = ?", (paper['arxiv_id'],)
+        ).fetchone()
+        return row is not None and row['abstract_hash'] == abstract_hash(paper['abstract'])
+
+    def save_summary(self, paper, summary):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO trickle_summaries (arxiv_id, abstract_hash, summary, summarized_at) "
+                "VALUES (?, ?, ?, ?)",
+                (paper['arxiv_id'], abstract_hash(paper['abstract']), summary, datetime.now().isoformat())
+            )
+
+    def summaries(self):
+        """{arxiv_id: (abstract hash, summary)} of every precomputed summary."""
+        return {row['arxiv_id']: (row['abstract_hash'], row['summary'])
+                for row in self.conn.execute("SELECT arxiv_id, abstract_hash, summary FROM trickle_summaries")}
+
+
+def precomputed_summary(summaries, paper):
+    """The pooled summary of this paper if it was made from the same abstract, else None."""
+    entry = summaries.get(paper['arxiv_id']) if summaries else None
+    if entry is not None and entry[0] == abstract_hash(paper['abstract']):
+        return entry[1]
+    return None